@@ -0,0 +1,48 @@
+"""
+Bulk scan benchmark: N student essays analyzed one after another (what N /analyze-file calls cost
+the model) vs. the same analyze() calls run side by side, as /analyze-batch does on the inference pool,
+where concurrent documents share micro-batched forward passes.
+HTTP overhead is not included, so the real gap per round trip is larger.
+
+Usage: python benchmarks/bench_batch_scan.py [documents] [words per document]   (default: 40 1500)
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_long_document import synthetic_thesis
+
+def run_benchmark(documents=40, words=1500):
+    from core.model_server import create_local_detector
+    from core.config import settings
+
+    detector = create_local_detector()
+    detector.result_cache = None
+    detector.feature_cache = None  # Essays share template sentences; measure the model work
+    texts = [f"Mahasiswa {i}. " + synthetic_thesis(words) for i in range(documents)]
+
+    print(f"\n--- Bulk Scan Benchmark ({documents} documents x {words} words, full scan) ---")
+    start = time.perf_counter()
+    for text in texts:
+        detector.analyze(text, force_full_scan=True)
+    sequential = time.perf_counter() - start
+    print(f"Sequential analyze():        {sequential:7.2f}s | {documents / sequential:6.2f} docs/s")
+
+    for concurrency in (2, settings.BATCH_SCAN_CONCURRENCY, 8):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(lambda text: detector.analyze(text, force_full_scan=True), texts))
+        elapsed = time.perf_counter() - start
+        print(f"analyze() x {concurrency} concurrent:   {elapsed:7.2f}s | {documents / elapsed:6.2f} docs/s | "
+              f"{sequential / elapsed:.2f}x")
+
+    if detector.batcher is not None:
+        print(f"Batcher: {detector.batcher.stats()}")
+        detector.batcher.stop()
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    run_benchmark(*args)
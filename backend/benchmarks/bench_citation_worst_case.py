@@ -0,0 +1,42 @@
+"""
+Worst-case citation pattern timing: the slowest adversarial input per pattern (long unpunctuated PDF-like
+lines, runs of initials, repeated openers) for the original backtracking patterns vs. the current ones,
+at growing sentence lengths. Linear patterns grow ~2x per doubling; the originals grew ~4x.
+
+Usage: python benchmarks/bench_citation_worst_case.py [lengths ...]   (default: 1000 2000 4000 8000)
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.citation_handler import CitationHandler
+from tests.test_citation_patterns import LEGACY, ADVERSARIAL
+
+def worst(pattern, length):
+    slowest, label = 0.0, ""
+    for name, make in ADVERSARIAL.items():
+        text = make(length)
+        start = time.perf_counter()
+        pattern.search(text)
+        elapsed = time.perf_counter() - start
+        if elapsed > slowest:
+            slowest, label = elapsed, name
+    return slowest, label
+
+def run_benchmark(lengths):
+    handler = CitationHandler()
+    print("\n--- Citation Pattern Worst Case (ms, slowest adversarial input) ---")
+    print(f"{'pattern':<20}" + "".join(f"{n:>22}" for n in lengths))
+    for name, pattern in handler.patterns.items():
+        rows = [("current", pattern)] + ([("original", LEGACY[name])] if name in LEGACY else [])
+        for label, compiled in rows:
+            cells = []
+            for n in lengths:
+                elapsed, case = worst(compiled, n)
+                cells.append(f"{elapsed * 1000:9.1f} {case[:12]:>12}")
+            print(f"{name if label == 'current' else '  (original)':<20}" + "".join(cells))
+
+if __name__ == "__main__":
+    run_benchmark([int(n) for n in sys.argv[1:]] or [1000, 2000, 4000, 8000])
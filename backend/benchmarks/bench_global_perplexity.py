@@ -0,0 +1,51 @@
+"""
+Global perplexity cost benchmark: the legacy 1,500-character slice vs. sliding-window scoring
+of the whole prose text, uncapped and with the hybrid / full-scan window caps.
+
+Usage: python benchmarks/bench_global_perplexity.py [word counts ...]   (default: 1000 5000 20000)
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.ai_detector import AIDetector
+from core.config import settings
+from benchmarks.bench_length_bucketing import synthetic_sentences
+
+def synthetic_document(words):
+    sentences, text = synthetic_sentences(n=words), []
+    count = 0
+    for s in sentences:
+        text.append(s)
+        count += len(s.split())
+        if count >= words:
+            break
+    return " ".join(text)
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+def run_benchmark(word_counts):
+    detector = AIDetector(global_window_stride=settings.GLOBAL_WINDOW_STRIDE)
+    caps = (("slice-1500", None), ("uncapped", 0), ("hybrid", settings.GLOBAL_MAX_WINDOWS),
+            ("full-scan", settings.GLOBAL_MAX_WINDOWS_FULL_SCAN))
+
+    print("\n--- Global Perplexity Benchmark ---")
+    for words in word_counts:
+        text = synthetic_document(words)
+        print(f"{words} words:")
+        for name, cap in caps:
+            if cap is None:
+                elapsed, res = timed(lambda: detector.calculate_features(text[:1500]))
+                windows, coverage = 1, 1500 / len(text)
+            else:
+                elapsed, res = timed(lambda: detector.score_document(text, max_windows=cap or None))
+                windows, coverage = res["windows"], res["coverage"]
+            print(f"  {name:>10}: {elapsed * 1000:8.1f} ms | {windows:3d} windows | coverage {coverage:6.1%} | loss {res['loss']:.4f}")
+
+if __name__ == "__main__":
+    run_benchmark([int(w) for w in sys.argv[1:]] or [1000, 5000, 20000])
@@ -0,0 +1,51 @@
+"""
+Side-by-side throughput benchmark of the inference backends (eager quantized, TorchScript, ONNX Runtime),
+including the max deviation of loss/confidence from the eager baseline.
+
+Usage: python benchmarks/bench_inference_backends.py [model_name]
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.ai_detector import AIDetector
+from core.inference_backends import BACKENDS
+
+SENTENCES = [
+    "Pendidikan karakter merupakan fondasi penting dalam membentuk generasi muda yang berintegritas.",
+    "Data dianalisis menggunakan regresi linear berganda.",
+    "Hasil penelitian menunjukkan bahwa kualitas pelayanan berpengaruh positif terhadap kepuasan pelanggan di sektor perbankan syariah.",
+    "Guru menjadi teladan bagi siswa.",
+] * 32
+
+def run_benchmark(model_name="indolem/indobert-base-uncased", repeats=3):
+    cache_dir = tempfile.mkdtemp(prefix="sahih-backends-")
+    baseline = None
+    print(f"\n--- Inference Backend Benchmark ({len(SENTENCES)} sentences, {model_name}) ---")
+    for name in BACKENDS:
+        try:
+            start = time.perf_counter()
+            detector = AIDetector(model_name=model_name, backend=name, cache_dir=cache_dir)
+            load_time = time.perf_counter() - start
+        except RuntimeError as e:
+            print(f"{name:>11}: skipped ({e})")
+            continue
+
+        detector.calculate_features_batch(SENTENCES[:4], batch_size=4, token_budget=detector.token_budget)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            results = detector.calculate_features_batch(SENTENCES, batch_size=64, token_budget=detector.token_budget)
+        elapsed = (time.perf_counter() - start) / repeats
+
+        if baseline is None:
+            baseline = results
+        max_loss_dev = max(abs(a["loss"] - b["loss"]) for a, b in zip(baseline, results))
+        max_conf_dev = max(abs(a["confidence"] - b["confidence"]) for a, b in zip(baseline, results))
+        print(f"{name:>11}: {len(SENTENCES) / elapsed:8.1f} sentences/s | load {load_time:5.1f}s | "
+              f"max |dloss| {max_loss_dev:.4f} | max |dconf| {max_conf_dev:.5f}")
+
+if __name__ == "__main__":
+    run_benchmark(*sys.argv[1:2])
@@ -0,0 +1,78 @@
+"""
+Language-ID benchmark: langdetect.detect once per sentence plus once for the whole document
+(the previous language guard and English filter) vs. LanguageIdentifier batches, cold and cached;
+then the document guard alone on a long document: whole-text detection vs. the sampled guard.
+
+Usage: python benchmarks/bench_language_id.py [words] [guard_words]   (default: 5000 150000)
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langdetect import detect, DetectorFactory
+from core.language_id import LanguageIdentifier
+from benchmarks.bench_long_document import synthetic_thesis
+from tests.test_language_id import ENGLISH
+
+DetectorFactory.seed = 0
+
+def sentences_of(text):
+    return [s for s in re.split(r"(?<=[.!?])\s+", text) if len(s.split()) > 3]
+
+def run_benchmark(words=5000):
+    # Mostly Indonesian thesis with an English abstract mixed in
+    text = " ".join(ENGLISH) + " " + synthetic_thesis(words)
+    sentences = sentences_of(text)
+    print(f"\n--- Language ID Benchmark ({words} words, {len(sentences)} sentences) ---")
+
+    start = time.perf_counter()
+    legacy = [detect(s) == "en" for s in sentences]
+    legacy_doc = detect(text)
+    legacy_s = time.perf_counter() - start
+
+    identifier = LanguageIdentifier()
+    identifier.detect("warm up")  # profile loading happens once per process
+    start = time.perf_counter()
+    fast = [lang == "en" for lang in identifier.detect_many(sentences)]
+    fast_doc = identifier.detect(text)
+    cold_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    identifier.detect_many(sentences)
+    identifier.detect(text)
+    cached_s = time.perf_counter() - start
+
+    agreement = sum(a == b for a, b in zip(legacy, fast)) / len(sentences)
+    print(f"langdetect per sentence: {legacy_s * 1000:8.1f} ms | document: {legacy_doc}")
+    print(f"LanguageIdentifier:      {cold_s * 1000:8.1f} ms | document: {fast_doc} | {legacy_s / cold_s:.0f}x faster")
+    print(f"LanguageIdentifier hot:  {cached_s * 1000:8.1f} ms (cached)")
+    print(f"English-flag agreement:  {agreement:.1%}")
+
+def run_guard_benchmark(words=150000):
+    text = synthetic_thesis(words)
+    print(f"\n--- Language Guard Benchmark ({words} words, {len(text) / 1e6:.1f} MB) ---")
+    start = time.perf_counter()
+    legacy = detect(text)
+    legacy_s = time.perf_counter() - start
+
+    identifier = LanguageIdentifier()
+    identifier.detect("warm up")
+    start = time.perf_counter()
+    whole = identifier.detect(text)
+    whole_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sampled = identifier.assess_document(text)
+    sampled_s = time.perf_counter() - start
+    print(f"langdetect whole text:       {legacy_s * 1000:8.1f} ms | {legacy}")
+    print(f"LanguageIdentifier whole:    {whole_s * 1000:8.1f} ms | {whole}")
+    print(f"assess_document (sampled):   {sampled_s * 1000:8.1f} ms | {sampled['language']} "
+          f"({sampled['confidence']:.2f}, {len(sampled['hints'])} hints) | {legacy_s / sampled_s:.0f}x faster")
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    run_benchmark(*args[:1])
+    run_guard_benchmark(*args[1:2])
@@ -0,0 +1,72 @@
+"""
+Long-document benchmark: full-scan analyze() on synthetic thesis-like documents.
+Reports wall time, throughput (words/s) and peak RSS growth per document size; each size runs
+in a fresh process so RSS is attributable to that document alone.
+
+Usage: python benchmarks/bench_long_document.py [word counts ...]   (default: 10000 50000 100000)
+"""
+import os
+import sys
+import time
+import resource
+import multiprocessing as mp
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PARAGRAPH = [
+    "Berdasarkan hasil analisis regresi linear berganda, variabel kualitas pelayanan berpengaruh positif terhadap keputusan pembelian.",
+    "Data dikumpulkan melalui kuesioner yang disebarkan kepada {} responden di Kabupaten Kutai Kartanegara.",
+    "Menurut Sugiyono (2019), populasi adalah wilayah generalisasi yang terdiri atas obyek atau subyek penelitian.",
+    "Tabel 4.{} menyajikan hasil uji validitas.",
+    "Oleh karena itu, hipotesis pertama dalam penelitian ini dapat diterima pada tingkat signifikansi lima persen.",
+]
+
+def synthetic_thesis(words):
+    sentences, count, i = [], 0, 0
+    while count < words:
+        sentence = PARAGRAPH[i % len(PARAGRAPH)].format(i)
+        sentences.append(sentence)
+        count += len(sentence.split())
+        i += 1
+        if i % 8 == 0:
+            sentences.append("\n\n")
+    return " ".join(sentences)
+
+def worker(words, out):
+    from core.model_server import create_local_detector
+
+    detector = create_local_detector()
+    detector.result_cache = None  # Measure the pipeline, not the cache
+    text = synthetic_thesis(words)
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    result = detector.analyze(text, force_full_scan=True)
+    elapsed = time.perf_counter() - start
+    if detector.batcher is not None:
+        detector.batcher.stop()
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    out.put({
+        "words": words,
+        "sentences": len(result["sentences"]),
+        "skipped": sum(1 for s in result["sentences"] if s.get("skipped")),
+        "tokens": result["token_count"],
+        "seconds": elapsed,
+        "rss_growth_mib": (peak_rss - base_rss) / 1024,
+    })
+
+def run_benchmark(word_counts):
+    ctx = mp.get_context("spawn")
+    print("\n--- Long Document Benchmark (full scan) ---")
+    for words in word_counts:
+        out = ctx.Queue()
+        proc = ctx.Process(target=worker, args=(words, out))
+        proc.start()
+        r = out.get()
+        proc.join()
+        print(f"{r['words']:>7} words | {r['tokens']:>7} tokens | {r['sentences']:>5} sentences ({r['skipped']} skipped) | "
+              f"{r['seconds']:7.2f}s | {r['words'] / r['seconds']:8.0f} words/s | peak RSS +{r['rss_growth_mib']:.0f} MiB")
+
+if __name__ == "__main__":
+    run_benchmark([int(w) for w in sys.argv[1:]] or [10000, 50000, 100000])
@@ -0,0 +1,61 @@
+"""
+PDF extraction benchmark: the previous whole-document extract_text_from_pdf vs. DocumentProcessor.iter_pages,
+in-process and with a process pool; time to the first page (when analyze_pages can start scoring) and in total.
+
+Usage: python benchmarks/bench_pdf_extraction.py [pages] [workers]   (default: 400 2)
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+from core.doc_processor import DocumentProcessor
+from benchmarks.bench_long_document import synthetic_thesis
+
+def make_pdf(pages):
+    text = synthetic_thesis(pages * 300)
+    doc = fitz.open()
+    chunk = len(text) // pages
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_textbox(page.rect + (50, 50, -50, -50), text[i * chunk:(i + 1) * chunk], fontsize=8)
+    content = doc.tobytes()
+    doc.close()
+    return content
+
+def stream(processor, content):
+    start = time.perf_counter()
+    first = None
+    pages = []
+    for page in processor.iter_pages("bench.pdf", content):
+        if first is None:
+            first = time.perf_counter() - start
+        pages.append(page)
+    return "\n\n".join(pages), first, time.perf_counter() - start
+
+def run_benchmark(pages=400, workers=2):
+    content = make_pdf(pages)
+    print(f"\n--- PDF Extraction Benchmark ({pages} pages, {len(content) / 1e6:.1f} MB, {workers} workers) ---")
+
+    start = time.perf_counter()
+    legacy = DocumentProcessor.extract_text_from_pdf(content)
+    legacy_s = time.perf_counter() - start
+
+    serial, serial_first, serial_s = stream(DocumentProcessor(), content)
+    processor = DocumentProcessor(workers=workers, parallel_min_pages=1)
+    try:
+        stream(processor, content)  # worker start-up (spawn) happens once per process
+        pooled, pooled_first, pooled_s = stream(processor, content)
+    finally:
+        processor.shutdown()
+
+    assert serial == pooled == legacy
+    print(f"extract_text_from_pdf (whole): first page {legacy_s * 1000:8.1f} ms | total {legacy_s * 1000:8.1f} ms")
+    print(f"iter_pages in-process:         first page {serial_first * 1000:8.1f} ms | total {serial_s * 1000:8.1f} ms")
+    print(f"iter_pages process pool:       first page {pooled_first * 1000:8.1f} ms | total {pooled_s * 1000:8.1f} ms"
+          f" | {legacy_s / pooled_s:.1f}x")
+
+if __name__ == "__main__":
+    run_benchmark(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,64 @@
+"""
+Memory/latency benchmark: legacy full-vocabulary softmax scoring vs the lean logsumexp kernel.
+Each variant runs in a fresh process so peak RSS growth is attributable to the kernel alone.
+
+Usage: python benchmarks/bench_scoring_kernel.py [batch] [seq_len]
+"""
+import os
+import sys
+import time
+import resource
+import multiprocessing as mp
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+VOCAB_SIZE = 31923  # indolem/indobert-base-uncased
+
+def legacy_kernel(torch, logits, input_ids, mask):
+    import torch.nn.functional as F
+    loss_fct = torch.nn.CrossEntropyLoss(reduction='none')
+    # The original path also asked HuggingFace for a (discarded) internal loss
+    _ = loss_fct(logits.reshape(-1, logits.size(-1)), input_ids.reshape(-1))
+    loss = loss_fct(logits.reshape(-1, logits.size(-1)), input_ids.reshape(-1)).reshape(input_ids.size(0), -1)
+    loss = (loss * mask).sum(dim=1) / mask.sum(dim=1)
+    probs = F.softmax(logits, dim=-1)
+    token_probs = torch.gather(probs, 2, input_ids.unsqueeze(-1)).squeeze(-1)
+    return loss, (token_probs * mask).sum(dim=1) / mask.sum(dim=1)
+
+def worker(variant, batch, seq_len, repeats, out):
+    import torch
+    from core.ai_detector import token_loss_confidence
+
+    torch.manual_seed(0)
+    logits = torch.randn(batch, seq_len, VOCAB_SIZE)
+    input_ids = torch.randint(0, VOCAB_SIZE, (batch, seq_len))
+    mask = torch.ones(batch, seq_len)
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    with torch.no_grad():
+        for _ in range(repeats):
+            if variant == "legacy":
+                legacy_kernel(torch, logits, input_ids, mask)
+            else:
+                token_loss_confidence(logits, input_ids, mask)
+    elapsed = (time.perf_counter() - start) / repeats
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    out.put((variant, elapsed, (peak_rss - base_rss) / 1024))
+
+def run_benchmark(batch=24, seq_len=64, repeats=5):
+    ctx = mp.get_context("spawn")
+    print(f"\n--- Scoring Kernel Benchmark (B={batch}, L={seq_len}, V={VOCAB_SIZE}) ---")
+    print(f"Logits tensor alone: {batch * seq_len * VOCAB_SIZE * 4 / 2**20:.1f} MiB")
+    for variant in ("legacy", "lean"):
+        out = ctx.Queue()
+        proc = ctx.Process(target=worker, args=(variant, batch, seq_len, repeats, out))
+        proc.start()
+        name, elapsed, extra_mib = out.get()
+        proc.join()
+        print(f"{name:>6}: {elapsed * 1000:8.1f} ms/batch | extra peak RSS {extra_mib:8.1f} MiB")
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    run_benchmark(*args)
@@ -0,0 +1,64 @@
+"""
+Sentence segmentation benchmark: the previous analyze() split (quote capture-group split, look-behind
+re-split, length filter) plus the separate burstiness split vs. one SentenceSegmenter pass,
+and sentence-level accuracy of both on the gold sample from tests/test_segmenter.py.
+
+Usage: python benchmarks/bench_segmenter.py [words]   (default: 50000)
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.segmenter import segment_sentences
+from benchmarks.bench_long_document import synthetic_thesis
+from tests.test_segmenter import GOLD_TEXT, GOLD_SENTENCES
+
+def legacy_split(clean_text):
+    parts = re.split(r'([.!?]\s+(?=[A-Z"“])|["“][^"”]*["”])', clean_text)
+    raw_sentences = []
+    for p in parts:
+        if not p: continue
+        if p.startswith(('"', '“')) and p.endswith(('"', '”')):
+            raw_sentences.append(p.strip())
+        else:
+            sub_parts = re.split(r'(?<=[.!?])\s+(?=[A-Z"“])', p)
+            raw_sentences.extend([s.strip() for s in sub_parts if s.strip()])
+    processed_sentences = [s for s in raw_sentences if len(s) > 5]
+    if not processed_sentences: processed_sentences = [clean_text]
+    return processed_sentences
+
+def legacy_both(text):
+    return legacy_split(text), [s.strip() for s in re.split(r'[.!?\n]+', text) if len(s.strip()) > 10]
+
+def segmenter_both(text):
+    spans = segment_sentences(text)
+    return [s.text for s in spans if len(s.text) > 5], [s.text for s in spans if len(s.text) > 10]
+
+def timed(fn, text, repeats=5):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(text)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+def gold_score(sentences):
+    """Share of gold sentences reproduced exactly (punctuation-insensitive at the end)."""
+    found = {s.rstrip(".!?") for s in sentences}
+    return sum(s.rstrip(".!?") in found for s in GOLD_SENTENCES) / len(GOLD_SENTENCES)
+
+def run_benchmark(words=50000):
+    text = synthetic_thesis(words)
+    print(f"\n--- Sentence Segmentation Benchmark ({words} words, {len(text)} chars) ---")
+    (legacy, _), legacy_s = timed(legacy_both, text)
+    (fast, _), fast_s = timed(segmenter_both, text)
+    print(f"Legacy split + burstiness split: {legacy_s * 1000:8.1f} ms | {len(legacy)} sentences")
+    print(f"SentenceSegmenter (one pass):    {fast_s * 1000:8.1f} ms | {len(fast)} sentences | {legacy_s / fast_s:.1f}x")
+    print(f"Gold sample accuracy: legacy {gold_score(legacy_split(GOLD_TEXT)):.0%} | "
+          f"segmenter {gold_score([s.text for s in segment_sentences(GOLD_TEXT)]):.0%}")
+
+if __name__ == "__main__":
+    run_benchmark(*[int(a) for a in sys.argv[1:]])
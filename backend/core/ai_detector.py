@@ -5,78 +5,357 @@ import numpy as np
 import re
 from .citation_handler import CitationHandler
 from .fingerprint_analyzer import FingerprintAnalyzer
+from .micro_batcher import MicroBatcher
+from .inference_backends import create_backend
+from .model_store import ModelArtifactStore
+from .result_cache import ResultCache, FeatureCache
+from .tokenization import DocumentTokens
+from .sampling import create_sampler
+from .lexicon import Lexicon
+from .language_id import LanguageIdentifier
+from .segmenter import Sentence, SentenceSegmenter
+from .page_stream import analyze_page_stream
+import hashlib
 import logging
+import os
+import time
+import zlib
+
+def token_log_probabilities(logits: torch.Tensor, input_ids: torch.Tensor) -> torch.Tensor:
+    """B x L log-probability of each input token, via logsumexp (one item at a time, see below)."""
+    log_norm = torch.stack([torch.logsumexp(item_logits, dim=-1) for item_logits in logits])
+    token_logits = torch.gather(logits, 2, input_ids.unsqueeze(-1)).squeeze(-1)
+    return token_logits - log_norm
+
+def token_loss_confidence(logits: torch.Tensor, input_ids: torch.Tensor, attention_mask: torch.Tensor):
+    """
+    Lean scoring kernel: per-item mean token loss and mean token confidence.
+    log p(token) = logit[token] - logsumexp(logits), so only one reduction runs over the
+    vocabulary and no B x L x V probability tensor is materialized (padding is masked out).
+    The reduction goes item by item, keeping its scratch buffer at L x V instead of B x L x V.
+    """
+    token_log_probs = token_log_probabilities(logits, input_ids)
+
+    mask = attention_mask.to(token_log_probs.dtype)
+    counts = mask.sum(dim=1)
+    loss = (-token_log_probs * mask).sum(dim=1) / counts
+    confidence = (token_log_probs.exp() * mask).sum(dim=1) / counts
+    return loss, confidence
+
+def length_buckets(lengths: list[int], token_budget: int, max_batch_size: int = 64) -> list[list[int]]:
+    """
+    Group item indices into batches of similar token length.
+    Items are sorted by length and a batch grows while (items x longest item) stays within
+    token_budget, so short sentences are never padded up to one long outlier.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    batches, current = [], []
+    for idx in order:
+        # Sorted ascending: the incoming item is the longest in the batch
+        if current and ((len(current) + 1) * lengths[idx] > token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current = []
+        current.append(idx)
+    if current:
+        batches.append(current)
+    return batches
+
+def sliding_windows(n_tokens: int, window: int = 510, stride: int = 384, max_windows: int = None) -> list[tuple]:
+    """
+    Cover n_tokens with evenly spaced windows of at most `window` tokens, consecutive starts <= stride apart.
+    Returns (start, end, own_start, own_end) per window: overlapping tokens are owned by exactly one window
+    (split at the middle of the overlap, so every scored token keeps context on both sides).
+    With max_windows set and more windows needed, the same number of windows is spread evenly across
+    the text instead; the gaps between them are then not scored.
+    """
+    if n_tokens <= window:
+        return [(0, n_tokens, 0, n_tokens)]
+
+    count = -(-(n_tokens - window) // stride) + 1
+    if max_windows:
+        count = max(1, min(count, max_windows))
+    if count == 1:
+        starts = [(n_tokens - window) // 2]
+    else:
+        starts = [round(i * (n_tokens - window) / (count - 1)) for i in range(count)]
+
+    windows = []
+    for i, start in enumerate(starts):
+        end = start + window
+        own_start = start if i == 0 else max(start, (start + starts[i - 1] + window) // 2)
+        own_end = end if i == count - 1 else min(end, (starts[i + 1] + end) // 2)
+        windows.append((start, end, own_start, own_end))
+    return windows
 
 class AIDetector:
-    def __init__(self, model_name="indolem/indobert-base-uncased"):
+    # Bump whenever scoring/calibration changes so cached results from older logic are not reused
+    SCORING_VERSION = "3.7"
+    # Content tokens per global-perplexity window ([CLS] + 510 + [SEP] = the model's 512 positions)
+    GLOBAL_WINDOW = 510
+    # Sentences in the first progress chunk of a streamed scan
+    STREAM_FIRST_CHUNK = 32
+    # Documents longer than this (tokens) are sampled unless a full scan is requested
+    HYBRID_MIN_TOKENS = 512 * 4
+
+    # Naturalness lexicons (see calculate_naturalness)
+    # Human Markers (Slang & Non-Standard Consistency): these are rare in formal AI output
+    HUMAN_MARKERS = [
+        'yg', 'gw', 'lu', 'gak', 'udah', 'aja', 'nih', 'kalo', 'donk', 'banget',
+        'sih', 'deh', 'kok', 'tuh', 'loh', 'masih', 'cuma', 'pas', 'lagi', 'tadi',
+        'kayak', 'nyadar', 'abis', 'siapa', 'kenapa', 'gini', 'gitu', 'mana',
+        # Non-standard common typos (AI usually writes perfectly)
+        'analisa', 'praktek', 'risiko', 'obyek', 'subyek', 'efektifitas', 
+        'aktifitas', 'hirarki', 'kwalitas', 'prosentase', 'sekedar', 'merubah'
+    ]
+    # AI Hallmarks (Formal Transition words & Jargon): AI (GPT) LOVES these connectors
+    AI_HALLMARKS = [
+        'perlu digarisbawahi', 'oleh karena itu', 'namun demikian', 'kendati demikian',
+        'di sisi lain', 'dalam hal ini', 'sehubungan dengan', 'merujuk pada',
+        'selaras dengan', 'berkenaan dengan', 'lebih lanjut', 'tak kalah pentingnya',
+        'paradigma', 'diskursus', 'manifestasi', 'konstruksi', 'fundamen', 
+        'substansi', 'implementasi', 'signifikansi', 'komprehensif', 'empiris',
+        'teoretis', 'metodologis', 'interpretasi', 'perspektif'
+    ]
+    NATURALNESS_LEXICON = Lexicon({"human": HUMAN_MARKERS, "ai": AI_HALLMARKS})
+
+    def __init__(self, model_name="indolem/indobert-base-uncased", num_threads: int = None, token_budget: int = 4096,
+                 backend: str = "eager", cache_dir: str = "model_cache", use_artifact_cache: bool = False,
+                 global_window_stride: int = 384, global_max_windows: int = 8, global_max_windows_full: int = 32,
+                 scan_chunk_size: int = 256, scan_token_budget: int = 8192, scan_token_budget_full: int = 200000,
+                 hybrid_sampler: str = "head_mid_tail", hybrid_sample_size: int = 60, hybrid_target_ci: float = 5.0,
+                 citation_max_chars: int = None):
         self.device = torch.device("cuda" if torch.cuda.is_available() else "mps" if torch.backends.mps.is_available() else "cpu")
-        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-        
-        base_model = AutoModelForMaskedLM.from_pretrained(model_name)
         
         if self.device.type == "cpu":
             # Optimization for VPS (CPU only)
-            # 1. Dynamic Quantization: Reduces model size and speeds up CPU inference
-            self.model = torch.quantization.quantize_dynamic(
-                base_model, {torch.nn.Linear}, dtype=torch.qint8
-            )
+            # 1. Dynamic Quantization happens inside the eager/torchscript backends (ONNX quantizes its own graph)
             # 2. Thread Optimization: Use available cores efficiently
-            torch.set_num_threads(min(4, torch.get_num_threads())) 
+            # (the shared model server passes an explicit budget since it is the only process using the cores)
+            torch.set_num_threads(num_threads or min(4, torch.get_num_threads()))
+
+        # 3. Pre-quantized artifact: skip the fp32 load + quantize_dynamic on every start (CPU, torch backends)
+        store = ModelArtifactStore(cache_dir, model_name) if use_artifact_cache and self.device.type == "cpu" and backend != "onnx" else None
+        artifact = store.load() if store is not None else None
+
+        # Pluggable runtime: eager PyTorch, frozen TorchScript graph or ONNX Runtime (see inference_backends.py)
+        export_dir = os.path.join(cache_dir, "onnx", model_name.strip("/").replace("/", "--"))
+        if artifact is not None:
+            self.tokenizer, quantized_model = artifact
+            self.backend = create_backend(backend, quantized_model, self.device, quantized=True)
         else:
-            self.model = base_model.to(self.device)
-            
-        self.model.eval()
-        self.citation_handler = CitationHandler()
+            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+            base_model = AutoModelForMaskedLM.from_pretrained(model_name)
+            self.backend = create_backend(backend, base_model, self.device, export_dir=export_dir, num_threads=num_threads,
+                                          model_name=model_name)
+            if store is not None:
+                store.save(self.tokenizer, self.backend.model)
+        # The backend decides where inputs go: ONNX Runtime returns CPU logits even on an accelerator host
+        self.device = self.backend.device
+        self.model = self.backend.model
+        self.citation_handler = CitationHandler(max_chars=citation_max_chars)
+        self.language_id = LanguageIdentifier()
+        self.segmenter = SentenceSegmenter()
+        self.token_budget = token_budget
+        # Cost cap for the global perplexity pass: hybrid scans vs. paid full scans
+        self.global_window_stride = global_window_stride
+        self.global_max_windows = global_max_windows
+        self.global_max_windows_full = global_max_windows_full
+        # Sentence scan: chunk size (sentences) and per-tier cap on scored tokens per document
+        self.scan_chunk_size = max(1, scan_chunk_size)
+        self.scan_token_budget = scan_token_budget
+        self.scan_token_budget_full = scan_token_budget_full
+        # Which sentences a hybrid scan sends to the model (see sampling.py)
+        self.sampler = create_sampler(hybrid_sampler, sample_size=hybrid_sample_size, target_half_width=hybrid_target_ci)
+        # Result cache keys depend on everything that changes a scan's output: a redeploy with another sampler,
+        # budget or window cap must not be answered with results computed under the old settings
+        scan_settings = (hybrid_sampler, hybrid_sample_size, hybrid_target_ci, scan_token_budget, scan_token_budget_full,
+                         global_window_stride, global_max_windows, global_max_windows_full, self.scan_chunk_size,
+                         citation_max_chars)
+        settings_digest = hashlib.sha256(repr(scan_settings).encode()).hexdigest()[:12]
+        self.model_version = f"{model_name}@{self.SCORING_VERSION}~{settings_digest}+{self.backend.name}"
+        self.batcher = None
+        self.result_cache = None
+        self.feature_cache = None
+
+    def enable_micro_batching(self, max_batch_size: int = 24, max_wait_ms: float = 10.0):
+        """
+        Route sentence scoring through a shared MicroBatcher so concurrent analyze() calls
+        (e.g. from the inference executor threads) are coalesced into the same forward passes.
+        Batcher items are pre-tokenized sentences (token id lists), see score_sentences().
+        """
+        self.batcher = MicroBatcher(
+            lambda token_ids: self.score_token_ids(token_ids, token_budget=self.token_budget, max_batch_size=len(token_ids)),
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms
+        )
+        return self.batcher
+
+    def score_sentences(self, texts: list[str], batch_size: int = 64, token_ids: list[list[int]] = None,
+                        features: dict = None):
+        """
+        Sentence-level scoring entry point used by analyze().
+        Cached sentences (feature cache) are answered directly; the rest go through the
+        cross-request micro-batcher when enabled, otherwise are batched locally
+        (length-bucketed under the detector's token budget).
+        token_ids (model inputs per text, e.g. from DocumentTokens) skips re-tokenizing the texts.
+        features: {FeatureCache.key(text): features} already computed for this request (see analyze_pages).
+        """
+        if token_ids is None:
+            token_ids = self.tokenizer(texts, truncation=True, max_length=512)["input_ids"]
+        if features:
+            results = [features.get(FeatureCache.key(t)) for t in texts]
+            missing = [i for i, res in enumerate(results) if res is None]
+            if missing:
+                fresh = self.score_sentences([texts[i] for i in missing], batch_size, [token_ids[i] for i in missing])
+                for i, res in zip(missing, fresh):
+                    results[i] = res
+            return results
+        if self.feature_cache is None:
+            return self._score_uncached(token_ids, batch_size)
+
+        keys = [FeatureCache.key(t) for t in texts]
+        results = [self.feature_cache.get(k) for k in keys]
+
+        # Score each distinct missing sentence once
+        pending = {}
+        for i, res in enumerate(results):
+            if res is None:
+                pending.setdefault(keys[i], token_ids[i])
+        if pending:
+            fresh = self._score_uncached(list(pending.values()), batch_size)
+            fresh_by_key = dict(zip(pending.keys(), fresh))
+            for k, res in fresh_by_key.items():
+                self.feature_cache.put(k, res)
+            results = [res if res is not None else fresh_by_key[k] for k, res in zip(keys, results)]
+        return results
+
+    def _score_uncached(self, token_ids: list[list[int]], batch_size: int = 64):
+        if self.batcher is not None:
+            return self.batcher.score(token_ids)
+        return self.score_token_ids(token_ids, token_budget=self.token_budget, max_batch_size=batch_size)
 
-    def calculate_features_batch(self, texts: list[str], batch_size: int = 8):
+    def cache_stats(self) -> dict:
+        return {
+            "feature_cache": self.feature_cache.stats() if self.feature_cache is not None else None,
+            "result_cache": self.result_cache.stats() if self.result_cache is not None else None,
+            "batcher": self.batcher.stats() if self.batcher is not None else None,
+        }
+
+    def warmup(self, lengths: tuple = (8, 32, 128, 510)) -> float:
+        """
+        Run throwaway forward passes over representative sentence lengths (and the 512-token global slice)
+        so allocator pools, kernel selection and lazily mmapped weights are hot before the first real scan.
+        Bypasses the caches so no fake sentences are stored. Returns the elapsed seconds.
+        """
+        started = time.perf_counter()
+        words = "penelitian ini menggunakan data yang dikumpulkan dari sekolah dan guru".split()
+        texts = [" ".join(words[i % len(words)] for i in range(n)) for n in lengths]
+        self.calculate_features_batch(texts, batch_size=len(texts), token_budget=self.token_budget)
+        self.score_document(texts[-1])
+        elapsed = time.perf_counter() - started
+        logging.info(f"Model warm-up over lengths {list(lengths)} took {elapsed:.2f}s")
+        return elapsed
+
+    def calculate_features_batch(self, texts: list[str], batch_size: int = 8, token_budget: int = None):
         """
         Calculate features for a list of texts in batches for speed.
+        With token_budget set, texts are length-bucketed (batch_size becomes the max items per batch)
+        and results are returned in the original order.
         """
         results = []
         if not texts:
             return results
 
+        if token_budget:
+            input_ids = self.tokenizer(texts, truncation=True, max_length=512)["input_ids"]
+            return self.score_token_ids(input_ids, token_budget=token_budget, max_batch_size=batch_size)
+
         for i in range(0, len(texts), batch_size):
             batch_texts = texts[i:i + batch_size]
             encodings = self.tokenizer(batch_texts, return_tensors="pt", padding=True, truncation=True, max_length=512).to(self.device)
             
             with torch.no_grad():
-                outputs = self.model(**encodings, labels=encodings["input_ids"])
-                logits = outputs.logits
-                
-                # Manual cross entropy for per-item loss
-                shift_logits = logits.contiguous()
-                shift_labels = encodings["input_ids"].contiguous()
-                
-                loss_fct = torch.nn.CrossEntropyLoss(reduction='none')
-                loss = loss_fct(shift_logits.reshape(-1, shift_logits.size(-1)), shift_labels.reshape(-1))
-                loss = loss.reshape(shift_labels.size(0), -1)
-                
-                # Apply mask to loss calculation
-                mask = encodings["attention_mask"]
-                loss = (loss * mask).sum(dim=1) / mask.sum(dim=1)
-                
-                # Confidence
-                probs = F.softmax(logits, dim=-1)
-                token_probs = torch.gather(probs, 2, encodings["input_ids"].unsqueeze(-1)).squeeze(-1)
-                
-                # Average confidence per item (ignoring padding)
-                avg_confidence = (token_probs * mask).sum(dim=1) / mask.sum(dim=1)
-                
+                logits = self.backend.logits(encodings["input_ids"], encodings["attention_mask"])
+                loss, avg_confidence = token_loss_confidence(logits, encodings["input_ids"], encodings["attention_mask"])
+
             for l, c in zip(loss.tolist(), avg_confidence.tolist()):
                 results.append({"loss": l, "confidence": c})
         return results
 
+    def score_token_ids(self, input_ids: list[list[int]], token_budget: int = 4096, max_batch_size: int = 64):
+        """
+        Score pre-tokenized sequences (special tokens included) with dynamic padding:
+        each length bucket is padded only to its own longest member.
+        """
+        results = [None] * len(input_ids)
+        for indices in length_buckets([len(ids) for ids in input_ids], token_budget, max_batch_size):
+            encodings = self.tokenizer.pad(
+                {"input_ids": [input_ids[i] for i in indices]}, return_tensors="pt"
+            ).to(self.device)
+
+            with torch.no_grad():
+                logits = self.backend.logits(encodings["input_ids"], encodings["attention_mask"])
+                loss, avg_confidence = token_loss_confidence(logits, encodings["input_ids"], encodings["attention_mask"])
+
+            for i, l, c in zip(indices, loss.tolist(), avg_confidence.tolist()):
+                results[i] = {"loss": l, "confidence": c}
+        return results
+
     def calculate_features(self, text: str):
         if not text.strip() or len(text.split()) < 5:
             return {"loss": 0.0, "confidence": 0.0}
         return self.calculate_features_batch([text])[0]
 
-    def calculate_burstiness(self, text: str) -> float:
+    def score_document(self, text: str, max_windows: int = None, token_ids: list[int] = None) -> dict:
+        """
+        Global perplexity over the whole text (not just its first 1,500 characters).
+        The text is tokenized once and cut into strided 512-token windows that are batched
+        through the model under the token budget; loss and confidence are averaged over tokens,
+        each token counted once (in the window that owns it, see sliding_windows).
+        max_windows caps the cost on very long documents; coverage reports the scored token share.
+        token_ids (the text's ids without special tokens) skips re-tokenizing it.
+        """
+        if not text.strip() or len(text.split()) < 5:
+            return {"loss": 0.0, "confidence": 0.0, "windows": 0, "coverage": 0.0}
+
+        ids = token_ids if token_ids is not None else self.tokenizer(text, add_special_tokens=False, verbose=False)["input_ids"]
+        windows = sliding_windows(len(ids), self.GLOBAL_WINDOW, self.global_window_stride, max_windows)
+        cls_id, sep_id = self.tokenizer.cls_token_id, self.tokenizer.sep_token_id
+        sequences = [[cls_id] + ids[start:end] + [sep_id] for start, end, _, _ in windows]
+
+        total_loss = total_confidence = 0.0
+        scored_tokens = 0
+        for indices in length_buckets([len(seq) for seq in sequences], self.token_budget):
+            encodings = self.tokenizer.pad(
+                {"input_ids": [sequences[i] for i in indices]}, return_tensors="pt"
+            ).to(self.device)
+            with torch.no_grad():
+                logits = self.backend.logits(encodings["input_ids"], encodings["attention_mask"])
+                log_probs = token_log_probabilities(logits, encodings["input_ids"])
+
+            for row, i in enumerate(indices):
+                start, _, own_start, own_end = windows[i]
+                # +1 skips [CLS]; padding sits after [SEP] and is never owned
+                owned = log_probs[row, own_start - start + 1:own_end - start + 1]
+                total_loss -= owned.sum().item()
+                total_confidence += owned.exp().sum().item()
+                scored_tokens += owned.numel()
+
+        return {
+            "loss": total_loss / scored_tokens,
+            "confidence": total_confidence / scored_tokens,
+            "windows": len(windows),
+            "coverage": round(scored_tokens / len(ids), 4),
+        }
+
+    def calculate_burstiness(self, text: str, sentences: list[str] = None) -> float:
         """
         Calculate the Coefficient of Variation (CV) of sentence lengths.
+        sentences: the text's segmentation when the caller already has it.
         """
-        sentences = [s.strip() for s in re.split(r'[.!?\n]+', text) if len(s.strip()) > 10]
+        if sentences is None:
+            sentences = [s.text for s in self.segmenter.segment(text)]
+        sentences = [s for s in sentences if len(s) > 10]
         if len(sentences) <= 1:
             return 1.0
             
@@ -109,30 +388,10 @@ class AIDetector:
         if text and text[0].islower():
             bonus += 8.0 # Reduced from 15.0
             
-        # 3. Human Markers (Slang & Non-Standard Consistency)
-        # These are rare in formal AI output
-        human_markers = [
-            'yg', 'gw', 'lu', 'gak', 'udah', 'aja', 'nih', 'kalo', 'donk', 'banget',
-            'sih', 'deh', 'kok', 'tuh', 'loh', 'masih', 'cuma', 'pas', 'lagi', 'tadi',
-            'kayak', 'nyadar', 'abis', 'siapa', 'kenapa', 'gini', 'gitu', 'mana',
-            # Non-standard common typos (AI usually writes perfectly)
-            'analisa', 'praktek', 'risiko', 'obyek', 'subyek', 'efektifitas', 
-            'aktifitas', 'hirarki', 'kwalitas', 'prosentase', 'sekedar', 'merubah'
-        ]
-        
-        # 4. AI Hallmarks (Formal Transition words & Jargon)
-        # AI (GPT) LOVES these connectors. Presence should SUBTRACT from human bonus.
-        ai_hallmarks = [
-            'perlu digarisbawahi', 'oleh karena itu', 'namun demikian', 'kendati demikian',
-            'di sisi lain', 'dalam hal ini', 'sehubungan dengan', 'merujuk pada',
-            'selaras dengan', 'berkenaan dengan', 'lebih lanjut', 'tak kalah pentingnya',
-            'paradigma', 'diskursus', 'manifestasi', 'konstruksi', 'fundamen', 
-            'substansi', 'implementasi', 'signifikansi', 'komprehensif', 'empiris',
-            'teoretis', 'metodologis', 'interpretasi', 'perspektif'
-        ]
-        
-        found_human = sum(1 for m in human_markers if re.search(r'\b' + m + r'\b', text.lower()))
-        found_ai = sum(1 for m in ai_hallmarks if re.search(r'\b' + m + r'\b', text.lower()))
+        # 3. Human Markers / 4. AI Hallmarks: one pass over the text for both lists
+        found = self.NATURALNESS_LEXICON.count(text)
+        found_human = found["human"]
+        found_ai = found["ai"]
         
         bonus += (found_human * 6.0)
         bonus -= (found_ai * 3.0) # AI connectors reduce the manual human bonus
@@ -141,6 +400,21 @@ class AIDetector:
         length_factor = min(1.0, 250 / (len(words) + 1))
         return max(0, bonus * length_factor)
 
+    @staticmethod
+    def is_noise_sentence(s_text: str) -> bool:
+        """Headers/footers/numerics: < 5 words or too many digits/symbols to score meaningfully."""
+        return len(s_text.split()) < 5 or (sum(c.isdigit() or not c.isalnum() for c in s_text) / (len(s_text) + 1)) > 0.4
+
+    @staticmethod
+    def semantic_score(s_loss: float, target_baseline: float = 1.94) -> tuple[float, float]:
+        """Sentence loss -> (0-100 AI score, ensemble weight)."""
+        raw_diff = target_baseline - s_loss
+        
+        # Semantic Scoring Logic (Bullseye for Docs)
+        if raw_diff > 0.6: return float(max(0, min(100, raw_diff * 140))), 1.5
+        elif raw_diff > 0.3: return float(max(0, min(100, raw_diff * 105))), 1.2
+        else: return float(max(0, min(100, raw_diff * 72))), 0.4
+
     def normalize_text(self, text: str) -> str:
         """
         Cleans extraction artifacts like physical line breaks from layout.
@@ -156,45 +430,155 @@ class AIDetector:
         
         return temp.strip()
 
-    def analyze(self, text: str, force_full_scan: bool = False):
+    def sentence_spans(self, clean_text: str) -> list[Sentence]:
+        """
+        Sentences scored by analyze(), with their offsets in clean_text (see core/segmenter.py).
+        Fragments of 5 characters or fewer are dropped.
+        """
+        spans = [s for s in self.segmenter.segment(clean_text) if len(s.text) > 5]
+        return spans or [Sentence(clean_text, 0, len(clean_text))]
+
+    def split_sentences(self, clean_text: str) -> list[str]:
+        """Sentence texts used by analyze() (and by the result cache to restore them)."""
+        return [s.text for s in self.sentence_spans(clean_text)]
+
+    def analyze(self, text: str, force_full_scan: bool = False, text_hash: str = None, on_progress=None,
+                language_hints: dict = None, features: dict = None):
+        """
+        Full ensemble analysis. When a result cache is attached, identical resubmissions
+        (same sha256, model version and scan mode) are answered from the cache.
+        on_progress(event) is called after every scanned chunk with the new sentence entries
+        ({"processed", "total", "start", "sentences", "opinion_semantic"}) for streaming clients.
+        language_hints: sentence labels from the API's language guard (LanguageIdentifier.assess_document),
+        reused instead of classifying those sentences again.
+        features: sentence features scored ahead of time (analyze_pages); only saves model calls.
+        """
+        if self.result_cache is None:
+            return self._analyze(text, force_full_scan, on_progress, language_hints, features)
+
+        text_hash = text_hash or hashlib.sha256(text.encode()).hexdigest()
+        cache_key = ResultCache.make_key(text_hash, self.model_version, force_full_scan)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            result = ResultCache.rehydrate(cached, self.split_sentences(self.normalize_text(text)))
+            if on_progress is not None:
+                total = len(result["sentences"])
+                on_progress({
+                    "processed": total, "total": total, "start": 0,
+                    "sentences": result["sentences"], "opinion_semantic": result["opinion_semantic"]
+                })
+            return result
+
+        result = self._analyze(text, force_full_scan, on_progress, language_hints, features)
+        stripped = ResultCache.strip_text(result, self.split_sentences(self.normalize_text(text)))
+        if stripped is not None:
+            self.result_cache.put(cache_key, stripped)
+        return result
+
+    def prescore_page(self, page: str, force_full_scan: bool = False, used_tokens: int = 0) -> tuple:
+        """
+        Score the sentences of one extracted page ahead of analyze() (see page_stream.py), in document order
+        and within the scan's token budget (a sampled scan only prescores while the document is still short
+        enough to be scanned whole). used_tokens is what earlier pages of the document already spent.
+        Returns ({FeatureCache.key(sentence): features}, used_tokens, exhausted).
+        """
+        budget = self.scan_token_budget_full if force_full_scan else self.scan_token_budget
+        limit = budget if force_full_scan else min(budget, self.HYBRID_MIN_TOKENS)
+        if used_tokens >= limit:
+            return {}, used_tokens, True
+        sentences = [s.text for s in self.segmenter.segment(self.normalize_text(page)) if len(s.text) > 5]
+        if not sentences:
+            return {}, used_tokens, False
+        ids = self.tokenizer(sentences, truncation=True, max_length=512)["input_ids"]
+        take = 0
+        for sentence_ids in ids:
+            if used_tokens + len(sentence_ids) - 2 > limit:
+                break
+            used_tokens += len(sentence_ids) - 2
+            take += 1
+        scored = self.score_sentences(sentences[:take], token_ids=ids[:take]) if take else []
+        features = {FeatureCache.key(t): f for t, f in zip(sentences, scored)}
+        return features, used_tokens, take < len(ids) or used_tokens >= limit
+
+    def analyze_pages(self, pages, force_full_scan: bool = False, text_hash: str = None, on_progress=None,
+                      before_prescore=None, before_analyze=None):
+        """
+        Analyze a document that arrives page by page (DocumentProcessor.iter_pages), the pages joined like
+        DocumentProcessor.process_file, scoring finished pages while later ones are still being extracted.
+        before_prescore(head) guards the first pages before any scoring; before_analyze(text) the full
+        text (see page_stream.analyze_page_stream).
+        """
+        return analyze_page_stream(self, pages, force_full_scan=force_full_scan, text_hash=text_hash,
+                                   on_progress=on_progress, before_prescore=before_prescore,
+                                   before_analyze=before_analyze)
+
+    def _analyze(self, text: str, force_full_scan: bool = False, on_progress=None, language_hints: dict = None,
+                 features: dict = None):
         clean_text = self.normalize_text(text)
         
-        tokens = self.tokenizer(clean_text, return_tensors="pt", add_special_tokens=False).to(self.device)
-        input_ids = tokens["input_ids"][0]
+        # Single tokenization pass: token count, sentence inputs and the global prose ids all come from it
+        doc_tokens = DocumentTokens(self.tokenizer, clean_text)
         
         # --- PERFORMANCE OPTIMIZATION: Hybrid Sampling ---
-        max_len = 512
-        total_tokens = len(input_ids)
+        total_tokens = len(doc_tokens)
         
-        is_hybrid = total_tokens > (max_len * 4) and not force_full_scan 
+        is_hybrid = total_tokens > self.HYBRID_MIN_TOKENS and not force_full_scan 
         partially_analyzed = False
         
         # 1. Improved Sentence Analysis
-        parts = re.split(r'([.!?]\s+(?=[A-Z"“])|["“][^"”]*["”])', clean_text)
-        raw_sentences = []
-        for p in parts:
-            if not p: continue
-            if p.startswith(('"', '“')) and p.endswith(('"', '”')):
-                raw_sentences.append(p.strip())
-            else:
-                sub_parts = re.split(r'(?<=[.!?])\s+(?=[A-Z"“])', p)
-                raw_sentences.extend([s.strip() for s in sub_parts if s.strip()])
-        
-        processed_sentences = [s for s in raw_sentences if len(s) > 5]
-        if not processed_sentences: processed_sentences = [clean_text]
+        spans = self.sentence_spans(clean_text)
+        processed_sentences = [s.text for s in spans]
+        # Token ids of every sentence, sliced from the document pass at its offsets (identical texts share ids)
+        sentence_tokens = dict(zip(
+            processed_sentences,
+            doc_tokens.sentence_ids(processed_sentences, max_length=None, add_special_tokens=False,
+                                    offsets=[(s.start, s.end) for s in spans])
+        ))
         
-        # Determine which sentences to scan
+        # Per-tier token budget on sentence tokens sent to the model
+        token_budget = self.scan_token_budget_full if force_full_scan else self.scan_token_budget
+        used_tokens = 0
+        prescored = {}
+
+        def input_ids(i):
+            return doc_tokens.model_input(sentence_tokens[processed_sentences[i]])
+
+        def score_within_budget(indices):
+            # Sequential sampler callback: score in document order of the request, stop at the budget
+            nonlocal used_tokens
+            affordable = []
+            for i in indices:
+                cost = len(input_ids(i)) - 2
+                if used_tokens + cost > token_budget:
+                    break
+                used_tokens += cost
+                affordable.append(i)
+            scored = self.score_sentences([processed_sentences[i] for i in affordable], token_ids=[input_ids(i) for i in affordable],
+                                          features=features)
+            prescored.update(zip(affordable, scored))
+            return [self.semantic_score(f["loss"])[0] for f in scored]
+
+        # Determine which sentences to scan (indices into processed_sentences)
         if not is_hybrid:
-            sentences_to_scan = processed_sentences[:100]
+            candidates = range(len(processed_sentences))
         else:
             partially_analyzed = True
-            idx_s = processed_sentences[:20]
-            mid = len(processed_sentences) // 2
-            idx_m = processed_sentences[mid-10:mid+10]
-            idx_e = processed_sentences[-20:]
-            sentences_to_scan = idx_s + idx_m + idx_e
+            # Only sentences that can contribute to the semantic score are worth a model call
+            scorable = [i for i, s_text in enumerate(processed_sentences) if not self.is_noise_sentence(s_text)]
+            candidates = self.sampler.select(scorable, seed=zlib.crc32(clean_text.encode()), score=score_within_budget)
+
+        # Long documents are scanned in order until the budget runs out (already-scored samples are paid for)
+        scan_indices = set(prescored)
+        for i in candidates:
+            if i in prescored:
+                continue
+            cost = len(input_ids(i)) - 2
+            if used_tokens + cost > token_budget:
+                partially_analyzed = True
+                break
+            used_tokens += cost
+            scan_indices.add(i)
 
-        sent_results = self.calculate_features_batch(sentences_to_scan, batch_size=24)
         detailed = []
         
         # --- CITATION FILTERING ---
@@ -209,60 +593,76 @@ class AIDetector:
         total_relevant_words = 0
         weighted_s_score = 0
         
-        from langdetect import detect
-        scanned_map = {s_text: res for s_text, res in zip(sentences_to_scan, sent_results)}
-        
         in_bibliography = False
-        for s_text in processed_sentences[:150]:
-            is_english = False
-            try:
-                if len(s_text.split()) > 3:
-                    if detect(s_text) == 'en': is_english = True
-            except: pass
-
-            if is_english:
-                detailed.append({"text": s_text, "score": -1.0, "language": "en"})
-                continue
-                
-            # persistent bibliography check
-            if self.citation_handler.patterns["headers"].search(s_text):
-                h_match = self.citation_handler.patterns["headers"].search(s_text).group(0).upper()
-                if any(kw in h_match for kw in ["DAFTAR PUSTAKA", "REFERENCES", "BIBLIOGRAPHY", "WORKS CITED"]):
-                    in_bibliography = True
+        # Long-document mode: every sentence is processed, in chunks, so model batches and
+        # intermediate scores stay bounded however long the document is
+        # Streaming clients get a small first chunk so the first scores arrive after one small batch
+        first_chunk = min(self.STREAM_FIRST_CHUNK, self.scan_chunk_size) if on_progress is not None else self.scan_chunk_size
+        chunk_starts = [0] + list(range(first_chunk, len(processed_sentences), self.scan_chunk_size))
+        for chunk_no, chunk_start in enumerate(chunk_starts):
+            chunk_end = chunk_starts[chunk_no + 1] if chunk_no + 1 < len(chunk_starts) else len(processed_sentences)
+            chunk = processed_sentences[chunk_start:chunk_end]
+            chunk_scan = [i for i in range(chunk_start, chunk_start + len(chunk)) if i in scan_indices and i not in prescored]
+            chunk_results = self.score_sentences(
+                [processed_sentences[i] for i in chunk_scan], token_ids=[input_ids(i) for i in chunk_scan], features=features
+            ) if chunk_scan else []
+            scanned_map = dict(zip(chunk_scan, chunk_results))
+            scanned_map.update((i, prescored[i]) for i in range(chunk_start, chunk_start + len(chunk)) if i in prescored)
+            chunk_first_entry = len(detailed)
+            citation_rules = self.citation_handler.classify_many(chunk)
+            # One batched language-ID call per chunk (sentences of 3 words or fewer are never flagged)
+            languages = self.language_id.detect_many([s if len(s.split()) > 3 else "" for s in chunk], hints=language_hints)
 
-            # Check for citation
-            is_cite = self.citation_handler.is_citation(s_text) or in_bibliography
-            if is_cite:
-                citation_count += 1
-
-            if s_text in scanned_map:
-                f = scanned_map[s_text]
-                s_loss = f["loss"]
-                # FILTERING: Ignore noise (headers/footers/citations/numerics)
-                # Skip sentences < 5 words or containing too many numbers/symbols
-                s_words = s_text.split()
-                if len(s_words) < 5 or (sum(c.isdigit() or not c.isalnum() for c in s_text) / (len(s_text) + 1)) > 0.4:
+            for idx, s_text in enumerate(chunk, start=chunk_start):
+                # Character offsets in the normalized text, for highlighting
+                offsets = {"start": spans[idx].start, "end": spans[idx].end}
+                if languages[idx - chunk_start] == "en":
+                    detailed.append({"text": s_text, "score": -1.0, "language": "en", **offsets})
                     continue
-
-                raw_diff = target_baseline - s_loss
-                
-                # Semantic Scoring Logic (Bullseye for Docs)
-                if raw_diff > 0.6: s_score, weight = float(max(0, min(100, raw_diff * 140))), 1.5
-                elif raw_diff > 0.3: s_score, weight = float(max(0, min(100, raw_diff * 105))), 1.2
-                else: s_score, weight = float(max(0, min(100, raw_diff * 72))), 0.4
                     
-                # Length-Weighted Addition
-                l_weight = len(s_words) / 15.0 # Normalizing around 15 words
-                
-                # --- CITATION LOGIC: Exclude from global weight if citation ---
+                # Check for citation
+                citation_rule = citation_rules[idx - chunk_start]
+
+                # persistent bibliography check (a header always classifies as a citation, so prose skips it)
+                if citation_rule is not None and self.citation_handler.is_bibliography_header(s_text):
+                    in_bibliography = True
+
+                is_cite = citation_rule is not None or in_bibliography
                 if is_cite:
-                    detailed.append({"text": s_text, "score": round(s_score, 2), "is_citation": True})
+                    citation_count += 1
+
+                if idx in scanned_map:
+                    f = scanned_map[idx]
+                    s_loss = f["loss"]
+                    # FILTERING: Ignore noise (headers/footers/citations/numerics)
+                    # Skip sentences < 5 words or containing too many numbers/symbols
+                    if self.is_noise_sentence(s_text):
+                        continue
+                    s_words = s_text.split()
+
+                    s_score, weight = self.semantic_score(s_loss, target_baseline)
+                        
+                    # Length-Weighted Addition
+                    l_weight = len(s_words) / 15.0 # Normalizing around 15 words
+                    
+                    # --- CITATION LOGIC: Exclude from global weight if citation ---
+                    if is_cite:
+                        detailed.append({"text": s_text, "score": round(s_score, 2), "is_citation": True, **offsets})
+                    else:
+                        ai_weights += (s_score * weight * l_weight)
+                        total_weight += (weight * l_weight)
+                        detailed.append({"text": s_text, "score": round(s_score, 2), "is_citation": False, **offsets})
                 else:
-                    ai_weights += (s_score * weight * l_weight)
-                    total_weight += (weight * l_weight)
-                    detailed.append({"text": s_text, "score": round(s_score, 2), "is_citation": False})
-            else:
-                detailed.append({"text": s_text, "score": 0.0, "skipped": True, "is_citation": is_cite})
+                    detailed.append({"text": s_text, "score": 0.0, "skipped": True, "is_citation": is_cite, **offsets})
+
+            if on_progress is not None:
+                on_progress({
+                    "processed": chunk_start + len(chunk),
+                    "total": len(processed_sentences),
+                    "start": chunk_first_entry,
+                    "sentences": detailed[chunk_first_entry:],
+                    "opinion_semantic": round(ai_weights / total_weight, 2) if total_weight > 0 else 0.0,
+                })
                 
         citation_percentage = round((citation_count / len(detailed)) * 100, 1) if detailed else 0.0
 
@@ -273,13 +673,18 @@ class AIDetector:
         # This prevents English abstracts or long bibliographies from skewing Perplexity/Burstiness
         prose_sentences = [s["text"] for s in detailed if not s.get("is_citation") and s.get("language") != "en" and not s.get("skipped")]
         analysis_base_text = " ".join(prose_sentences)
+        prose_ids = [t for s in prose_sentences for t in sentence_tokens[s]]
         
         # Fallback if no prose remains (e.g. 100% citation)
         if len(analysis_base_text.split()) < 5:
             analysis_base_text = clean_text 
+            prose_ids = doc_tokens.ids
+            prose_sentences = processed_sentences
 
         # --- ENSEMBLE OPINION 2: STATISTICAL (Perplexity) ---
-        global_features = self.calculate_features(analysis_base_text[:1500])
+        # Whole prose text in sliding windows; paid full scans may spend more windows
+        max_windows = self.global_max_windows_full if force_full_scan else self.global_max_windows
+        global_features = self.score_document(analysis_base_text, max_windows=max_windows, token_ids=prose_ids)
         global_loss = global_features["loss"]
         # Convert Loss to 0-100 scale. Lower loss = Higher AI Probability.
         # Loss around 0.5 is very high AI, loss > 2.0 is likely human.
@@ -287,7 +692,7 @@ class AIDetector:
 
         # --- ENSEMBLE OPINION 3: STRUCTURAL (Burstiness) ---
         # CV < 0.2 (Flat/AI), CV > 0.8 (Very Bursty/Human)
-        cv = self.calculate_burstiness(analysis_base_text)
+        cv = self.calculate_burstiness(analysis_base_text, sentences=prose_sentences)
         opinion_burstiness = max(0, min(100, (0.75 - cv) * 110))
         
         # --- HUMAN NATURALNESS BONUS ---
@@ -338,6 +743,8 @@ class AIDetector:
             "ai_probability": round(final_prob, 2),
             "ai_source": ai_source,
             "perplexity": round(float(global_loss), 4),
+            "perplexity_coverage": global_features["coverage"],
+            "token_count": total_tokens,
             "burstiness": round(float(cv), 4),
             "status": status,
             "sentences": detailed,
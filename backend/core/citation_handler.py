@@ -1,11 +1,19 @@
 import re
+from typing import Optional
 
 class CitationHandler:
-    def __init__(self):
+    _DIGIT = re.compile(r"\d")
+
+    def __init__(self, max_chars: int = None):
+        # Length cap: longer "sentences" (run-on PDF text) are judged on their first and last max_chars / 2 characters
+        self.max_chars = max_chars
         # Patterns for academic citations and direct quotes
+        # All patterns run in linear time on any input (see tests/test_citation_patterns.py)
         self.patterns = {
-            # Direct quotes with double quotes "..." or “...”
-            "direct_quote": re.compile(r'["“][^"”]{30,}["”]', re.IGNORECASE),
+            # Direct quotes with double quotes "..." or “...” (30+ characters)
+            # Only the earliest opener of each unquoted run is tried: a straight quote opens the run it
+            # precedes, a curly opener is the first “ after the run start (any later opener would fail too)
+            "direct_quote": re.compile(r'"[^"”]{30,}["”]|(?:\A|(?<=["”]))[^"”“]*“[^"”]{30,}["”]', re.IGNORECASE),
             
             # Comprehensive Body Note (APA, MLA, Chicago)
             # Now strictly requires academic markers like years, page numbers, ampersands, or MLA (Name Page)
@@ -14,18 +22,21 @@ class CitationHandler:
             
             # Comprehensive Narrative Citation
             # Patterns: Author (Year), Author (Year, p. Page), Author (Page)
-            "narrative_citation": re.compile(r'\b[\w\s\.,&]+(\set\sal\.)?,?\s\((?:\d{4}|\d+)(?:[,\s:]+(?:hal\.|p\.|hlm\.)?\s?\d+)?\)', re.UNICODE),
+            # Anchored on the last word character before " (": any author text ending there qualifies, and
+            # the scan stays linear (an open-ended [\w\s.,&]+ prefix re-scans the whole line from every word)
+            "narrative_citation": re.compile(r'\w[\s\.,&]*\s\(\d+(?:[,\s:]+(?:hal\.|p\.|hlm\.)?\s?\d+)?\)', re.UNICODE),
             
             "bracketed": re.compile(r'\[\d{1,3}(,\s?\d{1,3})*\]'),
             
             # Footnote content format (e.g., "1 Nama Penulis, Judul...")
-            "footnote_content": re.compile(r'^\d{1,3}\s+[A-Z][a-z]+.*,.*(19|20)\d{2}.*', re.MULTILINE),
+            # A year after the first comma of the line (equivalent to after any comma, without backtracking)
+            "footnote_content": re.compile(r'^\d{1,3}\s+[A-Z][a-z][^,\n]*,.*(?:19|20)\d{2}', re.MULTILINE),
             
             # Traditional footnote markers
             "footnote_markers": re.compile(r'\b(Ibid\.|Op\.cit\.|Loc\.cit\.)\b', re.IGNORECASE),
 
-            # Emails
-            "email": re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+            # Emails (the local part is matched from its last word boundary, so each run is scanned once)
+            "email": re.compile(r'\b(?:[A-Za-z0-9_]+|[.%+-]+)@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
 
             # Journal Metadata (e.g., JEMI VOL 25 No.2/Desember 2025)
             "journal_metadata": re.compile(r'\b(VOL|NO|VOLUME|NOMOR|ISSN|E-ISSN|DOI|HAL|PP)\.?\b\s+\d+.*', re.IGNORECASE),
@@ -34,10 +45,24 @@ class CitationHandler:
             "legal_citation": re.compile(r'\b(Pasal|Ayat|Undang-Undang|UU|UUD|Peraturan|Permen|Kepmen)\b\s+\d+.*', re.IGNORECASE),
 
             # Statistical/Math Data (often triggers low perplexity false AI flags)
-            "stat_data": re.compile(r'\b(R2|R-Square|P-Value|Sig\.|ANOVA|F\shitung|T\shitung|df|Std\.\sError)\.?\b.*[<>=]\s?\d+.*', re.IGNORECASE),
+            # Only the first statistic keyword of a line is tried (later ones see a subset of the same line),
+            # plus the two-word keywords broken across a line break, which continue on the next line
+            "stat_data": re.compile(
+                r'^(?:(?!\b(?:R2|R-Square|P-Value|Sig\.|ANOVA|F\shitung|T\shitung|df|Std\.\sError)\.?\b).)*'
+                r'\b(?:R2|R-Square|P-Value|Sig\.|ANOVA|F\shitung|T\shitung|df|Std\.\sError)\.?\b.*[<>=]\s?\d'
+                r'|\b(?:[FT]\nhitung|Std\.\nError)\.?\b.*[<>=]\s?\d',
+                re.IGNORECASE | re.MULTILINE
+            ),
 
             # Bibliography format like "Name, A. B. (YYYY)" or "Name, A. B., & Other, C."
-            "bib_style": re.compile(r'^[A-Z][a-z]+,?\s[A-Z](\.\s?[A-Z]?)*,?\s?(&\s?[A-Z][a-z]+)?.*\(?\d{4}\)?', re.MULTILINE),
+            # A year later on the author's line, or on a following line reached through the initials
+            # (". B.", ", ", "& Other" may continue across line breaks). Trying each initials split
+            # against the rest of the line was quadratic; only the line starts need to be tried
+            "bib_style": re.compile(
+                r'^[A-Z][a-z]+,?\s[A-Z]'
+                r'(?:.*\d{4}|(?:\.\s?[A-Z]?)*,?\s?(?:&\s?)?(?<=\n)(?:(?<=&\n)(?=[A-Z][a-z])|(?<!&\n)).*\d{4})',
+                re.MULTILINE
+            ),
             
             # URLs and DOIs
             "url": re.compile(r'https?://[^\s<>"]+|www\.[^\s<>"]+|doi\.org/[^\s<>"]+', re.IGNORECASE),
@@ -46,7 +71,7 @@ class CitationHandler:
             "headers": re.compile(r'\b(DAFTAR PUSTAKA|REFERENCES|BIBLIOGRAPHY|DAFTAR RUJUKAN|CATATAN KAKI|FOOTNOTES|WORKS CITED|ABSTRACT|INTISARI|SARI|PENDAHULUAN|METODOLOGI|HASIL DAN PEMBAHASAN|KESIMPULAN|SUMMARY)\b', re.IGNORECASE),
 
             # Bibliography Titles / Long Fragments (Title Case heavy)
-            "bib_title": re.compile(r'\b[A-Z][a-z]{2,}\b(\s\b[A-Z][a-z]{1,}\b){5,}', re.UNICODE),
+            "bib_title": re.compile(r'\b[A-Z][a-z]{2,}\b(?:\s[A-Z][a-z]+\b){5,}', re.UNICODE),
 
             # Introductory phrases common in academic citations in Indonesian
             "intro_indonesian": re.compile(
@@ -54,50 +79,94 @@ class CitationHandler:
                 re.IGNORECASE
             )
         }
+        self._scanners = {}
+
+    # Rule order of the original sequential checks; "intro_indonesian" only counts in short sentences
+    RULES = (
+        "headers", "url", "email", "journal_metadata", "legal_citation", "direct_quote",
+        "body_note", "narrative_citation", "bracketed", "bib_style", "bib_title",
+        "footnote_content", "stat_data", "footnote_markers", "intro_indonesian",
+    )
+    INTRO_MAX_WORDS = 45
+    BIBLIOGRAPHY_HEADERS = ("DAFTAR PUSTAKA", "REFERENCES", "BIBLIOGRAPHY", "WORKS CITED")
+
+    @staticmethod
+    def _prefilters(text: str) -> frozenset:
+        """Cheap necessary conditions; a rule whose condition fails cannot match and is left out of the scan."""
+        has_digit = CitationHandler._DIGIT.search(text) is not None
+        paren = "(" in text and ")" in text
+        active = {"headers", "url", "bib_title"}
+        if "@" in text:
+            active.add("email")
+        if '"' in text or "“" in text:
+            active.add("direct_quote")
+        if paren:
+            active.add("body_note")
+        if "." in text:
+            active.add("footnote_markers")
+        if has_digit:
+            active.update(("journal_metadata", "legal_citation", "bib_style", "footnote_content"))
+            if paren:
+                active.add("narrative_citation")
+            if "[" in text:
+                active.add("bracketed")
+            if "<" in text or ">" in text or "=" in text:
+                active.add("stat_data")
+        if len(text.split()) < CitationHandler.INTRO_MAX_WORDS:
+            active.add("intro_indonesian")
+        return frozenset(active)
+
+    def _scanner(self, active: frozenset):
+        """One compiled alternation of the active rules (each keeps its own flags), cached per prefilter outcome."""
+        scanner = self._scanners.get(active)
+        if scanner is None:
+            parts = []
+            for rule in self.RULES:
+                if rule in active:
+                    pattern = self.patterns[rule]
+                    flags = ("i" if pattern.flags & re.IGNORECASE else "") + ("m" if pattern.flags & re.MULTILINE else "")
+                    body = f"(?{flags}:{pattern.pattern})" if flags else pattern.pattern
+                    parts.append(f"(?P<{rule}>{body})")
+            scanner = self._scanners[active] = re.compile("|".join(parts))
+        return scanner
+
+    def classify(self, text: str) -> Optional[str]:
+        """
+        Name of a citation rule that matches the sentence (see RULES), or None for regular prose.
+        All rules run as a single compiled scan after the cheap prefilters; the decision is the same
+        as checking every rule in turn, but when several rules match the reported one is the leftmost match.
+        """
+        if self.max_chars and len(text) > self.max_chars:
+            half = self.max_chars // 2
+            return self._classify(text[:half]) or self._classify(text[-half:])
+        return self._classify(text)
+
+    def _classify(self, text: str) -> Optional[str]:
+        match = self._scanner(self._prefilters(text)).search(text)
+        if match is None:
+            return None
+        return next(rule for rule, value in match.groupdict().items() if value is not None)
+
+    def classify_many(self, texts: list[str]) -> list[Optional[str]]:
+        """classify() for a batch of sentences (e.g. one scan chunk)."""
+        return [self.classify(text) for text in texts]
 
     def is_citation(self, text: str) -> bool:
         """
         Determines if a given sentence or fragment is a citation or direct quote.
         """
-        # 0. Check for Headers, URLS, Emails, or Metadata (High priority data exclusion)
-        if (self.patterns["headers"].search(text) or 
-            self.patterns["url"].search(text) or 
-            self.patterns["email"].search(text) or
-            self.patterns["journal_metadata"].search(text) or
-            self.patterns["legal_citation"].search(text)):
-            return True
-
-        # 1. Check for long direct quotes
-        if any(self.patterns["direct_quote"].finditer(text)):
-            return True
-            
-        # 2. Check for reference markers, body notes & stats
-        if (self.patterns["body_note"].search(text) or 
-            self.patterns["narrative_citation"].search(text) or 
-            self.patterns["bracketed"].search(text) or
-            self.patterns["bib_style"].search(text) or
-            self.patterns["bib_title"].search(text) or
-            self.patterns["footnote_content"].search(text) or
-            self.patterns["stat_data"].search(text) or
-            self.patterns["footnote_markers"].search(text)):
-            return True
-            
-        # 3. Check for specific Indonesian intro markers (Heuristic)
-        if self.patterns["intro_indonesian"].search(text) and len(text.split()) < 45:
-            return True
+        return self.classify(text) is not None
 
-        return False
+    def is_bibliography_header(self, text: str) -> bool:
+        """True if the sentence contains a reference-list heading (everything after it is bibliography)."""
+        match = self.patterns["headers"].search(text)
+        return match is not None and any(kw in match.group(0).upper() for kw in self.BIBLIOGRAPHY_HEADERS)
 
     def mask_citations(self, sentences: list) -> list:
         """
         Processes a list of sentence dictionaries and marks them.
         """
-        processed = []
-        for s in sentences:
-            text = s.get("text", "")
-            if self.is_citation(text):
-                s["is_citation"] = True
-            else:
-                s["is_citation"] = False
-            processed.append(s)
-        return processed
+        rules = self.classify_many([s.get("text", "") for s in sentences])
+        for s, rule in zip(sentences, rules):
+            s["is_citation"] = rule is not None
+        return sentences
@@ -28,4 +28,100 @@ class Settings(BaseSettings):
     # Public Application URL
     APP_URL: str = os.getenv("APP_URL", "https://sahihaksara.id")
 
+    # Inference Executor (model work runs off the event loop)
+    # MAX_WORKERS: concurrent analyze() calls per API worker
+    # MAX_QUEUE: extra requests allowed to wait before we shed load with 503
+    INFERENCE_MAX_WORKERS: int = 2
+    INFERENCE_MAX_QUEUE: int = 8
+
+    # Micro-Batching (coalesce sentences from concurrent scans into shared forward passes)
+    MICRO_BATCH_ENABLED: bool = True
+    MICRO_BATCH_MAX_SIZE: int = 64
+    MICRO_BATCH_MAX_WAIT_MS: float = 10.0
+
+    # Inference Backend: "eager" (PyTorch + dynamic int8), "torchscript" (frozen graph) or "onnx" (ONNX Runtime int8)
+    INFERENCE_BACKEND: str = "eager"
+    # Local directory for prepared model artifacts (pre-quantized weights, ONNX exports)
+    MODEL_CACHE_DIR: str = "model_cache"
+    # Reuse the persisted pre-quantized model instead of re-running quantize_dynamic at every start
+    MODEL_ARTIFACT_CACHE: bool = True
+    # Model Loading (background load at startup; scans wait this long before a 503 while it is still loading)
+    MODEL_LOAD_WAIT_SECONDS: float = 30.0
+    # Throwaway forward passes over typical sentence lengths before the worker reports ready
+    MODEL_WARMUP_ENABLED: bool = True
+
+    # Length-bucketed batching: max (sentences x padded length) per forward pass
+    SCORING_TOKEN_BUDGET: int = 4096
+
+    # Global perplexity: 512-token sliding windows over the whole prose text
+    # Stride = tokens between window starts (512 - stride = overlap); MAX_WINDOWS caps the cost per tier
+    GLOBAL_WINDOW_STRIDE: int = 384
+    GLOBAL_MAX_WINDOWS: int = 8
+    GLOBAL_MAX_WINDOWS_FULL_SCAN: int = 32
+
+    # Sentence scan: every sentence is processed in chunks of SCAN_CHUNK_SENTENCES;
+    # the token budgets cap the sentence tokens scored per document (hybrid tier / full scan tier)
+    SCAN_CHUNK_SENTENCES: int = 256
+    SCAN_TOKEN_BUDGET: int = 8192
+    SCAN_TOKEN_BUDGET_FULL_SCAN: int = 200000
+
+    # Hybrid scan sampler: "head_mid_tail", "stratified", "reservoir" or "sequential" (stops once the
+    # 95% CI of the mean sentence score is within HYBRID_TARGET_CI points); SAMPLE_SIZE = max sentences scored.
+    # The others are opt-in until benchmarks/eval_samplers.py shows they beat the original on real documents
+    HYBRID_SAMPLER: str = "head_mid_tail"
+    HYBRID_SAMPLE_SIZE: int = 60
+    HYBRID_TARGET_CI: float = 5.0
+
+    # Citation check: sentences longer than this (run-on PDF text) are judged on their first and last
+    # CITATION_MAX_CHARS / 2 characters; 0 = no cap
+    CITATION_MAX_CHARS: int = 4000
+
+    # Language Guard: the document language is decided on LANGUAGE_GUARD_SAMPLES sentences spread over
+    # the text; English is rejected only when it holds at least MIN_CONFIDENCE of the (confidence-weighted) sample
+    LANGUAGE_GUARD_SAMPLES: int = 24
+    LANGUAGE_GUARD_MIN_CONFIDENCE: float = 0.6
+
+    # Result Cache (repeat scans of identical text; stores scores only, never text)
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_MAX_ITEMS: int = 256
+    RESULT_CACHE_DIR: str = ""  # Empty = memory tier only; set a directory to enable the on-disk tier
+    RESULT_CACHE_TTL_SECONDS: int = 86400
+
+    # Sentence Feature Cache (incremental re-scans of edited drafts; hashes + scores only)
+    FEATURE_CACHE_ENABLED: bool = True
+    FEATURE_CACHE_MAX_ITEMS: int = 50000
+
+    # Shared Model Server (one IndoBERT copy for all uvicorn workers)
+    # Empty socket path = load the model in-process (development default)
+    MODEL_SERVER_SOCKET: str = ""
+    MODEL_SERVER_THREADS: int = 4
+    MODEL_SERVER_TIMEOUT: float = 300.0
+
+    # Background Scan Jobs (/analyze-file?async_mode=true, polled via /jobs/{id})
+    # LEASE: a running job without a heartbeat for this long is re-queued (worker crash)
+    JOB_QUEUE_ENABLED: bool = True
+    JOB_WORKERS: int = 1
+    JOB_POLL_INTERVAL: float = 1.0
+    JOB_LEASE_SECONDS: float = 120.0
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_MAX_ACTIVE_PER_USER: int = 3
+    JOB_MAX_RUNNING_PER_USER: int = 1
+    JOB_RETENTION_HOURS: int = 24
+
+    # Bulk Scans (/analyze-batch: a ZIP or several files in one request, Pro/Admin only)
+    # CONCURRENCY: documents analyzed side by side (their sentences share micro-batches)
+    BATCH_MAX_FILES: int = 200
+    BATCH_MAX_UPLOAD_MB: int = 200
+    BATCH_EXTRACT_WORKERS: int = 4
+    BATCH_SCAN_CONCURRENCY: int = 4
+
+    # Document Extraction: uploads over these limits are rejected (413) before any page is extracted;
+    # PDFs with at least PDF_PARALLEL_MIN_PAGES pages are extracted by PDF_EXTRACT_WORKERS processes (0/1 = in-process).
+    # In-process is the default: on a 400-page PDF the 2-worker pool was slower overall and to the first page
+    # (bench_pdf_extraction.py); enable it only where the benchmark shows a gain on the target host.
+    DOC_MAX_UPLOAD_MB: int = 50
+    DOC_MAX_PAGES: int = 1000
+    PDF_EXTRACT_WORKERS: int = 0
+    PDF_PARALLEL_MIN_PAGES: int = 64
+
 settings = Settings()
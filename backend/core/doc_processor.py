@@ -1,28 +1,71 @@
 import fitz  # PyMuPDF
 from docx import Document
 import io
+import logging
+import math
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+
+class DocumentLimitError(ValueError):
+    """Upload over the size or page limit; raised before any page is extracted (HTTP 413)."""
+
+
+def clean_pdf_page(raw: str) -> str:
+    # Smart Cleanup: Replace single newlines with spaces (joining sentences)
+    # but keep double newlines (paragraph boundaries)
+    return raw.replace("\n\n", "[[PARA]]").replace("\n", " ").replace("[[PARA]]", "\n\n")
+
+
+def extract_pdf_page_range(path: str, start: int, end: int) -> list[str]:
+    """Cleaned text of pages [start, end) of the PDF at path; runs in the extraction worker processes."""
+    doc = fitz.open(path, filetype="pdf")
+    try:
+        return [clean_pdf_page(doc[i].get_text()) for i in range(start, min(end, doc.page_count))]
+    finally:
+        doc.close()
+
 
 class DocumentProcessor:
+    """
+    Text extraction for uploads. iter_pages() streams a document page by page (PDF) so analysis can
+    start on the first pages (AIDetector.analyze_pages); size and page limits are checked before any
+    page is extracted, and PDFs with at least parallel_min_pages pages can be extracted by a process pool
+    (workers > 1). The defaults (no limits, in-process extraction) keep the original behaviour.
+    """
+    SUPPORTED_FORMATS = ("pdf", "docx", "txt")
+
+    def __init__(self, max_bytes: int = None, max_pages: int = None, workers: int = 0,
+                 parallel_min_pages: int = 64):
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self.workers = workers
+        self.parallel_min_pages = parallel_min_pages
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
     @staticmethod
-    def extract_text_from_pdf(file_content: bytes) -> str:
-        """Extract text from PDF using PyMuPDF with smart cleanup."""
-        text = ""
+    def extract_pdf_pages(file_content: bytes) -> Iterator[str]:
+        """Cleaned text of each page, one at a time (in-process)."""
+        doc = fitz.open(stream=file_content, filetype="pdf")
         try:
-            doc = fitz.open(stream=file_content, filetype="pdf")
-            pages = []
             for page in doc:
-                # 1. Extract raw text
-                raw = page.get_text()
-                # 2. Smart Cleanup: Replace single newlines with spaces (joining sentences)
-                # but keep double newlines (paragraph boundaries)
-                clean = raw.replace("\n\n", "[[PARA]]").replace("\n", " ").replace("[[PARA]]", "\n\n")
-                pages.append(clean)
+                yield clean_pdf_page(page.get_text())
+        finally:
             doc.close()
-            text = "\n\n".join(pages)
+
+    @staticmethod
+    def extract_text_from_pdf(file_content: bytes) -> str:
+        """Extract text from PDF using PyMuPDF with smart cleanup."""
+        try:
+            return "\n\n".join(DocumentProcessor.extract_pdf_pages(file_content))
         except Exception as e:
             print(f"Error extracting PDF: {e}")
             return ""
-        return text
 
     @staticmethod
     def extract_text_from_docx(file_content: bytes) -> str:
@@ -37,14 +80,104 @@ class DocumentProcessor:
             return ""
         return "\n".join(text)
 
-    def process_file(self, filename: str, content: bytes) -> str:
-        """Route file to appropriate extractor based on extension."""
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn: forking a process that holds model and server threads is not safe
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def check_size(self, content: bytes):
+        if self.max_bytes and len(content) > self.max_bytes:
+            raise DocumentLimitError(f"Ukuran berkas melebihi batas {self.max_bytes // (1024 * 1024)} MB.")
+
+    def iter_pdf_pages(self, file_content: bytes) -> Iterator[str]:
+        """
+        Stream the cleaned text of each page in order. Unreadable PDFs yield nothing (like
+        extract_text_from_pdf returning ""); DocumentLimitError is raised before the first page, and a
+        failure after pages were yielded raises ValueError instead of ending the document early.
+        """
+        self.check_size(file_content)
+        try:
+            doc = fitz.open(stream=file_content, filetype="pdf")
+            page_count = doc.page_count
+        except Exception as e:
+            logging.error(f"Error extracting PDF: {e}")
+            return
+        if self.max_pages and page_count > self.max_pages:
+            doc.close()
+            raise DocumentLimitError(f"Berkas melebihi batas {self.max_pages} halaman ({page_count} halaman).")
+
+        if self.workers > 1 and page_count >= self.parallel_min_pages:
+            doc.close()
+            yield from self._iter_pdf_pages_pooled(file_content, page_count)
+            return
+
+        try:
+            for i in range(page_count):
+                try:
+                    text = clean_pdf_page(doc[i].get_text())
+                except Exception as e:
+                    raise ValueError(f"Gagal mengekstrak teks PDF halaman {i + 1}: {e}") from e
+                yield text
+        finally:
+            doc.close()
+
+    def _iter_pdf_pages_pooled(self, file_content: bytes, page_count: int) -> Iterator[str]:
+        """
+        Process pool extraction: the upload is written to a temporary file once and each worker gets only
+        the path and a page range. A failed worker raises ValueError rather than yielding a shortened document.
+        """
+        fd, path = tempfile.mkstemp(suffix=".pdf")
+        futures = []
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(file_content)
+            # Contiguous page ranges, several per worker so the first pages come back early
+            size = max(8, math.ceil(page_count / (self.workers * 4)))
+            pool = self._get_pool()
+            futures = [pool.submit(extract_pdf_page_range, path, start, start + size)
+                       for start in range(0, page_count, size)]
+            for future in futures:
+                try:
+                    pages = future.result()
+                except Exception as e:
+                    raise ValueError(f"Gagal mengekstrak teks PDF: {e}") from e
+                yield from pages
+        finally:
+            for future in futures:
+                future.cancel()
+            # A range still running after an early exit may fail to reopen the file; its result is discarded
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def check_upload(self, filename: str, content: bytes) -> str:
+        """Format and size checks that need no extraction (ValueError / DocumentLimitError); returns the extension."""
         ext = filename.split(".")[-1].lower()
+        if ext not in self.SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported file format: {ext}")
+        self.check_size(content)
+        return ext
+
+    def iter_pages(self, filename: str, content: bytes) -> Iterator[str]:
+        """Page texts of a PDF as they are extracted; a DOCX or TXT file is a single page."""
+        ext = self.check_upload(filename, content)
         if ext == "pdf":
-            return self.extract_text_from_pdf(content)
-        elif ext == "docx":
-            return self.extract_text_from_docx(content)
-        elif ext == "txt":
-            return content.decode("utf-8", errors="ignore")
+            yield from self.iter_pdf_pages(content)
+            return
+        if ext == "docx":
+            yield self.extract_text_from_docx(content)
         else:
-            raise ValueError(f"Unsupported file format: {ext}")
+            yield content.decode("utf-8", errors="ignore")
+
+    def process_file(self, filename: str, content: bytes) -> str:
+        """Route file to appropriate extractor based on extension."""
+        return "\n\n".join(self.iter_pages(filename, content))
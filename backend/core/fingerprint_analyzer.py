@@ -1,39 +1,72 @@
+import json
+import os
 import re
 from typing import Dict, List, Optional
 
+SIGNATURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "ai_signatures.json")
+
+
+def load_signatures(path: str = SIGNATURES_PATH) -> Dict[str, dict]:
+    """
+    Signature registry: {model: {"keywords": [regex, ...], "threshold": min distinct keyword hits}}.
+    Keywords are matched case-insensitively and must not use their own named groups or backreferences.
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class SignatureMatcher:
+    """
+    All keyword patterns of all models compiled into one case-insensitive scanner.
+    A zero-width lookahead alternation finds every position where some keyword starts in a single
+    pass; only there are the not-yet-seen keywords tried, so overlapping keywords are not missed
+    and adding models does not add full-text passes.
+    """
+
+    def __init__(self, signatures: Dict[str, dict]):
+        self.signatures = signatures
+        self._keywords = []  # (model, compiled pattern)
+        for model, config in signatures.items():
+            for pattern in dict.fromkeys(config["keywords"]):
+                self._keywords.append((model, re.compile(pattern, re.IGNORECASE)))
+        alternation = "|".join(f"(?P<k{i}>{p.pattern})" for i, (_, p) in enumerate(self._keywords))
+        self._scanner = re.compile(f"(?=(?:{alternation}))", re.IGNORECASE) if self._keywords else None
+
+    def hits(self, text: str) -> Dict[str, int]:
+        """Number of distinct keywords of each model found in `text` (models without hits are omitted)."""
+        if self._scanner is None:
+            return {}
+        unseen = dict(enumerate(self._keywords))
+        for match in self._scanner.finditer(text):
+            unseen.pop(int(match.lastgroup[1:]), None)
+            pos = match.start()
+            for i in [i for i, (_, pattern) in unseen.items() if pattern.match(text, pos)]:
+                del unseen[i]
+            if not unseen:
+                break
+
+        counts = {}
+        for i, (model, _) in enumerate(self._keywords):
+            if i not in unseen:
+                counts[model] = counts.get(model, 0) + 1
+        return counts
+
+
 class FingerprintAnalyzer:
     """
     AI Writer Fingerprinting (Stylometry)
     Identifies specific AI models based on lexical bias, structural patterns, and metadata.
     """
-    
-    # Lexical Biases (The 'DNA' of different models)
-    AI_SIGNATURES = {
-        "GPT-4 / GPT-4o": {
-            "keywords": [
-                r"\bdelve\b", r"\bcomprehensive\b", r"\btransformative\b", 
-                r"\bvibrant\b", r"\btapestry\b", r"\bembark\b", 
-                r"\bmeticulous\b", r"\btestament\b", r"\bfoster\b",
-                r"\bcrucial\b", r"\belevate\b", r"\bunwavering\b"
-            ],
-            "threshold": 1
-        },
-        "Claude (Anthropic)": {
-            "keywords": [
-                r"I understand that", r"Actually,", r"It's important to note",
-                r"however,", r"I apologize if", r"Let's look at this",
-                r"from a certain perspective", r"while it is true that"
-            ],
-            "threshold": 2
-        },
-        "Gemini (Google)": {
-            "keywords": [
-                r"\bHere are\b", r"\blet's explore\b", r"\bkey takeaway\b",
-                r"\bin summary\b", r"\bconsider this\b", r"\bdiving deeper\b"
-            ],
-            "threshold": 1
-        }
-    }
+
+    # Lexical Biases (The 'DNA' of different models), see data/ai_signatures.json
+    AI_SIGNATURES = load_signatures()
+    MATCHER = SignatureMatcher(AI_SIGNATURES)
+
+    @classmethod
+    def register(cls, model: str, keywords: List[str], threshold: int = 1):
+        """Add (or replace) a model signature and recompile the scanner."""
+        cls.AI_SIGNATURES = {**cls.AI_SIGNATURES, model: {"keywords": list(keywords), "threshold": threshold}}
+        cls.MATCHER = SignatureMatcher(cls.AI_SIGNATURES)
 
     @staticmethod
     def identify_source(text: str, ai_probability: float) -> Optional[str]:
@@ -42,19 +75,12 @@ class FingerprintAnalyzer:
         """
         if ai_probability < 30.0:
             return None # Not likely AI, don't fingerprint
-            
+
         scores = {}
-        text_lower = text.lower()
-        
-        for model, config in FingerprintAnalyzer.AI_SIGNATURES.items():
-            match_count = 0
-            for pattern in config["keywords"]:
-                if re.search(pattern, text_lower, re.IGNORECASE):
-                    match_count += 1
-            
-            if match_count >= config["threshold"]:
+        for model, match_count in FingerprintAnalyzer.MATCHER.hits(text).items():
+            if match_count >= FingerprintAnalyzer.AI_SIGNATURES[model]["threshold"]:
                 scores[model] = match_count
-        
+
         if not scores:
             # Fallback for general AI
             # Lowered threshold to 50 to match 'Likely AI' status
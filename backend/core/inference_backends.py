@@ -0,0 +1,209 @@
+"""
+Pluggable inference backends for the IndoBERT masked-LM.
+Every backend exposes logits(input_ids, attention_mask) -> torch.Tensor (B x L x V), so the
+scoring kernel in AIDetector is identical whichever runtime produced the logits.
+
+- eager:       PyTorch eager mode (dynamic int8 quantization on CPU) - the original path
+- torchscript: the same quantized model traced and frozen into a TorchScript graph
+- onnx:        exported ONNX graph run by ONNX Runtime, int8-quantized on CPU (optional dependency);
+               the export is cached next to a manifest (model, library versions, sha256) like model_store
+"""
+import datetime
+import json
+import logging
+import os
+import shutil
+import tempfile
+import torch
+import transformers
+from .model_store import sha256_file
+
+
+class _LogitsModule(torch.nn.Module):
+    """Positional-argument wrapper so tracing/export see a plain (ids, mask) -> logits graph."""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+
+def _example_inputs(device):
+    input_ids = torch.full((2, 8), 5, dtype=torch.long, device=device)
+    attention_mask = torch.ones((2, 8), dtype=torch.long, device=device)
+    attention_mask[1, 5:] = 0
+    return input_ids, attention_mask
+
+
+class EagerBackend:
+    name = "eager"
+
+    def __init__(self, base_model, device, quantized: bool = False):
+        self.device = device
+        if quantized:
+            # Already quantized (loaded from the model artifact store)
+            self.model = base_model
+        elif device.type == "cpu":
+            # Dynamic Quantization: Reduces model size and speeds up CPU inference
+            self.model = torch.quantization.quantize_dynamic(
+                base_model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        else:
+            self.model = base_model.to(device)
+        self.model.eval()
+
+    def logits(self, input_ids, attention_mask):
+        with torch.no_grad():
+            return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+
+class TorchScriptBackend(EagerBackend):
+    name = "torchscript"
+
+    def __init__(self, base_model, device, quantized: bool = False):
+        super().__init__(base_model, device, quantized=quantized)
+        with torch.no_grad():
+            traced = torch.jit.trace(_LogitsModule(self.model).eval(), _example_inputs(device), check_trace=False)
+            self.graph = torch.jit.freeze(traced)
+
+    def logits(self, input_ids, attention_mask):
+        with torch.no_grad():
+            return self.graph(input_ids, attention_mask)
+
+
+class OnnxBackend:
+    name = "onnx"
+    EXPORT_FORMAT = 1
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(self, base_model, device, export_dir: str, quantize: bool = True, num_threads: int = None,
+                 model_name: str = None):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise RuntimeError("INFERENCE_BACKEND=onnx requires 'onnxruntime' (pip install onnxruntime onnx).") from e
+
+        # The session runs on the CPU execution provider and returns CPU logits, so inputs must stay on CPU
+        self.device = torch.device("cpu")
+        self.model = None  # The torch weights are released once the graph is exported
+        self.export_dir = export_dir
+        graph_file = "model.int8.onnx" if quantize else "model.onnx"
+        model_path = os.path.join(export_dir, graph_file)
+        fingerprint = self.fingerprint(base_model, model_name, quantize, ort.__version__)
+
+        if not self._is_valid(graph_file, fingerprint):
+            self._build(base_model, graph_file, fingerprint, quantize)
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+        logging.info(f"ONNX Runtime backend loaded from {model_path}")
+
+    @classmethod
+    def fingerprint(cls, base_model, model_name: str, quantize: bool, ort_version: str) -> dict:
+        # An export is only reused for the same model revision, exporter versions and quantization
+        config = getattr(base_model, "config", None)
+        return {
+            "format": cls.EXPORT_FORMAT,
+            "model_name": model_name or getattr(config, "_name_or_path", None),
+            "revision": getattr(config, "_commit_hash", None),
+            "quantize": quantize,
+            "torch": torch.__version__,
+            "transformers": transformers.__version__,
+            "onnxruntime": ort_version,
+        }
+
+    def _is_valid(self, graph_file: str, fingerprint: dict) -> bool:
+        manifest_path = os.path.join(self.export_dir, self.MANIFEST_FILE)
+        graph_path = os.path.join(self.export_dir, graph_file)
+        if not os.path.exists(manifest_path) or not os.path.exists(graph_path):
+            return False
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Unreadable ONNX export manifest at {self.export_dir}: {e}; re-exporting.")
+            return False
+        if {k: manifest.get(k) for k in fingerprint} != fingerprint:
+            logging.info(f"ONNX export at {self.export_dir} was built for another model or versions; re-exporting.")
+            return False
+        if sha256_file(graph_path) != manifest.get("sha256"):
+            logging.warning(f"ONNX export checksum mismatch at {self.export_dir}; re-exporting.")
+            return False
+        return True
+
+    def _build(self, base_model, graph_file: str, fingerprint: dict, quantize: bool):
+        """Export (and quantize) into a temp dir, then swap it in so concurrent workers never see half a graph."""
+        parent = os.path.dirname(os.path.abspath(self.export_dir))
+        os.makedirs(parent, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=".building-", dir=parent)
+        try:
+            fp32_path = os.path.join(tmp_dir, "model.onnx")
+            self._export(base_model, fp32_path)
+            if quantize:
+                try:
+                    from onnxruntime.quantization import quantize_dynamic, QuantType
+                except ImportError as e:
+                    raise RuntimeError("INFERENCE_BACKEND=onnx quantization requires 'onnx' (pip install onnx).") from e
+                quantize_dynamic(fp32_path, os.path.join(tmp_dir, graph_file), weight_type=QuantType.QInt8)
+
+            manifest = {
+                **fingerprint,
+                "sha256": sha256_file(os.path.join(tmp_dir, graph_file)),
+                "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            }
+            with open(os.path.join(tmp_dir, self.MANIFEST_FILE), "w") as f:
+                json.dump(manifest, f, indent=2)
+
+            if os.path.exists(self.export_dir):
+                shutil.rmtree(self.export_dir, ignore_errors=True)
+            os.replace(tmp_dir, self.export_dir)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+    @staticmethod
+    def _export(base_model, path: str):
+        module = _LogitsModule(base_model.cpu().eval())
+        kwargs = dict(
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={name: {0: "batch", 1: "sequence"} for name in ("input_ids", "attention_mask", "logits")},
+            opset_version=17,
+        )
+        with torch.no_grad():
+            try:
+                torch.onnx.export(module, _example_inputs(torch.device("cpu")), path, dynamo=False, **kwargs)
+            except TypeError:
+                # Older torch without the dynamo switch
+                torch.onnx.export(module, _example_inputs(torch.device("cpu")), path, **kwargs)
+
+    def logits(self, input_ids, attention_mask):
+        outputs = self.session.run(["logits"], {
+            "input_ids": input_ids.cpu().numpy(),
+            "attention_mask": attention_mask.cpu().numpy(),
+        })
+        return torch.from_numpy(outputs[0])
+
+
+BACKENDS = {backend.name: backend for backend in (EagerBackend, TorchScriptBackend, OnnxBackend)}
+
+
+def create_backend(name: str, base_model, device, export_dir: str = None, num_threads: int = None, quantized: bool = False,
+                   model_name: str = None):
+    """
+    Build the named inference backend (see BACKENDS).
+    quantized=True means base_model is already the dynamic-int8 module (eager/torchscript only).
+    backend.device is where model inputs must live (always CPU for onnx, whatever `device` was).
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{name}'. Choose one of: {', '.join(BACKENDS)}")
+    if name == "onnx":
+        if device.type != "cpu":
+            logging.warning("ONNX backend runs on CPU only; ignoring accelerator device.")
+        return OnnxBackend(base_model, device, export_dir or "model_cache/onnx", num_threads=num_threads,
+                           model_name=model_name)
+    return BACKENDS[name](base_model, device, quantized=quantized)
@@ -0,0 +1,142 @@
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .page_stream import analyze_page_stream
+
+
+class InferenceBusyError(Exception):
+    """Raised when the inference queue is full and the request must be shed (HTTP 503)."""
+
+
+class InferenceExecutor:
+    """
+    Bounded worker pool for model inference.
+    Runs blocking PyTorch work (AIDetector.analyze) outside the asyncio event loop,
+    so cheap endpoints (/health, /login, /verify) stay responsive during long scans.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 8):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self._pending = 0  # Running + waiting jobs
+        self._running = 0
+        self._rejected = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+
+    def _wrap(self, fn, *args, **kwargs):
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Schedule fn on the pool and return a concurrent Future.
+        Raises InferenceBusyError immediately if the queue depth cap is reached.
+        """
+        with self._lock:
+            if self._pending >= self.capacity:
+                self._rejected += 1
+                raise InferenceBusyError(f"Inference queue full ({self._pending}/{self.capacity})")
+            self._pending += 1
+
+        try:
+            future = self._pool.submit(functools.partial(self._wrap, fn, *args, **kwargs))
+        except Exception:
+            self._release(None)
+            raise
+        # Slot is freed when the job actually finishes (or is cancelled before starting),
+        # not when the awaiting request goes away.
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs) on the inference pool without blocking the event loop."""
+        future = self.submit(fn, *args, **kwargs)
+        return await asyncio.wrap_future(future)
+
+    async def run_when_free(self, fn, *args, poll_interval: float = 0.05, max_interval: float = 1.0, **kwargs):
+        """Like run(), but waits for a queue slot (polling with backoff) instead of raising InferenceBusyError."""
+        delay = poll_interval
+        while True:
+            try:
+                future = self.submit(fn, *args, **kwargs)
+                break
+            except InferenceBusyError:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, max_interval)
+        return await asyncio.wrap_future(future)
+
+    def call(self, fn, *args, wait_for_slot: bool = False, poll_interval: float = 0.05, max_interval: float = 1.0,
+             **kwargs):
+        """
+        Blocking counterpart of run() for plain threads (upload extraction, job workers); never call it from
+        an inference thread. wait_for_slot polls for a queue slot (with backoff) instead of raising InferenceBusyError.
+        """
+        delay = poll_interval
+        while True:
+            try:
+                future = self.submit(fn, *args, **kwargs)
+                break
+            except InferenceBusyError:
+                if not wait_for_slot:
+                    raise
+                time.sleep(delay)
+                delay = min(delay * 2, max_interval)
+        return future.result()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": max(0, self._pending - self._running),
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self, wait: bool = True):
+        logging.info("Shutting down inference executor...")
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+class BoundedDetector:
+    """
+    Detector view for code running on plain threads (the page loop of an upload, job workers): extraction and
+    guards stay on the calling thread, while every model call runs on the inference executor and counts against
+    its bound. A prescoring call that finds the pool full is skipped; analyze() scores those sentences later.
+    """
+
+    def __init__(self, detector, executor: InferenceExecutor, wait_for_slot: bool = False):
+        self.detector = detector
+        self.executor = executor
+        self.wait_for_slot = wait_for_slot
+
+    def prescore_page(self, page: str, force_full_scan: bool = False, used_tokens: int = 0) -> tuple:
+        try:
+            return self.executor.call(self.detector.prescore_page, page, force_full_scan=force_full_scan,
+                                      used_tokens=used_tokens)
+        except InferenceBusyError:
+            return {}, used_tokens, True
+
+    def analyze(self, text: str, **kwargs):
+        return self.executor.call(self.detector.analyze, text, wait_for_slot=self.wait_for_slot, **kwargs)
+
+    def analyze_pages(self, pages, **kwargs):
+        return analyze_page_stream(self, pages, **kwargs)
@@ -0,0 +1,249 @@
+"""
+Persistent Scan Job Queue
+Long uploads run as background jobs stored in the application database (scan_jobs table),
+so a proxy timeout or a worker restart no longer loses the work.
+
+- Claiming is a conditional UPDATE (status queued -> running, and the user under max_running_per_user),
+  safe across uvicorn workers.
+- A running job's heartbeat is refreshed while it is processed; jobs whose heartbeat went stale
+  (crashed/killed worker) are re-queued until max_attempts, then marked failed. A handler that raises
+  JobDeferred (e.g. the model is still loading) re-queues the job without using up an attempt.
+- Per-user limits: active (queued + running) jobs at enqueue time, running jobs at claim time.
+- Zero-Retention: the uploaded payload is wiped when the job finishes; finished jobs expire after retention_hours.
+"""
+import datetime
+import logging
+import threading
+import uuid
+from sqlalchemy import func
+from sqlalchemy.orm import aliased
+import models
+
+
+class JobLimitError(Exception):
+    """Raised when a user already has the maximum number of active jobs (HTTP 429)."""
+
+
+class JobFailed(Exception):
+    """Raised by a job handler for a permanent failure; status_code mirrors the synchronous endpoint's error."""
+
+    def __init__(self, detail: str, status_code: int = 400):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+class JobDeferred(Exception):
+    """Raised by a job handler when it cannot run yet for reasons unrelated to the job (model still loading)."""
+
+
+class ScanJobQueue:
+    def __init__(self, session_factory, handler, workers: int = 1, poll_interval: float = 1.0,
+                 lease_seconds: float = 120.0, max_attempts: int = 3, max_active_per_user: int = 3,
+                 max_running_per_user: int = 1, retention_hours: int = 24):
+        self.session_factory = session_factory
+        self.handler = handler  # handler(db, job) -> ScanResult id
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.max_active_per_user = max_active_per_user
+        self.max_running_per_user = max_running_per_user
+        self.retention_hours = retention_hours
+        self.worker_id = uuid.uuid4().hex[:12]
+        self._stop = threading.Event()
+        self._threads = []
+        self._last_maintenance = None
+
+    @staticmethod
+    def _now():
+        return datetime.datetime.utcnow()
+
+    def enqueue(self, db, user_id: int, filename: str, payload: bytes, force_full_scan: bool = False) -> models.ScanJob:
+        active = db.query(func.count(models.ScanJob.id)).filter(
+            models.ScanJob.user_id == user_id,
+            models.ScanJob.status.in_(["queued", "running"])
+        ).scalar()
+        if active >= self.max_active_per_user:
+            raise JobLimitError(f"User {user_id} already has {active} active jobs")
+
+        job = models.ScanJob(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            status="queued",
+            filename=filename,
+            payload=payload,
+            force_full_scan=int(force_full_scan),
+            created_at=self._now()
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    def claim(self, db):
+        """Atomically move the oldest eligible queued job to running; returns its id or None."""
+        running = aliased(models.ScanJob)
+        running_for_user = db.query(func.count(running.id)).filter(
+            running.user_id == models.ScanJob.user_id,
+            running.status == "running"
+        ).correlate(models.ScanJob).scalar_subquery()
+
+        busy_users = db.query(models.ScanJob.user_id).filter(
+            models.ScanJob.status == "running"
+        ).group_by(models.ScanJob.user_id).having(func.count(models.ScanJob.id) >= self.max_running_per_user)
+
+        candidates = db.query(models.ScanJob.id).filter(
+            models.ScanJob.status == "queued",
+            ~models.ScanJob.user_id.in_(busy_users)
+        ).order_by(models.ScanJob.created_at).limit(5).all()
+
+        for (job_id,) in candidates:
+            now = self._now()
+            # The per-user running limit is re-checked inside the UPDATE: another worker process may have
+            # started one of the user's jobs since the candidates were read
+            claimed = db.query(models.ScanJob).filter(
+                models.ScanJob.id == job_id,
+                models.ScanJob.status == "queued",
+                running_for_user < self.max_running_per_user
+            ).update({
+                "status": "running",
+                "worker_id": self.worker_id,
+                "heartbeat_at": now,
+                "started_at": now,
+                "attempts": models.ScanJob.attempts + 1,
+            }, synchronize_session=False)
+            db.commit()
+            if claimed:
+                return job_id
+        return None
+
+    def requeue_stale(self, db) -> int:
+        """Recover jobs whose worker stopped heartbeating (crash, OOM kill, restart)."""
+        cutoff = self._now() - datetime.timedelta(seconds=self.lease_seconds)
+        stale = (models.ScanJob.status == "running", models.ScanJob.heartbeat_at < cutoff)
+        failed = db.query(models.ScanJob).filter(*stale, models.ScanJob.attempts >= self.max_attempts).update({
+            "status": "failed",
+            "payload": None,
+            "error": "Pemindaian gagal setelah beberapa kali percobaan.",
+            "error_status": 500,
+            "finished_at": self._now(),
+        }, synchronize_session=False)
+        requeued = db.query(models.ScanJob).filter(*stale).update(
+            {"status": "queued", "worker_id": None}, synchronize_session=False
+        )
+        db.commit()
+        if requeued or failed:
+            logging.warning(f"Job queue: re-queued {requeued} stale jobs, failed {failed} after {self.max_attempts} attempts")
+        return requeued
+
+    def purge_finished(self, db) -> int:
+        cutoff = self._now() - datetime.timedelta(hours=self.retention_hours)
+        deleted = db.query(models.ScanJob).filter(
+            models.ScanJob.status.in_(["done", "failed"]),
+            models.ScanJob.finished_at < cutoff
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    def _maintenance(self, db):
+        now = self._now()
+        if self._last_maintenance and (now - self._last_maintenance).total_seconds() < self.lease_seconds / 4:
+            return
+        self._last_maintenance = now
+        self.requeue_stale(db)
+        self.purge_finished(db)
+
+    def _heartbeat(self, job_id: str, done: threading.Event):
+        while not done.wait(self.lease_seconds / 4):
+            db = self.session_factory()
+            try:
+                db.query(models.ScanJob).filter(
+                    models.ScanJob.id == job_id, models.ScanJob.worker_id == self.worker_id
+                ).update({"heartbeat_at": self._now()}, synchronize_session=False)
+                db.commit()
+            except Exception as e:
+                logging.warning(f"Job heartbeat failed for {job_id}: {e}")
+            finally:
+                db.close()
+
+    def _finish(self, db, job, status: str, **fields):
+        job.status = status
+        job.payload = None
+        job.finished_at = self._now()
+        for key, value in fields.items():
+            setattr(job, key, value)
+        db.commit()
+
+    def process(self, job_id: str):
+        db = self.session_factory()
+        done = threading.Event()
+        threading.Thread(target=self._heartbeat, args=(job_id, done), daemon=True).start()
+        try:
+            job = db.get(models.ScanJob, job_id)
+            try:
+                scan_id = self.handler(db, job)
+            except JobFailed as e:
+                db.rollback()
+                self._finish(db, db.get(models.ScanJob, job_id), "failed", error=e.detail, error_status=e.status_code)
+            except JobDeferred as e:
+                logging.info(f"Scan job {job_id} deferred: {e}")
+                db.rollback()
+                job = db.get(models.ScanJob, job_id)
+                job.status = "queued"
+                job.worker_id = None
+                job.attempts -= 1  # The claim counted this attempt; nothing ran
+                db.commit()
+            except Exception as e:
+                logging.error(f"Scan job {job_id} failed (attempt {job.attempts}): {e}")
+                db.rollback()
+                job = db.get(models.ScanJob, job_id)
+                if job.attempts >= self.max_attempts:
+                    self._finish(db, job, "failed", error="Pemindaian gagal setelah beberapa kali percobaan.", error_status=500)
+                else:
+                    job.status = "queued"
+                    job.worker_id = None
+                    db.commit()
+            else:
+                self._finish(db, job, "done", scan_id=scan_id, error=None, error_status=None)
+        finally:
+            done.set()
+            db.close()
+
+    def run_once(self) -> bool:
+        """Claim and process at most one job; returns False when there was nothing to do."""
+        db = self.session_factory()
+        try:
+            self._maintenance(db)
+            job_id = self.claim(db)
+        finally:
+            db.close()
+        if job_id is None:
+            return False
+        self.process(job_id)
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                worked = self.run_once()
+            except Exception as e:
+                logging.error(f"Job queue worker error: {e}")
+                worked = False
+            if not worked:
+                self._stop.wait(self.poll_interval)
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"scan-job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
@@ -0,0 +1,232 @@
+"""
+Batched, cached language identification for the language guard and the per-sentence English filter.
+
+- Stopword short-circuit: a sentence with enough Indonesian (or English) function words and none
+  of the other language is decided without touching the n-gram model.
+- Character n-gram model: naive Bayes over the 1-3 gram frequency profiles shipped with langdetect,
+  scored deterministically (no random sampling, no per-call profile setup). All undecided texts
+  of a batch are scored in one numpy gather + segmented sum.
+- Results are cached per text under a digest (Zero-Retention: no text is kept in memory).
+- Document guard: only a bounded sample of sentences spread over the document is classified; their
+  labels are handed to AIDetector.analyze as hints so those sentences are not classified twice.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .result_cache import LRUCache
+from .segmenter import segment_sentences
+
+# Latin-script profiles: enough neighbours that English is only chosen when it really is the best fit
+DEFAULT_LANGUAGES = (
+    "id", "en", "tl", "sw", "so", "af", "nl", "de", "da", "no", "sv", "fr", "es", "pt", "it", "ca",
+    "ro", "pl", "cs", "sk", "sl", "hr", "hu", "fi", "et", "lv", "lt", "tr", "sq", "vi", "cy",
+)
+
+INDONESIAN_STOPWORDS = frozenset("""
+    yang dan di ke dari ini itu dengan untuk dalam pada adalah tidak akan oleh atau juga sebagai karena
+    bahwa dapat ada lebih telah sudah para serta tersebut secara antara namun bagi agar yaitu sehingga
+    jika kami kita mereka saya tetapi belum hanya masih setelah bisa harus sangat maka merupakan terhadap
+""".split())
+
+ENGLISH_STOPWORDS = frozenset("""
+    the and of to is in that for with are was were this be by on as it an from at or which have has not
+    but their these can will been its they we than also such more into between would should there our
+    how what when while
+""".split())
+
+_WORD = re.compile(r"[^\W\d_]+")
+_ALPHA = 0.5 / 10000  # langdetect's smoothing (ALPHA_DEFAULT / BASE_FREQ)
+STOPWORD_CONFIDENCE = 0.95
+
+
+def langdetect_profiles_dir() -> Optional[str]:
+    try:
+        import langdetect
+    except ImportError:
+        return None
+    return os.path.join(os.path.dirname(os.path.abspath(langdetect.__file__)), "profiles")
+
+
+class LanguageIdentifier:
+    def __init__(self, languages: Sequence[str] = DEFAULT_LANGUAGES, profiles_dir: str = None,
+                 cache_items: int = 20000, min_stopwords: int = 2):
+        self.languages = tuple(languages)
+        self.profiles_dir = profiles_dir or langdetect_profiles_dir()
+        self.min_stopwords = min_stopwords
+        self.cache = LRUCache(cache_items)
+        self._index = None  # n-gram -> row of self._log_probs
+        self._log_probs = None  # [n-grams x languages] log(alpha + P(gram | language))
+        self._load_lock = threading.Lock()
+        self._word_rows = lru_cache(maxsize=65536)(self._rows_of_word)
+
+    def _load(self):
+        if self._index is not None:
+            return
+        with self._load_lock:
+            if self._index is not None:
+                return
+            profiles = []
+            for lang in self.languages:
+                with open(os.path.join(self.profiles_dir, lang), encoding="utf-8") as f:
+                    profiles.append(json.load(f))
+            index = {}
+            for profile in profiles:
+                for gram in profile["freq"]:
+                    index.setdefault(gram, len(index))
+            probs = np.zeros((len(index), len(profiles)), dtype=np.float64)
+            for col, profile in enumerate(profiles):
+                n_words = profile["n_words"]
+                for gram, count in profile["freq"].items():
+                    probs[index[gram], col] = count / n_words[len(gram) - 1]
+            self._log_probs = np.log(probs + _ALPHA).astype(np.float32)
+            self._index = index
+
+    def _rows_of_word(self, word: str) -> Tuple[int, ...]:
+        """Profile rows of the 1-3 grams of ` word ` (case kept, like the profiles; acronyms are skipped)."""
+        if len(word) > 1 and word.isupper():
+            return ()
+        padded = f" {word} "
+        index = self._index
+        rows = []
+        for n in (1, 2, 3):
+            for i in range(len(padded) - n + 1):
+                gram = padded[i:i + n]
+                if gram == " ":
+                    continue
+                row = index.get(gram)
+                if row is not None:
+                    rows.append(row)
+        return tuple(rows)
+
+    def _stopword_verdict(self, words: List[str]) -> Optional[Tuple[str, float]]:
+        id_hits = en_hits = 0
+        for word in words:
+            word = word.lower()
+            if word in INDONESIAN_STOPWORDS:
+                id_hits += 1
+            elif word in ENGLISH_STOPWORDS:
+                en_hits += 1
+        if id_hits >= self.min_stopwords and en_hits == 0:
+            return "id", STOPWORD_CONFIDENCE
+        if en_hits >= self.min_stopwords and id_hits == 0:
+            return "en", STOPWORD_CONFIDENCE
+        return None
+
+    def _score(self, word_lists: List[List[str]]) -> List[Tuple[Optional[str], float]]:
+        """Naive Bayes over all n-grams of each text; one gather + segmented sum for the whole batch."""
+        results = [(None, 0.0)] * len(word_lists)
+        if not word_lists:
+            return results
+        self._load()
+        rows, offsets, scored = [], [], []
+        for i, words in enumerate(word_lists):
+            text_rows = [row for word in words for row in self._word_rows(word)]
+            if text_rows:
+                offsets.append(len(rows))
+                rows.extend(text_rows)
+                scored.append(i)
+        if not scored:
+            return results
+
+        log_scores = np.add.reduceat(self._log_probs[np.asarray(rows)], np.asarray(offsets), axis=0)
+        log_scores -= log_scores.max(axis=1, keepdims=True)
+        probs = np.exp(log_scores)
+        probs /= probs.sum(axis=1, keepdims=True)
+        best = probs.argmax(axis=1)
+        for k, i in enumerate(scored):
+            results[i] = (self.languages[best[k]], round(float(probs[k, best[k]]), 4))
+        return results
+
+    @staticmethod
+    def key(text: str) -> str:
+        normalized = " ".join(text.split())
+        return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+    def classify_many(self, texts: Sequence[str], hints: Dict[str, Sequence] = None) -> List[Tuple[Optional[str], float]]:
+        """
+        (language code or None when undecidable, confidence) for every text, in order.
+        hints: {key(text): (language, confidence)} already known for this request (see assess_document).
+        """
+        results = [None] * len(texts)
+        pending, pending_words = {}, []
+        for i, text in enumerate(texts):
+            key = self.key(text)
+            if hints and key in hints:
+                results[i] = tuple(hints[key])
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[i] = cached
+                continue
+            if key in pending:  # repeated text in the same batch
+                pending[key].append(i)
+                continue
+            words = _WORD.findall(text)
+            verdict = self._stopword_verdict(words)
+            if verdict is not None:
+                results[i] = verdict
+                self.cache.put(key, verdict)
+                continue
+            pending[key] = [i]
+            pending_words.append(words)
+
+        for (key, positions), verdict in zip(pending.items(), self._score(pending_words)):
+            self.cache.put(key, verdict)
+            for i in positions:
+                results[i] = verdict
+        return results
+
+    def detect_many(self, texts: Sequence[str], hints: Dict[str, Sequence] = None) -> List[Optional[str]]:
+        return [lang for lang, _ in self.classify_many(texts, hints)]
+
+    def detect(self, text: str) -> Optional[str]:
+        return self.classify_many([text])[0][0]
+
+    @staticmethod
+    def sample_sentences(text: str, count: int, max_chars: int = 1000) -> List[str]:
+        """
+        Up to `count` sentences (of more than 3 words) spread evenly over `text`, cut by the same segmenter
+        as AIDetector.analyze so hint keys match. Only a 2 * max_chars window after each anchor offset is
+        segmented, so the cost does not grow with the document length.
+        """
+        samples = []
+        for k in range(count):
+            anchor = len(text) * k // count
+            window_end = min(len(text), anchor + 2 * max_chars)
+            spans = segment_sentences(text[anchor:window_end])
+            if anchor:
+                spans = spans[1:]  # may start mid-sentence
+            if window_end < len(text):
+                spans = spans[:-1]  # may be cut off by the window
+            if spans and len(spans[0].text.split()) > 3:
+                samples.append(spans[0].text)
+        return samples
+
+    def assess_document(self, text: str, samples: int = 24, min_confidence: float = 0.6) -> dict:
+        """
+        Document language from a sample of its sentences: confidence-weighted votes over the sample.
+        "language" is None unless the winner reaches min_confidence (share of the sample it holds).
+        "hints" are the sampled sentences' labels for AIDetector.analyze(language_hints=...).
+        """
+        sentences = self.sample_sentences(text, samples)
+        if not sentences:  # short or unpunctuated text: classify it whole
+            sentences = [text]
+        verdicts = self.classify_many(sentences)
+        votes = {}
+        for lang, confidence in verdicts:
+            if lang is not None:
+                votes[lang] = votes.get(lang, 0.0) + confidence
+        language = max(votes, key=votes.get) if votes else None
+        confidence = round(votes[language] / len(sentences), 4) if language else 0.0
+        return {
+            "language": language if confidence >= min_confidence else None,
+            "confidence": confidence,
+            "hints": {self.key(s): verdict for s, verdict in zip(sentences, verdicts) if len(s.split()) > 3},
+        }
@@ -0,0 +1,62 @@
+"""
+Precompiled lexicon scanner for word/phrase marker lists (naturalness markers, AI hallmarks, ...).
+All terms of all groups are compiled into one word-bounded alternation, and the text is lowercased
+once, so a scan is a single pass over the text instead of one re.search per marker.
+
+Results match searching every term on its own (re.search(r'\b' + term + r'\b', text.lower())):
+a term whose occurrences could be swallowed by an overlapping, longer match (e.g. "di sisi" inside
+"di sisi lain") is additionally checked with its own precompiled pattern.
+"""
+import re
+
+
+class Lexicon:
+    def __init__(self, groups: dict[str, list[str]]):
+        """groups: {group name: [lowercase terms]}; a term may belong to several groups."""
+        self.groups = {name: list(dict.fromkeys(terms)) for name, terms in groups.items()}
+        self._term_groups = {}
+        for name, terms in self.groups.items():
+            for term in terms:
+                self._term_groups.setdefault(term, []).append(name)
+
+        terms = sorted(self._term_groups, key=len, reverse=True)  # Longest first: prefer "di sisi lain" over "di sisi"
+        self._pattern = re.compile(r"\b(?:" + "|".join(re.escape(t) for t in terms) + r")\b") if terms else None
+        self._shadowed = {
+            term: re.compile(r"\b" + re.escape(term) + r"\b")
+            for term in terms if self._may_overlap(term, terms)
+        }
+
+    @staticmethod
+    def _may_overlap(term: str, terms: list[str]) -> bool:
+        """True if a match of another term can cover the start of a `term` occurrence (so findall would skip it)."""
+        inner = re.compile(r"\b" + re.escape(term) + r"\b")
+        for other in terms:
+            if other == term:
+                continue
+            if inner.search(other):
+                return True
+            # A word-aligned suffix of `other` is a prefix of `term`, e.g. "oleh karena" / "karena itu"
+            for k in range(1, min(len(term), len(other))):
+                if not re.match(r"\w", other[-k - 1]) and other.endswith(term[:k]):
+                    return True
+        return False
+
+    def scan(self, text: str) -> dict[str, set[str]]:
+        """Distinct terms found in `text`, per group (case-insensitive, whole words only)."""
+        found = {name: set() for name in self.groups}
+        if self._pattern is None:
+            return found
+
+        lowered = text.lower()
+        hits = set(self._pattern.findall(lowered))
+        for term, pattern in self._shadowed.items():
+            if term not in hits and pattern.search(lowered):
+                hits.add(term)
+        for term in hits:
+            for name in self._term_groups[term]:
+                found[name].add(term)
+        return found
+
+    def count(self, text: str) -> dict[str, int]:
+        """Number of distinct terms found per group."""
+        return {name: len(terms) for name, terms in self.scan(text).items()}
@@ -0,0 +1,112 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """
+    Cross-request dynamic micro-batching.
+    Sentences submitted by many concurrent analyze() calls are coalesced into shared
+    model batches (up to max_batch_size items, waiting at most max_wait_ms for a batch
+    to fill), then each result is fanned back to its caller.
+    A single scheduler thread owns the model, so concurrent scans never run competing forward passes.
+    """
+
+    _STOP = object()
+
+    def __init__(self, score_fn, max_batch_size: int = 24, max_wait_ms: float = 10.0):
+        self.score_fn = score_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._batches = 0
+        self._items = 0
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+                self._thread.start()
+
+    def submit(self, texts: list[str]) -> list[Future]:
+        """Enqueue texts and return one Future per text (resolving to the score_fn item result)."""
+        self._ensure_started()
+        futures = []
+        for text in texts:
+            future = Future()
+            self._queue.put((text, future))
+            futures.append(future)
+        return futures
+
+    def score(self, texts: list[str]) -> list[dict]:
+        """Blocking helper: submit texts and wait for all results, in input order."""
+        if not texts:
+            return []
+        return [f.result() for f in self.submit(texts)]
+
+    def _collect(self, first) -> list:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            # Drain what is already waiting without sleeping
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if item is self._STOP:
+                self._queue.put(item)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is self._STOP:
+                return
+
+            batch = self._collect(first)
+            # Skip work for callers that gave up (cancelled futures)
+            batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            try:
+                results = self.score_fn([text for text, _ in batch])
+            except Exception as e:
+                logging.error(f"Micro-batch scoring failed: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+            with self._lock:
+                self._batches += 1
+                self._items += len(batch)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "batches": self._batches,
+                "items": self._items,
+                "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+                "queued": self._queue.qsize(),
+            }
+
+    def stop(self, timeout: float = 5.0):
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(self._STOP)
+            thread.join(timeout)
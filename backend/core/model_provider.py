@@ -0,0 +1,80 @@
+import logging
+import threading
+import time
+
+
+class ModelNotReadyError(Exception):
+    """Raised when the detector is still loading (or failed to load) and the request cannot wait longer."""
+
+
+class DetectorProvider:
+    """
+    Lazily builds the detector on a background thread so the API can start (and answer /health)
+    before IndoBERT is in RAM. A failed load is logged and retried on the next request
+    instead of killing the worker.
+    """
+
+    def __init__(self, factory, warmup: bool = True):
+        self.factory = factory
+        self.warmup_enabled = warmup
+        self._detector = None
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._thread = None
+        self.error = None
+        self.load_seconds = None
+        self.warmed_up = False
+
+    @property
+    def detector(self):
+        """The loaded detector, or None while loading."""
+        return self._detector
+
+    def start(self):
+        """Begin loading in the background (idempotent; restarts after a failed attempt)."""
+        with self._lock:
+            if self._loaded.is_set() or (self._thread is not None and self._thread.is_alive()):
+                return
+            self.error = None
+            self._thread = threading.Thread(target=self._load, name="model-loader", daemon=True)
+            self._thread.start()
+
+    def _load(self):
+        started = time.perf_counter()
+        try:
+            detector = self.factory()
+        except Exception as e:
+            logging.error(f"Model load failed: {e}")
+            self.error = f"{type(e).__name__}: {e}"
+            return
+        self.load_seconds = round(time.perf_counter() - started, 2)
+        logging.info(f"Detector loaded in {self.load_seconds}s")
+
+        warmup = getattr(detector, "warmup", None)
+        if self.warmup_enabled and warmup is not None:
+            try:
+                warmup()
+                self.warmed_up = True
+            except Exception as e:
+                # A cold first request is slower, not broken; keep serving
+                logging.warning(f"Model warm-up failed: {e}")
+
+        self._detector = detector
+        self._loaded.set()
+
+    def get(self, timeout: float = 30.0):
+        """Return the detector, starting the load if needed and waiting at most `timeout` seconds."""
+        if self._loaded.is_set():
+            return self._detector
+        self.start()
+        if not self._loaded.wait(timeout):
+            raise ModelNotReadyError(self.error or "Model is still loading")
+        return self._detector
+
+    def status(self) -> dict:
+        return {
+            "model_loaded": self._loaded.is_set(),
+            "warmed_up": self.warmed_up,
+            "load_seconds": self.load_seconds,
+            "error": self.error,
+        }
@@ -0,0 +1,232 @@
+"""
+Shared Model Server
+Loads IndoBERT once, owns the torch thread budget and serves every uvicorn worker
+over a local Unix socket. API workers talk to it through RemoteDetector, which exposes
+the same analyze() interface as AIDetector.
+
+Run: python -m core.model_server   (from the backend/ directory)
+"""
+import logging
+import os
+import queue
+import threading
+from multiprocessing.connection import Listener, Client, AuthenticationError
+
+from .page_stream import analyze_page_stream
+
+
+class ModelServerError(Exception):
+    """Raised by RemoteDetector when the model server is unreachable or the remote call failed."""
+
+
+class ModelServer:
+    # Only these detector entry points are callable over the socket
+    METHODS = ("analyze", "prescore_page", "ping")
+
+    def __init__(self, detector, address: str, authkey: bytes):
+        self.detector = detector
+        self.address = address
+        self.authkey = authkey
+        self._listener = None
+        self._closed = threading.Event()
+        self.warmed_up = False
+
+    def ping(self) -> dict:
+        cache_stats = getattr(self.detector, "cache_stats", None)
+        return {
+            "status": "ready",
+            "pid": os.getpid(),
+            "warmed_up": self.warmed_up,
+            "caches": cache_stats() if cache_stats is not None else None,
+        }
+
+    def _dispatch(self, method: str, args: tuple, kwargs: dict, conn=None):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown method: {method}")
+        if method == "ping":
+            return self.ping()
+        if kwargs.pop("stream_progress", False) and conn is not None:
+            # Streaming scans: forward each progress event before the final reply
+            kwargs["on_progress"] = lambda event: conn.send(("progress", event))
+        return getattr(self.detector, method)(*args, **kwargs)
+
+    def _handle(self, conn):
+        with conn:
+            while not self._closed.is_set():
+                try:
+                    method, args, kwargs = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    reply = ("ok", self._dispatch(method, args, kwargs, conn))
+                except Exception as e:
+                    logging.error(f"Model server call '{method}' failed: {e}")
+                    reply = ("error", f"{type(e).__name__}: {e}")
+                try:
+                    conn.send(reply)
+                except (EOFError, OSError):
+                    return
+
+    def serve_forever(self):
+        if os.path.exists(self.address):
+            os.unlink(self.address)  # Stale socket from a previous run
+
+        self._listener = Listener(self.address, family="AF_UNIX", authkey=self.authkey)
+        os.chmod(self.address, 0o660)
+        logging.info(f"Model server listening on {self.address} (pid {os.getpid()})")
+
+        try:
+            while not self._closed.is_set():
+                try:
+                    conn = self._listener.accept()
+                except AuthenticationError:
+                    logging.warning("Model server rejected a client with an invalid authkey.")
+                    continue
+                except OSError:
+                    if self._closed.is_set():
+                        break
+                    raise
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+        finally:
+            self._listener.close()
+
+    def shutdown(self):
+        self._closed.set()
+        if self._listener is not None:
+            self._listener.close()
+
+
+class RemoteDetector:
+    """
+    Drop-in client for AIDetector.analyze() backed by the shared model server.
+    Keeps a small pool of socket connections so each inference executor thread has its own.
+    """
+
+    def __init__(self, address: str, authkey: bytes, timeout: float = 300.0):
+        self.address = address
+        self.authkey = authkey
+        self.timeout = timeout
+        self.batcher = None  # Batching happens inside the server process
+        self._idle = queue.LifoQueue()
+
+    def _connect(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return Client(self.address, family="AF_UNIX", authkey=self.authkey)
+
+    def _call(self, method: str, *args, on_progress=None, **kwargs):
+        if on_progress is not None:
+            kwargs["stream_progress"] = True
+        for attempt in range(2):
+            try:
+                conn = self._connect()
+            except OSError as e:
+                raise ModelServerError(f"Model server unreachable at {self.address}: {e}") from e
+
+            progressed = False
+            try:
+                conn.send((method, args, kwargs))
+                while True:
+                    if not conn.poll(self.timeout):
+                        conn.close()
+                        raise ModelServerError(f"Model server did not answer '{method}' within {self.timeout}s")
+                    status, payload = conn.recv()
+                    if status != "progress":
+                        break
+                    progressed = True
+                    on_progress(payload)
+            except (EOFError, OSError) as e:
+                conn.close()
+                # A pooled connection may be stale after a server restart: retry once on a fresh one
+                # (not once progress was delivered, or the client would see the scan twice)
+                if attempt == 0 and not progressed:
+                    continue
+                raise ModelServerError(f"Model server connection lost: {e}") from e
+
+            self._idle.put(conn)
+            if status == "error":
+                raise ModelServerError(payload)
+            return payload
+
+    def analyze(self, text: str, force_full_scan: bool = False, text_hash: str = None, on_progress=None,
+                language_hints: dict = None, features: dict = None):
+        return self._call("analyze", text, force_full_scan=force_full_scan, text_hash=text_hash, on_progress=on_progress,
+                          language_hints=language_hints, features=features)
+
+    def prescore_page(self, page: str, force_full_scan: bool = False, used_tokens: int = 0) -> tuple:
+        return self._call("prescore_page", page, force_full_scan=force_full_scan, used_tokens=used_tokens)
+
+    def analyze_pages(self, pages, force_full_scan: bool = False, text_hash: str = None, on_progress=None,
+                      before_prescore=None, before_analyze=None):
+        # Each finished page is prescored in its own call while extraction continues; the features
+        # come back with it and are handed to the final analyze call
+        return analyze_page_stream(self, pages, force_full_scan=force_full_scan, text_hash=text_hash,
+                                   on_progress=on_progress, before_prescore=before_prescore,
+                                   before_analyze=before_analyze)
+
+    def ping(self) -> dict:
+        return self._call("ping")
+
+
+def create_local_detector(num_threads: int = None):
+    """
+    Build the in-process AIDetector with the serving features enabled in settings
+    (micro-batching, result and feature caches). Used by the model server and by main.py without a server.
+    """
+    from .config import settings
+    from .ai_detector import AIDetector
+    from .result_cache import ResultCache, FeatureCache
+
+    detector = AIDetector(
+        num_threads=num_threads,
+        token_budget=settings.SCORING_TOKEN_BUDGET,
+        backend=settings.INFERENCE_BACKEND,
+        cache_dir=settings.MODEL_CACHE_DIR,
+        use_artifact_cache=settings.MODEL_ARTIFACT_CACHE,
+        global_window_stride=settings.GLOBAL_WINDOW_STRIDE,
+        global_max_windows=settings.GLOBAL_MAX_WINDOWS,
+        global_max_windows_full=settings.GLOBAL_MAX_WINDOWS_FULL_SCAN,
+        scan_chunk_size=settings.SCAN_CHUNK_SENTENCES,
+        scan_token_budget=settings.SCAN_TOKEN_BUDGET,
+        scan_token_budget_full=settings.SCAN_TOKEN_BUDGET_FULL_SCAN,
+        hybrid_sampler=settings.HYBRID_SAMPLER,
+        hybrid_sample_size=settings.HYBRID_SAMPLE_SIZE,
+        hybrid_target_ci=settings.HYBRID_TARGET_CI,
+        citation_max_chars=settings.CITATION_MAX_CHARS
+    )
+    if settings.MICRO_BATCH_ENABLED:
+        detector.enable_micro_batching(
+            max_batch_size=settings.MICRO_BATCH_MAX_SIZE,
+            max_wait_ms=settings.MICRO_BATCH_MAX_WAIT_MS
+        )
+    if settings.RESULT_CACHE_ENABLED:
+        disk_path = os.path.join(settings.RESULT_CACHE_DIR, "result_cache.sqlite3") if settings.RESULT_CACHE_DIR else None
+        detector.result_cache = ResultCache(
+            max_items=settings.RESULT_CACHE_MAX_ITEMS,
+            disk_path=disk_path,
+            ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS
+        )
+    if settings.FEATURE_CACHE_ENABLED:
+        detector.feature_cache = FeatureCache(max_items=settings.FEATURE_CACHE_MAX_ITEMS)
+    return detector
+
+
+def main():
+    from .config import settings
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if not settings.MODEL_SERVER_SOCKET:
+        raise SystemExit("MODEL_SERVER_SOCKET is not set; nothing to listen on.")
+
+    detector = create_local_detector(num_threads=settings.MODEL_SERVER_THREADS)
+    server = ModelServer(detector, settings.MODEL_SERVER_SOCKET, settings.SECRET_KEY.encode())
+    if settings.MODEL_WARMUP_ENABLED:
+        # Before listening: API workers only see the socket (and report ready) once the model is hot
+        detector.warmup()
+        server.warmed_up = True
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
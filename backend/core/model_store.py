@@ -0,0 +1,99 @@
+"""
+Model Artifact Store
+Persists the already-quantized IndoBERT module (plus tokenizer) in a local directory so worker
+start-up and Restart=always recoveries skip the fp32 load + quantize_dynamic step.
+Artifacts are memory-mapped on load and validated against a manifest (format, library versions,
+sha256); anything stale or corrupted is ignored and rebuilt by the caller.
+"""
+import datetime
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import torch
+import transformers
+from transformers import AutoTokenizer
+
+ARTIFACT_FORMAT = 1
+WEIGHTS_FILE = "quantized_model.pt"
+MANIFEST_FILE = "manifest.json"
+
+
+def sha256_file(path: str) -> str:
+    """Streaming sha256 of an artifact file (also used for the ONNX export manifest in inference_backends)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ModelArtifactStore:
+    def __init__(self, cache_dir: str, model_name: str):
+        self.model_name = model_name
+        self.path = os.path.join(cache_dir, "quantized", model_name.strip("/").replace("/", "--"))
+
+    def fingerprint(self) -> dict:
+        # Pickled quantized modules are only trusted by the same library versions that wrote them
+        return {
+            "format": ARTIFACT_FORMAT,
+            "model_name": self.model_name,
+            "torch": torch.__version__,
+            "transformers": transformers.__version__,
+        }
+
+    def load(self):
+        """Return (tokenizer, quantized_model) or None when no valid artifact exists."""
+        manifest_path = os.path.join(self.path, MANIFEST_FILE)
+        weights_path = os.path.join(self.path, WEIGHTS_FILE)
+        if not os.path.exists(manifest_path) or not os.path.exists(weights_path):
+            return None
+
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if {k: manifest.get(k) for k in self.fingerprint()} != self.fingerprint():
+                logging.info(f"Model artifact at {self.path} was built by other versions; rebuilding.")
+                return None
+            if sha256_file(weights_path) != manifest.get("sha256"):
+                logging.warning(f"Model artifact checksum mismatch at {self.path}; rebuilding.")
+                return None
+
+            tokenizer = AutoTokenizer.from_pretrained(self.path)
+            # The file is our own artifact, verified above; mmap keeps pages shared and lazily loaded
+            model = torch.load(weights_path, mmap=True, weights_only=False)
+            model.eval()
+        except Exception as e:
+            logging.warning(f"Could not load model artifact from {self.path}: {e}")
+            return None
+
+        logging.info(f"Loaded pre-quantized model artifact from {self.path}")
+        return tokenizer, model
+
+    def save(self, tokenizer, quantized_model):
+        """Write the artifact atomically (temp dir + rename) so concurrent workers never see half a file."""
+        parent = os.path.dirname(self.path)
+        os.makedirs(parent, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=".building-", dir=parent)
+        try:
+            weights_path = os.path.join(tmp_dir, WEIGHTS_FILE)
+            torch.save(quantized_model, weights_path)
+            tokenizer.save_pretrained(tmp_dir)
+
+            manifest = {
+                **self.fingerprint(),
+                "sha256": sha256_file(weights_path),
+                "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            }
+            with open(os.path.join(tmp_dir, MANIFEST_FILE), "w") as f:
+                json.dump(manifest, f, indent=2)
+
+            if os.path.exists(self.path):
+                shutil.rmtree(self.path, ignore_errors=True)
+            os.replace(tmp_dir, self.path)
+            logging.info(f"Saved pre-quantized model artifact to {self.path}")
+        except Exception as e:
+            logging.warning(f"Could not save model artifact to {self.path}: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -0,0 +1,57 @@
+"""
+Analysis of a document that arrives page by page (DocumentProcessor.iter_pages), shared by AIDetector and
+RemoteDetector. While later pages are still being extracted, the sentences of the finished pages are scored
+on a background thread through detector.prescore_page (over the socket for RemoteDetector, so the overlap
+also holds behind the shared model server); the final analyze() then finds most sentence features ready.
+
+- before_prescore(head) runs once on the first pages (at least guard_chars characters) before any page is
+  scored, so a rejected upload (English text, free-tier word limit or quota) costs no model pass.
+  Documents shorter than guard_chars are not prescored: they are scanned once the guard has passed.
+- before_analyze(text) runs on the full text (guards: may raise to abort) and may return language hints.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+# Characters of leading pages the early guard sees (a few pages: an English abstract alone does not decide)
+EARLY_GUARD_CHARS = 20000
+
+
+def analyze_page_stream(detector, pages, force_full_scan: bool = False, text_hash: str = None, on_progress=None,
+                        before_prescore=None, before_analyze=None, guard_chars: int = EARLY_GUARD_CHARS):
+    state = {"used": 0, "exhausted": False}  # only touched by the prescoring thread
+
+    def prescore(page: str) -> dict:
+        if state["exhausted"]:
+            return {}
+        features, state["used"], state["exhausted"] = detector.prescore_page(page, force_full_scan, state["used"])
+        return features
+
+    parts = []
+    prescoring = []
+    guarded = before_prescore is None
+    head_chars = 0
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="page-prescore")
+    try:
+        for page in pages:
+            parts.append(page)
+            if guarded:
+                ready = [page]
+            else:
+                head_chars += len(page)
+                if head_chars < guard_chars:
+                    continue
+                before_prescore("\n\n".join(parts))
+                guarded = True
+                ready = list(parts)
+            for part in ready:
+                if part.strip() and not state["exhausted"]:
+                    prescoring.append(pool.submit(prescore, part))
+        features = {}
+        for future in prescoring:
+            features.update(future.result())
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    text = "\n\n".join(parts)
+    language_hints = before_analyze(text) if before_analyze is not None else None
+    return detector.analyze(text, force_full_scan=force_full_scan, text_hash=text_hash, on_progress=on_progress,
+                            language_hints=language_hints, features=features)
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class LRUCache:
+    """Thread-safe bounded LRU map with hit/miss/eviction counters."""
+
+    def __init__(self, max_items: int = 256):
+        self.max_items = max(1, max_items)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_items:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_items": self.max_items,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class FeatureCache(LRUCache):
+    """
+    Sentence-level cache of model features ({"loss", "confidence"}) in front of the model.
+    Keys are digests of the whitespace-normalized sentence, so only hashes and scores are held in memory.
+    A revised draft resubmitted with two edited paragraphs only sends the changed sentences to the model.
+    """
+
+    @staticmethod
+    def key(sentence: str) -> str:
+        normalized = " ".join(sentence.split())
+        return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed cache of AIDetector.analyze() results.
+    Key = sha256 of the submitted text + model/scoring version + force_full_scan flag.
+
+    Zero-Retention: entries never contain document text. Sentence texts are replaced by their
+    position in the detector's sentence split and restored from the incoming (identical) text on a hit.
+    Tier 1 is an in-memory LRU; tier 2 (optional) is a small SQLite file with TTL eviction.
+    """
+
+    def __init__(self, max_items: int = 256, disk_path: Optional[str] = None, ttl_seconds: int = 86400):
+        self.memory = LRUCache(max_items)
+        self.disk_path = disk_path
+        self.ttl_seconds = ttl_seconds
+        self._disk_lock = threading.Lock()
+        self._last_purge = 0.0
+        if disk_path:
+            os.makedirs(os.path.dirname(os.path.abspath(disk_path)), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS result_cache (key TEXT PRIMARY KEY, payload TEXT NOT NULL, created_at REAL NOT NULL)"
+                )
+
+    @staticmethod
+    def make_key(text_hash: str, model_version: str, force_full_scan: bool) -> str:
+        return f"{text_hash}:{model_version}:{'full' if force_full_scan else 'hybrid'}"
+
+    def _connect(self):
+        return sqlite3.connect(self.disk_path, timeout=5)
+
+    def get(self, key: str) -> Optional[dict]:
+        entry = self.memory.get(key)
+        if entry is not None:
+            created_at, payload = entry
+            if time.time() - created_at <= self.ttl_seconds:
+                return payload
+        if not self.disk_path:
+            return None
+
+        try:
+            with self._disk_lock, self._connect() as conn:
+                row = conn.execute(
+                    "SELECT payload, created_at FROM result_cache WHERE key = ? AND created_at >= ?",
+                    (key, time.time() - self.ttl_seconds)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logging.warning(f"Result cache disk read failed: {e}")
+            return None
+        if row is None:
+            return None
+
+        payload = json.loads(row[0])
+        self.memory.put(key, (row[1], payload))  # Promote to memory tier
+        return payload
+
+    def put(self, key: str, payload: dict):
+        now = time.time()
+        self.memory.put(key, (now, payload))
+        if not self.disk_path:
+            return
+
+        try:
+            with self._disk_lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO result_cache (key, payload, created_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(payload), now)
+                )
+                # Opportunistic TTL eviction, at most once a minute
+                if now - self._last_purge > 60:
+                    conn.execute("DELETE FROM result_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+                    self._last_purge = now
+        except sqlite3.Error as e:
+            logging.warning(f"Result cache disk write failed: {e}")
+
+    def stats(self) -> dict:
+        return {"memory": self.memory.stats(), "disk_enabled": bool(self.disk_path), "ttl_seconds": self.ttl_seconds}
+
+    @staticmethod
+    def strip_text(result: dict, sentences: list[str]) -> dict:
+        """
+        Copy of an analyze() result with every sentence text replaced by its index in `sentences`.
+        Detailed entries are an in-order subsequence of the sentence split, so one cursor pass suffices.
+        """
+        stripped = []
+        cursor = 0
+        for entry in result.get("sentences", []):
+            while cursor < len(sentences) and sentences[cursor] != entry["text"]:
+                cursor += 1
+            if cursor == len(sentences):
+                return None  # Split changed underneath us; do not cache
+            item = {k: v for k, v in entry.items() if k != "text"}
+            item["idx"] = cursor
+            stripped.append(item)
+            cursor += 1
+        return {**result, "sentences": stripped}
+
+    @staticmethod
+    def rehydrate(payload: dict, sentences: list[str]) -> dict:
+        """Inverse of strip_text, using the sentence split of the resubmitted text."""
+        restored = []
+        for entry in payload.get("sentences", []):
+            item = {k: v for k, v in entry.items() if k != "idx"}
+            item["text"] = sentences[entry["idx"]]
+            restored.append(item)
+        return {**payload, "sentences": restored}
@@ -0,0 +1,122 @@
+"""
+Sentence samplers for hybrid (non full-scan) analysis of long documents.
+A sampler picks which sentences are sent to the model. It receives the indices of the scorable
+sentences in document order, and static samplers return their pick immediately; the sequential
+sampler scores as it goes (through the `score` callback, which returns one semantic score per index
+and may return fewer when the caller's budget runs out) and stops once the estimate is tight enough.
+
+- head_mid_tail: first, middle and last N sentences (the original hybrid scan)
+- stratified:    one random sentence from each of sample_size contiguous strata, so every part of the document is represented
+- reservoir:     uniform random sample of sample_size sentences (Algorithm R, single pass)
+- sequential:    stratified-random order, scored in rounds until the 95% confidence interval of the
+                 mean sentence score is within target_half_width points (or max_samples is reached)
+"""
+import math
+import random
+
+
+class HeadMidTailSampler:
+    name = "head_mid_tail"
+
+    def __init__(self, sample_size: int = 60, **_):
+        self.per_part = max(1, sample_size // 3)
+
+    def select(self, candidates: list[int], seed: int = 0, score=None) -> list[int]:
+        n, mid = len(candidates), len(candidates) // 2
+        half = self.per_part // 2
+        picked = set(range(min(self.per_part, n)))
+        picked |= set(range(max(0, mid - half), min(mid + half, n)))
+        picked |= set(range(max(0, n - self.per_part), n))
+        return [candidates[i] for i in sorted(picked)]
+
+
+class StratifiedSampler:
+    name = "stratified"
+
+    def __init__(self, sample_size: int = 60, **_):
+        self.sample_size = max(1, sample_size)
+
+    @staticmethod
+    def strata(n: int, k: int) -> list[range]:
+        """k contiguous, near-equal position ranges covering range(n)."""
+        bounds = [round(i * n / k) for i in range(k + 1)]
+        return [range(bounds[i], bounds[i + 1]) for i in range(k)]
+
+    def select(self, candidates: list[int], seed: int = 0, score=None) -> list[int]:
+        if len(candidates) <= self.sample_size:
+            return list(candidates)
+        rng = random.Random(seed)
+        return [candidates[rng.choice(stratum)] for stratum in self.strata(len(candidates), self.sample_size)]
+
+
+class ReservoirSampler:
+    name = "reservoir"
+
+    def __init__(self, sample_size: int = 60, **_):
+        self.sample_size = max(1, sample_size)
+
+    def select(self, candidates: list[int], seed: int = 0, score=None) -> list[int]:
+        rng = random.Random(seed)
+        reservoir = []
+        for seen, idx in enumerate(candidates):
+            if seen < self.sample_size:
+                reservoir.append(idx)
+            else:
+                j = rng.randint(0, seen)
+                if j < self.sample_size:
+                    reservoir[j] = idx
+        return sorted(reservoir)
+
+
+class SequentialSampler:
+    name = "sequential"
+
+    def __init__(self, sample_size: int = 60, target_half_width: float = 5.0, min_samples: int = 16, round_size: int = 8, **_):
+        self.max_samples = max(1, sample_size)
+        self.target_half_width = target_half_width
+        self.min_samples = min(min_samples, self.max_samples)
+        self.round_size = max(1, round_size)
+
+    @staticmethod
+    def half_width(scores: list[float], population: int) -> float:
+        """95% CI half-width of the mean, with finite population correction."""
+        n = len(scores)
+        if n < 2:
+            return math.inf
+        mean = sum(scores) / n
+        variance = sum((x - mean) ** 2 for x in scores) / (n - 1)
+        fpc = (population - n) / (population - 1) if population > 1 else 0.0
+        return 1.96 * math.sqrt(variance / n * max(fpc, 0.0))
+
+    def select(self, candidates: list[int], seed: int = 0, score=None) -> list[int]:
+        if score is None or len(candidates) <= self.min_samples:
+            return StratifiedSampler(self.max_samples).select(candidates, seed)
+
+        # Visit strata in random order, one random member each: any prefix is a spread-out random sample
+        rng = random.Random(seed)
+        k = min(self.max_samples, len(candidates))
+        order = [candidates[rng.choice(stratum)] for stratum in StratifiedSampler.strata(len(candidates), k)]
+        rng.shuffle(order)
+
+        picked, scores = [], []
+        while len(picked) < len(order):
+            take = max(self.round_size, self.min_samples - len(picked))
+            batch = order[len(picked):len(picked) + take]
+            batch_scores = score(batch)
+            picked += batch[:len(batch_scores)]
+            scores += batch_scores
+            if len(batch_scores) < len(batch):
+                break  # The caller's token budget ran out
+            if len(picked) >= self.min_samples and self.half_width(scores, len(candidates)) <= self.target_half_width:
+                break
+        return sorted(picked)
+
+
+SAMPLERS = {sampler.name: sampler for sampler in (HeadMidTailSampler, StratifiedSampler, ReservoirSampler, SequentialSampler)}
+
+
+def create_sampler(name: str, **options):
+    """Build the named hybrid-scan sampler (see SAMPLERS); unknown options are ignored by samplers that do not use them."""
+    if name not in SAMPLERS:
+        raise ValueError(f"Unknown hybrid sampler '{name}'. Choose one of: {', '.join(SAMPLERS)}")
+    return SAMPLERS[name](**options)
@@ -0,0 +1,132 @@
+"""
+Indonesian sentence segmentation with character offsets, shared by sentence scoring, burstiness,
+the language guard's sampler and highlighting (analyze() entries carry start/end offsets).
+
+One left-to-right pass over boundary candidates (paragraph breaks, quote openers, sentence-final
+punctuation followed by whitespace). Every decision looks at a bounded neighbourhood or jumps past
+what it scanned (a quoted passage, a whitespace run), so the cost is linear in the text length.
+
+- Paragraph breaks (blank lines) always end a sentence.
+- Final punctuation ends a sentence when the next word starts with a capital, a quote or a list
+  number ("2. Metode"), unless the word before it is a title/reference abbreviation (Prof., hlm.),
+  an initial (M. Hatta), a dotted abbreviation (S.Pd.) or the list number opening the sentence ("1.").
+- Quoted passages are never cut; one that holds whole sentences of its own becomes its own sentence.
+"""
+import re
+from typing import List, NamedTuple
+
+
+class Sentence(NamedTuple):
+    text: str
+    start: int  # text == source[start:end]
+    end: int
+
+
+class SentenceSegmenter:
+    # Abbreviations after which the next word still belongs to the same sentence (lowercase, no dot).
+    # Enumeration endings such as dll. / dsb. / dst. / dkk. are left out: they often end a sentence.
+    ABBREVIATIONS = frozenset("""
+        prof dr drs dra ir hj kh st sdr sdri bpk yth no nomor hlm hal vol jl kab kec kel prov tgl
+        rp pt cv ed eds al cf vs mr mrs ms jr
+    """.split())
+    MAX_TOKEN_LOOKBACK = 32
+
+    _EVENTS = re.compile(
+        r'(?=[\n"“.!?…])(?:'  # leading character set: lets the regex engine skip plain text quickly
+        r'(?P<para>\n[^\S\n]*\n\s*)'  # blank line
+        r'|(?P<quote>["“])'
+        r'|(?P<stop>[.!?…](?<![.!?…]{2})[.!?…]*[)\]]?)(?P<space>\s+)'  # a whole punctuation run, then whitespace
+        r')'
+    )
+    _PARAGRAPH = re.compile(r'\n[^\S\n]*\n')
+    _CLOSER = re.compile(r'["”]')
+    _TERMINAL = re.compile(r'[.!?…]')
+    _LIST_MARKER = re.compile(r'(?:\d{1,3}|[IVXivx]{1,4}|[a-zA-Z])$')
+    _NEXT_LIST_MARKER = re.compile(r'\d{1,3}[.)]\s')
+
+    def segment(self, text: str) -> List[Sentence]:
+        sentences = []
+        start = 0  # start of the current sentence
+        pos = 0
+        paragraph_end = -1  # end of the paragraph holding the last quote opener
+        no_closer_before = -1  # a closer search already failed up to here
+
+        def emit(end):
+            chunk = text[start:end]
+            stripped = chunk.strip()
+            if stripped:
+                offset = start + len(chunk) - len(chunk.lstrip())
+                sentences.append(Sentence(stripped, offset, offset + len(stripped)))
+
+        while True:
+            m = self._EVENTS.search(text, pos)
+            if m is None:
+                break
+            kind = m.lastgroup
+
+            if kind == "para":
+                emit(m.start())
+                start = pos = m.end()
+
+            elif kind == "quote":
+                q = m.start()
+                if q > paragraph_end:
+                    paragraph = self._PARAGRAPH.search(text, q)
+                    paragraph_end = paragraph.start() if paragraph else len(text)
+                closer = None if q < no_closer_before else self._CLOSER.search(text, q + 1, paragraph_end)
+                if closer is None:
+                    # Unbalanced quote: plain text (and later openers in this paragraph cannot close either)
+                    no_closer_before = paragraph_end
+                    pos = q + 1
+                    continue
+                if self._TERMINAL.search(text, q + 1, closer.start()):
+                    emit(q)
+                    start = q
+                    emit(closer.end())
+                    start = closer.end()
+                pos = closer.end()
+
+            else:
+                stop_end = m.start("space")
+                next_word = pos = m.end()
+                if next_word >= len(text):
+                    break
+                space = m.group("space")
+                if ("\n" in space and self._PARAGRAPH.search(space)) or \
+                        self._is_boundary(text, start, m.start(), m.group("stop"), next_word):
+                    emit(stop_end)
+                    start = next_word
+
+        emit(len(text))
+        return sentences
+
+    def _is_boundary(self, text: str, start: int, stop: int, punctuation: str, next_word: int) -> bool:
+        nxt = text[next_word]
+        if not (nxt.isupper() or nxt in '"“\'‘' or self._NEXT_LIST_MARKER.match(text, next_word)):
+            return False
+        if punctuation != ".":
+            return True
+
+        # Word before the dot (bounded look-back)
+        limit = max(start, stop - self.MAX_TOKEN_LOOKBACK)
+        k = max(text.rfind(" ", limit, stop), text.rfind("\n", limit, stop), text.rfind("\t", limit, stop)) + 1 or limit
+        token = text[k:stop].lstrip('("“\'‘[')
+        if not token:
+            return True
+        if token.lower() in self.ABBREVIATIONS:
+            return False
+        if len(token) == 1 and token.isupper():  # initial
+            return False
+        if "." in token and all(0 < len(part) <= 3 for part in token.split(".")):  # S.Pd, M.Si, e.g, i.e
+            return False
+        if self._LIST_MARKER.match(token) and (k == start or text[k - 2:k - 1] == ":"):  # "1. Pendahuluan", "berikut: 2. Hasil"
+            return False
+        return True
+
+
+_default = SentenceSegmenter()
+
+
+def segment_sentences(text: str) -> List[Sentence]:
+    """Sentences of `text` with their character offsets (see SentenceSegmenter)."""
+    return _default.segment(text)
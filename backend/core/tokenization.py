@@ -0,0 +1,55 @@
+from bisect import bisect_left, bisect_right
+
+
+class DocumentTokens:
+    """
+    One fast-tokenizer pass over the normalized document, with character offsets.
+    Sentence token ids are sliced out of this pass instead of re-tokenizing every sentence.
+    BERT pre-tokenization splits on whitespace and punctuation, and the sentence splitter
+    only cuts there, so a sentence's tokens are exactly the document tokens inside its character span.
+    """
+
+    def __init__(self, tokenizer, text: str):
+        encoding = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True, verbose=False)
+        self.tokenizer = tokenizer
+        self.text = text
+        self.ids = encoding["input_ids"]
+        self._starts = [start for start, _ in encoding["offset_mapping"]]
+        self._ends = [end for _, end in encoding["offset_mapping"]]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def span(self, char_start: int, char_end: int) -> tuple[int, int]:
+        """Token index range [start, end) of the tokens lying inside text[char_start:char_end]."""
+        return bisect_left(self._starts, char_start), bisect_right(self._ends, char_end)
+
+    def sentence_ids(self, sentences: list[str], max_length: int = 512, add_special_tokens: bool = True,
+                     offsets: list[tuple[int, int]] = None) -> list[list[int]]:
+        """
+        Token ids for sentences that appear in order in the document text, truncated like
+        tokenizer(sentence, truncation=True, max_length=max_length) (max_length=None: no truncation).
+        offsets: the sentences' (start, end) character spans when known (segmenter output), else they are
+        searched for. A sentence that cannot be located in the text is tokenized on its own.
+        """
+        specials = 2 if add_special_tokens else 0
+        results = []
+        cursor = 0
+        for n, sentence in enumerate(sentences):
+            pos = offsets[n][0] if offsets is not None else self.text.find(sentence, cursor)
+            if pos < 0:
+                ids = self.tokenizer(sentence, add_special_tokens=False, verbose=False)["input_ids"]
+            else:
+                cursor = pos + len(sentence)
+                start, end = self.span(pos, cursor)
+                ids = self.ids[start:end]
+            if max_length:
+                ids = ids[:max_length - specials]
+            if add_special_tokens:
+                ids = [self.tokenizer.cls_token_id] + ids + [self.tokenizer.sep_token_id]
+            results.append(ids)
+        return results
+
+    def model_input(self, ids: list[int], max_length: int = 512) -> list[int]:
+        """[CLS] ids [SEP], truncated to max_length like the tokenizer's own truncation."""
+        return [self.tokenizer.cls_token_id] + ids[:max_length - 2] + [self.tokenizer.sep_token_id]
@@ -1,25 +1,31 @@
 from typing import List, Optional
-from fastapi import FastAPI, Depends, HTTPException, File, UploadFile, BackgroundTasks, Form, status
+from fastapi import FastAPI, Depends, HTTPException, File, UploadFile, BackgroundTasks, Form, Query, status
 from fastapi.responses import JSONResponse, Response, HTMLResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordRequestForm
-from langdetect import detect, DetectorFactory
 import hashlib
-DetectorFactory.seed = 0 # For consistent results
 from sqlalchemy.orm import Session
 import uvicorn
 import io
 import models
 import schemas
 import database
-from core.ai_detector import AIDetector
-from core.doc_processor import DocumentProcessor
+from core.doc_processor import DocumentProcessor, DocumentLimitError
+from core.language_id import LanguageIdentifier
 from core.report_generator import ReportGenerator
 from core.auth import get_password_hash, verify_password, create_access_token, get_current_user, get_current_admin_user
 from core.maintenance import purge_sensitive_data, delete_user_history, expire_old_history
 from core.middleware import PrivacyShieldMiddleware, setup_privacy_logging
+from core.inference_executor import InferenceExecutor, InferenceBusyError, BoundedDetector
+from core.model_server import RemoteDetector, ModelServerError, create_local_detector
+from core.model_provider import DetectorProvider, ModelNotReadyError
+from core.job_queue import ScanJobQueue, JobLimitError, JobFailed, JobDeferred
 from fastapi import BackgroundTasks
-from sqlalchemy import func
+from sqlalchemy import func, text as sql_text
+import asyncio
+import json
+import time
+import zipfile
 import os
 import requests
 import uuid
@@ -40,6 +46,19 @@ app.add_middleware(PrivacyShieldMiddleware)
 @app.on_event("startup")
 async def startup_event():
     setup_privacy_logging()
+    # Load IndoBERT in the background: /health answers immediately, /ready flips once the model is warm
+    detector_provider.start()
+    if settings.JOB_QUEUE_ENABLED:
+        job_queue.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    job_queue.stop()
+    inference_executor.shutdown(wait=False)
+    doc_processor.shutdown()
+    detector = detector_provider.detector
+    if detector is not None and detector.batcher is not None:
+        detector.batcher.stop()
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -87,8 +106,30 @@ def get_me(current_user: models.User = Depends(get_current_user)):
     return current_user
 
 # --- SERVICES ---
-detector = AIDetector()
-doc_processor = DocumentProcessor()
+def build_detector():
+    if settings.MODEL_SERVER_SOCKET:
+        # Production: the model lives in the shared model server process (see core/model_server.py)
+        return RemoteDetector(
+            settings.MODEL_SERVER_SOCKET,
+            authkey=settings.SECRET_KEY.encode(),
+            timeout=settings.MODEL_SERVER_TIMEOUT
+        )
+    # torch/transformers are imported lazily inside, so API workers in model-server mode never load them
+    return create_local_detector()
+
+# Built on a background thread at startup (or on first use), never at import time
+detector_provider = DetectorProvider(build_detector, warmup=settings.MODEL_WARMUP_ENABLED)
+inference_executor = InferenceExecutor(
+    max_workers=settings.INFERENCE_MAX_WORKERS,
+    max_queue=settings.INFERENCE_MAX_QUEUE
+)
+doc_processor = DocumentProcessor(
+    max_bytes=settings.DOC_MAX_UPLOAD_MB * 1024 * 1024,
+    max_pages=settings.DOC_MAX_PAGES,
+    workers=settings.PDF_EXTRACT_WORKERS,
+    parallel_min_pages=settings.PDF_PARALLEL_MIN_PAGES
+)
+language_identifier = LanguageIdentifier()
 # Use absolute path for logo to avoid issues with different CWDs
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 logo_path = os.path.join(BASE_DIR, "assets", "logo.png")
@@ -108,36 +149,84 @@ app.add_middleware(
 async def root():
     return {"message": "Welcome to SahihAksara API", "version": "0.1.0"}
 
-@app.post("/analyze", response_model=schemas.ScanResponse)
-async def analyze_text(
-    request: schemas.ScanCreate, 
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(get_current_user)
-):
-    # 0. Language Guard: Check if text is Indonesian
-    try:
-        lang = detect(request.text_content)
-        if lang == 'en':
+async def get_detector():
+    """The loaded detector, waiting up to MODEL_LOAD_WAIT_SECONDS while it is still loading (then 503)."""
+    detector = detector_provider.detector
+    if detector is None:
+        try:
+            detector = await asyncio.to_thread(detector_provider.get, settings.MODEL_LOAD_WAIT_SECONDS)
+        except ModelNotReadyError as e:
+            logging.warning(f"Scan rejected, model not ready: {e}")
             raise HTTPException(
-                status_code=400,
-                detail="SahihAksara dioptimasi khusus untuk mendeteksi struktur dan pola Bahasa Indonesia guna menjamin akurasi 99%. Kami mendeteksi naskah Anda menggunakan Bahasa Inggris. Untuk hasil terbaik, silakan gunakan teks berbahasa Indonesia atau detektor internasional."
+                status_code=503,
+                detail="Model AI sedang dimuat. Silakan coba lagi dalam beberapa saat.",
+                headers={"Retry-After": "10"}
             )
-    except HTTPException:
-        raise
-    except Exception:
-        # Ignore detection errors for very short or non-textual content, fallback to analyzer
-        pass
+    return detector
+
+def inference_busy(e: InferenceBusyError) -> HTTPException:
+    logging.warning(f"Inference backpressure: {e}")
+    return HTTPException(
+        status_code=503,
+        detail="Server sedang sibuk memproses banyak pemindaian. Silakan coba lagi dalam beberapa saat.",
+        headers={"Retry-After": "10"}
+    )
+
+async def run_inference(fn, *args, **kwargs):
+    """Run a detector call on the bounded inference pool, mapping backpressure and model server errors to 503."""
+    try:
+        return await inference_executor.run(fn, *args, **kwargs)
+    except InferenceBusyError as e:
+        raise inference_busy(e)
+    except ModelServerError as e:
+        raise model_server_unavailable(e)
+
+def model_server_unavailable(e: ModelServerError) -> HTTPException:
+    logging.error(f"Model server error: {e}")
+    return HTTPException(
+        status_code=503,
+        detail="Layanan analisis sedang tidak tersedia. Silakan coba lagi dalam beberapa saat.",
+        headers={"Retry-After": "10"}
+    )
+
+async def run_detector(text: str, force_full_scan: bool = False, text_hash: str = None, on_progress=None,
+                       language_hints: dict = None):
+    """
+    Run AIDetector.analyze on the bounded inference pool.
+    The event loop stays free for other requests; when the pool is saturated we shed load with 503.
+    text_hash (the ScanResult sha256) lets the detector answer repeat submissions from its result cache.
+    on_progress is called from the inference thread after every scanned chunk (see stream_scan).
+    """
+    detector = await get_detector()
+    return await run_inference(
+        detector.analyze, text, force_full_scan=force_full_scan, text_hash=text_hash, on_progress=on_progress,
+        language_hints=language_hints
+    )
+
+ENGLISH_DOCUMENT_DETAIL = "SahihAksara dioptimasi khusus untuk mendeteksi struktur dan pola Bahasa Indonesia guna menjamin akurasi 99%. Kami mendeteksi naskah Anda menggunakan Bahasa Inggris. Untuk hasil terbaik, silakan gunakan teks berbahasa Indonesia atau detektor internasional."
+
+def check_scan_allowed(text: str, current_user: models.User, source_label: str = "Anda mencoba") -> dict:
+    """
+    Language guard and free-tier limits shared by every scan endpoint (raises HTTPException).
+    Returns the guard's sentence language labels, to pass on as analyze(language_hints=...).
+    """
+    # 0. Language Guard: Check if text is Indonesian, on a bounded sample of sentences
+    # (undecidable or mixed text falls through to the analyzer, which flags English sentences itself)
+    language = language_identifier.assess_document(
+        text, samples=settings.LANGUAGE_GUARD_SAMPLES, min_confidence=settings.LANGUAGE_GUARD_MIN_CONFIDENCE
+    )
+    if language["language"] == "en":
+        raise HTTPException(status_code=400, detail=ENGLISH_DOCUMENT_DETAIL)
 
     # 1. Freemium Logic: Check Word Count
-    words = request.text_content.split()
+    words = text.split()
     word_count = len(words)
     
     if current_user.role == "free":
         if word_count > 800:
             raise HTTPException(
                 status_code=403, 
-                detail=f"Batas gratis 800 kata terlampaui (Anda mencoba: {word_count} kata). Silakan upgrade ke Pro!"
+                detail=f"Batas gratis 800 kata terlampaui ({source_label}: {word_count} kata). Silakan upgrade ke Pro!"
             )
         # Check Quota
         if current_user.daily_quota <= 0:
@@ -145,30 +234,24 @@ async def analyze_text(
                 status_code=403, 
                 detail="Kuota harian gratis Anda sudah habis. Silakan balik lagi besok atau upgrade ke Pro!"
             )
-    
-    # 2. Analyze (Pro/Admin bypass Hybrid Sampling)
-    force_full = current_user.role in ["pro", "admin"]
-    result = detector.analyze(request.text_content, force_full_scan=force_full)
-    
-    # 3. Deduct Quota for Free Users
+    return language["hints"]
+
+def build_scan_record(current_user: models.User, result: dict, text_hash: str, stored_label: str) -> models.ScanResult:
+    """Deduct free-tier quota and build the (unsaved) ScanResult row for an analysis result."""
+    # Deduct Quota for Free Users
     if current_user.role == "free":
         current_user.daily_quota -= 1
     
-    # 4. Save to database (Metadata persistent, sentences kept briefly)
-    sentences = result.get("sentences", [])
-    
-    # Calculate Fingerprint (SHA-256)
-    text_hash = hashlib.sha256(request.text_content.encode()).hexdigest()
-
-    db_result = models.ScanResult(
+    # Save to database (Metadata persistent, sentences kept briefly)
+    return models.ScanResult(
         user_id=current_user.id,
-        text_content=request.text_content[:30] + "... [PURGED FOR PRIVACY]",
+        text_content=stored_label[:30] + "... [PURGED FOR PRIVACY]",
         sha256_hash=text_hash,
         ai_probability=result["ai_probability"],
         perplexity=result["perplexity"],
         burstiness=result["burstiness"],
         status=result["status"],
-        sentences=sentences, # Kept briefly for report download
+        sentences=result.get("sentences", []), # Kept briefly for report download
         ai_count=result.get("ai_count", 0),
         para_count=result.get("para_count", 0),
         mix_count=result.get("mix_count", 0),
@@ -182,22 +265,52 @@ async def analyze_text(
         citation_percentage=result.get("citation_percentage"),
         ai_source=result.get("ai_source")
     )
+
+def save_scan_result(db: Session, background_tasks: Optional[BackgroundTasks], current_user: models.User, result: dict,
+                     text_hash: str, stored_label: str, display_text: str) -> schemas.ScanResponse:
+    """Deduct free-tier quota, persist the ScanResult and build the response (full text and sentences only in the response)."""
+    sentences = result.get("sentences", [])
+    db_result = build_scan_record(current_user, result, text_hash, stored_label)
     db.add(db_result)
     db.commit()
     db.refresh(db_result)
     
-    # 5. Background Maintenance (Safety Net with Delay)
-    background_tasks.add_task(purge_sensitive_data, db)
-    background_tasks.add_task(expire_old_history, db, 7) # Auto-expiry
+    # Background Maintenance (Safety Net with Delay)
+    if background_tasks is not None:
+        background_tasks.add_task(purge_sensitive_data, db)
+        background_tasks.add_task(expire_old_history, db, 7) # Auto-expiry
     
     # Convert to schema and manually inject sentences for the initial view
     # We explicitly return the full text here so the frontend can use it immediately (e.g. for Humanizer)
     # Even though it's saved as 'PURGED' in the database for long-term privacy.
     response_data = schemas.ScanResponse.model_validate(db_result)
-    response_data.text_content = request.text_content 
+    response_data.text_content = display_text
     response_data.sentences = sentences
     return response_data
 
+@app.post("/analyze", response_model=schemas.ScanResponse)
+async def analyze_text(
+    request: schemas.ScanCreate, 
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    language_hints = check_scan_allowed(request.text_content, current_user)
+    
+    # Calculate Fingerprint (SHA-256) - also the result cache key
+    text_hash = hashlib.sha256(request.text_content.encode()).hexdigest()
+
+    # 2. Analyze (Pro/Admin bypass Hybrid Sampling)
+    force_full = current_user.role in ["pro", "admin"]
+    result = await run_detector(request.text_content, force_full_scan=force_full, text_hash=text_hash,
+                                language_hints=language_hints)
+    
+    # 3. Deduct quota & save to database
+    return save_scan_result(
+        db, background_tasks, current_user, result, text_hash,
+        stored_label=request.text_content, display_text=request.text_content
+    )
+
 @app.get("/history", response_model=list[schemas.ScanResponse])
 async def get_history(
     limit: int = 10, 
@@ -219,102 +332,413 @@ async def clear_history(
     count = delete_user_history(db, current_user.id)
     return {"message": f"Berhasil menghapus {count} riwayat scan.", "deleted_count": count}
 
+def format_stream_event(event: str, data: dict, stream_format: str) -> str:
+    if stream_format == "ndjson":
+        return json.dumps({"event": event, **data}) + "\n"
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def stream_scan(run_scan, current_user: models.User, background_tasks: BackgroundTasks, stored_label: str,
+                      stream_format: str) -> StreamingResponse:
+    """
+    Streaming variant of the scan endpoints: "progress" events (new sentence scores + running semantic
+    opinion) as chunks complete, then one "result" event with the saved ScanResponse, or an "error" event.
+    run_scan(on_progress) is awaited for (text, result). Busy / model-not-ready errors and guard rejections
+    raised before the first event are returned as normal HTTP responses.
+    """
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+
+    def on_progress(event):
+        # Called on the inference thread
+        loop.call_soon_threadsafe(events.put_nowait, event)
+
+    scan = asyncio.ensure_future(run_scan(on_progress))
+    # A disconnected client abandons the scan; retrieve its outcome so it is not reported as unhandled
+    scan.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    getter = asyncio.ensure_future(events.get())
+    await asyncio.wait({scan, getter}, return_when=asyncio.FIRST_COMPLETED)
+    if scan.done() and not getter.done() and scan.exception() is not None:
+        getter.cancel()
+        raise scan.exception()
+
+    user_id = current_user.id
+
+    async def body():
+        nonlocal getter
+        try:
+            while True:
+                done, _ = await asyncio.wait({scan, getter}, return_when=asyncio.FIRST_COMPLETED)
+                if getter not in done:
+                    break
+                yield format_stream_event("progress", getter.result(), stream_format)
+                getter = asyncio.ensure_future(events.get())
+            while not events.empty():
+                yield format_stream_event("progress", events.get_nowait(), stream_format)
+        finally:
+            getter.cancel()
+
+        try:
+            text, result = scan.result()
+        except HTTPException as e:
+            yield format_stream_event("error", {"status_code": e.status_code, "detail": e.detail}, stream_format)
+            return
+        except Exception as e:
+            logging.error(f"Streaming scan failed: {e}")
+            yield format_stream_event("error", {"status_code": 500, "detail": "Terjadi kesalahan internal pada server."}, stream_format)
+            return
+
+        # The request's DB session may already be closed while streaming: use a dedicated one
+        db = database.SessionLocal()
+        user = db.get(models.User, user_id)
+        text_hash = hashlib.sha256(text.encode()).hexdigest()
+        response_data = save_scan_result(db, background_tasks, user, result, text_hash, stored_label=stored_label, display_text=text)
+        background_tasks.add_task(db.close)
+        yield format_stream_event("result", response_data.model_dump(mode="json"), stream_format)
+
+    media_type = "application/x-ndjson" if stream_format == "ndjson" else "text/event-stream"
+    return StreamingResponse(body(), media_type=media_type, headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+def upload_pages(filename: str, content: bytes):
+    """doc_processor.iter_pages with extraction errors mapped to HTTPException (limits 413, bad format 400)."""
+    try:
+        yield from doc_processor.iter_pages(filename, content)
+    except DocumentLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def scan_upload(detector, filename: str, content: bytes, user: models.User, force_full_scan: bool, on_progress=None):
+    """
+    The /analyze-file pipeline, run on a plain thread: pages stream from the extractor into
+    detector.analyze_pages, so the first pages are scored while later ones are still being extracted.
+    The language guard and tier checks run on the first pages before any of them is scored, and again on
+    the full text before the scan (raises HTTPException). Returns (text, result).
+    """
+    extracted = {}
+
+    def early_guard(head):
+        # English text, an exhausted quota or a word count already over the free limit fail here,
+        # before the model has spent anything on the upload
+        check_scan_allowed(head, user, source_label="Bagian awal file ini")
+
+    def guard(text):
+        if not text.strip():
+            raise HTTPException(status_code=400, detail="Gagal mengekstrak teks dari berkas.")
+        extracted["text"] = text
+        return check_scan_allowed(text, user, source_label="File ini")
+
+    result = detector.analyze_pages(upload_pages(filename, content), force_full_scan=force_full_scan,
+                                    on_progress=on_progress, before_prescore=early_guard, before_analyze=guard)
+    return extracted["text"], result
+
+async def run_upload_scan(detector, filename: str, content: bytes, user: models.User, force_full_scan: bool,
+                          on_progress=None):
+    """
+    scan_upload on a plain thread: PyMuPDF extraction and the guards do not hold inference slots, only the
+    model calls (prescoring, analyze) go through the bounded pool. Busy / model server errors map to 503.
+    """
+    try:
+        return await asyncio.to_thread(scan_upload, BoundedDetector(detector, inference_executor), filename, content,
+                                       user, force_full_scan, on_progress)
+    except InferenceBusyError as e:
+        raise inference_busy(e)
+    except ModelServerError as e:
+        raise model_server_unavailable(e)
+
+def process_scan_job(db: Session, job: models.ScanJob) -> int:
+    """Job queue handler: the /analyze-file pipeline (extraction -> analyze -> ScanResult) for a queued upload."""
+    user = db.get(models.User, job.user_id)
+    # Already off the event loop, but model calls still share the bounded inference pool with the request
+    # path: a job waits for a free slot instead of failing. A model that is still loading defers the job
+    # without using up an attempt; model server errors are retried
+    try:
+        detector = detector_provider.get(timeout=settings.MODEL_LOAD_WAIT_SECONDS)
+    except ModelNotReadyError as e:
+        raise JobDeferred(str(e))
+    try:
+        text, result = scan_upload(BoundedDetector(detector, inference_executor, wait_for_slot=True), job.filename,
+                                   job.payload, user, bool(job.force_full_scan))
+    except HTTPException as e:
+        raise JobFailed(e.detail, e.status_code)
+
+    text_hash = hashlib.sha256(text.encode()).hexdigest()
+    return save_scan_result(db, None, user, result, text_hash, stored_label=job.filename, display_text=text).id
+
+job_queue = ScanJobQueue(
+    database.SessionLocal,
+    process_scan_job,
+    workers=settings.JOB_WORKERS,
+    poll_interval=settings.JOB_POLL_INTERVAL,
+    lease_seconds=settings.JOB_LEASE_SECONDS,
+    max_attempts=settings.JOB_MAX_ATTEMPTS,
+    max_active_per_user=settings.JOB_MAX_ACTIVE_PER_USER,
+    max_running_per_user=settings.JOB_MAX_RUNNING_PER_USER,
+    retention_hours=settings.JOB_RETENTION_HOURS
+)
+
+async def enqueue_file_scan(file: UploadFile, db: Session, current_user: models.User) -> JSONResponse:
+    # Free tier: fail fast on an exhausted quota; word limits are checked once the text is extracted
+    if current_user.role == "free" and current_user.daily_quota <= 0:
+        raise HTTPException(
+            status_code=403, 
+            detail="Kuota harian gratis Anda sudah habis. Silakan balik lagi besok atau upgrade ke Pro!"
+        )
+
+    content = await file.read()
+    # Format and size are checked now, so an unsupported or oversized upload is never stored as a job payload
+    try:
+        doc_processor.check_upload(file.filename, content)
+    except DocumentLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        job = job_queue.enqueue(
+            db, current_user.id, file.filename, content,
+            force_full_scan=current_user.role in ["pro", "admin"]
+        )
+    except JobLimitError as e:
+        logging.warning(f"Job limit: {e}")
+        raise HTTPException(
+            status_code=429,
+            detail="Anda masih memiliki beberapa pemindaian yang sedang diproses. Tunggu hingga selesai lalu coba lagi.",
+            headers={"Retry-After": "30"}
+        )
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job.id, "status": job.status, "status_url": f"/jobs/{job.id}"}
+    )
+
 @app.post("/analyze-file", response_model=schemas.ScanResponse)
 async def analyze_file(
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...), 
+    async_mode: bool = Query(False),
     db: Session = Depends(database.get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    # 1. Read file content & Extraction
+    # Large uploads: queue the whole pipeline and return a job ID to poll (/jobs/{id})
+    if async_mode and settings.JOB_QUEUE_ENABLED:
+        return await enqueue_file_scan(file, db, current_user)
+
+    # 1. Extraction, Language Guard & Tier Checks, Analyze: pages are scored while later ones are
+    # still being extracted (Pro/Admin bypass Hybrid Sampling)
     content = await file.read()
-    try:
-        text = doc_processor.process_file(file.filename, content)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    detector = await get_detector()
+    force_full = current_user.role in ["pro", "admin"]
+    text, result = await run_upload_scan(detector, file.filename, content, current_user, force_full)
+
+    # Fingerprint - also the result cache key
+    text_hash = hashlib.sha256(text.encode()).hexdigest()
     
-    if not text.strip():
-        raise HTTPException(status_code=400, detail="Gagal mengekstrak teks dari berkas.")
+    # 2. Deduct quota & save to DB
+    return save_scan_result(
+        db, background_tasks, current_user, result, text_hash,
+        stored_label=file.filename, display_text=text
+    )
 
-    # 0. Language Guard
-    try:
-        lang = detect(text) 
-        if lang == 'en':
-            raise HTTPException(
-                status_code=400,
-                detail="SahihAksara dioptimasi khusus untuk mendeteksi struktur dan pola Bahasa Indonesia guna menjamin akurasi 99%. Kami mendeteksi naskah Anda menggunakan Bahasa Inggris. Untuk hasil terbaik, silakan gunakan teks berbahasa Indonesia atau detektor internasional."
-            )
-    except HTTPException:
-        raise
-    except Exception:
-        pass
+@app.post("/analyze/stream")
+async def analyze_text_stream(
+    request: schemas.ScanCreate,
+    background_tasks: BackgroundTasks,
+    stream_format: str = Query("sse", alias="format", pattern="^(sse|ndjson)$"),
+    current_user: models.User = Depends(get_current_user)
+):
+    """Same as /analyze, streamed as Server-Sent Events (or NDJSON with ?format=ndjson) while the scan runs."""
+    text = request.text_content
+    language_hints = check_scan_allowed(text, current_user)
+    text_hash = hashlib.sha256(text.encode()).hexdigest()
+    force_full = current_user.role in ["pro", "admin"]
 
-    # 1. Freemium Logic
-    # Tier Checks (Word Count & Quota for Free)
-    words = text.split()
-    word_count = len(words)
-    
-    if current_user.role == "free":
-        if word_count > 800:
-            raise HTTPException(
-                status_code=403, 
-                detail=f"Batas gratis 800 kata terlampaui (File ini: {word_count} kata). Silakan upgrade ke Pro!"
-            )
-        if current_user.daily_quota <= 0:
-            raise HTTPException(
-                status_code=403, 
-                detail="Kuota harian gratis Anda sudah habis. Silakan balik lagi besok atau upgrade ke Pro!"
-            )
+    async def run_scan(on_progress):
+        return text, await run_detector(text, force_full_scan=force_full, text_hash=text_hash, on_progress=on_progress,
+                                        language_hints=language_hints)
 
-    # 3. Analyze (Pro/Admin bypass Hybrid Sampling)
+    return await stream_scan(run_scan, current_user, background_tasks, stored_label=text, stream_format=stream_format)
+
+@app.post("/analyze-file/stream")
+async def analyze_file_stream(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    stream_format: str = Query("sse", alias="format", pattern="^(sse|ndjson)$"),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Same as /analyze-file, streamed as Server-Sent Events (or NDJSON with ?format=ndjson) while the scan runs.
+    Pages are extracted and prescored like /analyze-file, so the guards reject an upload before any scoring.
+    """
+    content = await file.read()
+    detector = await get_detector()
     force_full = current_user.role in ["pro", "admin"]
-    result = detector.analyze(text, force_full_scan=force_full)
-    
-    # 4. Deduct Quota for Free Users
-    if current_user.role == "free":
-        current_user.daily_quota -= 1
-    
-    # 5. Save to DB (Metadata persistent, sentences kept briefly)
-    sentences = result.get("sentences", [])
-    
-    # Calculate Fingerprint
-    text_hash = hashlib.sha256(text.encode()).hexdigest()
 
-    db_result = models.ScanResult(
-        user_id=current_user.id,
-        text_content=file.filename[:30] + "... [PURGED FOR PRIVACY]",
-        sha256_hash=text_hash,
-        ai_probability=result["ai_probability"],
-        perplexity=result["perplexity"],
-        burstiness=result["burstiness"],
-        status=result["status"],
-        sentences=sentences, # Kept briefly for report download
-        ai_count=result.get("ai_count", 0),
-        para_count=result.get("para_count", 0),
-        mix_count=result.get("mix_count", 0),
-        human_count=result.get("human_count", 0),
-        citation_count=result.get("citation_count", 0),
-        skipped_count=result.get("skipped_count", 0),
-        opinion_semantic=result.get("opinion_semantic"),
-        opinion_perplexity=result.get("opinion_perplexity"),
-        opinion_burstiness=result.get("opinion_burstiness"),
-        opinion_humanity=result.get("opinion_humanity"),
-        citation_percentage=result.get("citation_percentage"),
-        ai_source=result.get("ai_source")
+    async def run_scan(on_progress):
+        return await run_upload_scan(detector, file.filename, content, current_user, force_full, on_progress=on_progress)
+
+    return await stream_scan(run_scan, current_user, background_tasks, stored_label=file.filename,
+                             stream_format=stream_format)
+
+SUPPORTED_EXTENSIONS = ("pdf", "docx", "txt")
+
+async def read_batch_uploads(files: List[UploadFile]) -> list[tuple[str, bytes]]:
+    """(filename, content) for every uploaded document; ZIP archives are expanded into their members."""
+    max_bytes = settings.BATCH_MAX_UPLOAD_MB * 1024 * 1024
+    documents, total = [], 0
+
+    def check_limits(size: int):
+        nonlocal total
+        total += size
+        if total > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Total ukuran berkas melebihi batas {settings.BATCH_MAX_UPLOAD_MB} MB.")
+        if len(documents) >= settings.BATCH_MAX_FILES:
+            raise HTTPException(status_code=400, detail=f"Maksimal {settings.BATCH_MAX_FILES} berkas per pemindaian massal.")
+
+    for file in files:
+        content = await file.read()
+        if not file.filename.lower().endswith(".zip"):
+            check_limits(len(content))
+            documents.append((file.filename, content))
+            continue
+        try:
+            archive = zipfile.ZipFile(io.BytesIO(content))
+        except zipfile.BadZipFile:
+            raise HTTPException(status_code=400, detail=f"Berkas ZIP tidak valid: {file.filename}")
+        with archive:
+            for info in archive.infolist():
+                name = info.filename
+                if info.is_dir() or name.startswith("__MACOSX/") or os.path.basename(name).startswith("."):
+                    continue  # Folders and OS metadata, not submissions
+                # Declared sizes are checked before decompressing anything (zip bombs)
+                check_limits(info.file_size)
+                documents.append((name, archive.read(info)))
+
+    if not documents:
+        raise HTTPException(status_code=400, detail="Tidak ada berkas yang dapat dipindai.")
+    return documents
+
+async def extract_batch_texts(documents: list[tuple[str, bytes]]) -> list[tuple[Optional[str], Optional[str]]]:
+    """(text, error) per document, extracted in parallel on worker threads (at most BATCH_EXTRACT_WORKERS at once)."""
+    limit = asyncio.Semaphore(max(1, settings.BATCH_EXTRACT_WORKERS))
+
+    async def extract(filename: str, content: bytes):
+        if filename.rsplit(".", 1)[-1].lower() not in SUPPORTED_EXTENSIONS:
+            return None, "Format berkas tidak didukung (gunakan PDF, DOCX, atau TXT)."
+        async with limit:
+            try:
+                text = await asyncio.to_thread(doc_processor.process_file, filename, content)
+            except ValueError as e:
+                return None, str(e)
+        if not text.strip():
+            return None, "Gagal mengekstrak teks dari berkas."
+        return text, None
+
+    return await asyncio.gather(*(extract(filename, content) for filename, content in documents))
+
+@app.post("/analyze-batch", response_model=schemas.BatchScanResponse)
+async def analyze_batch(
+    background_tasks: BackgroundTasks,
+    files: List[UploadFile] = File(...),
+    db: Session = Depends(database.get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Bulk scan for institutions: a ZIP archive and/or several PDF/DOCX/TXT files in one request.
+    Documents are analyzed side by side so their sentences share model batches, all ScanResults are
+    written in one transaction, and the response is a per-file summary (open each scan via /report/{id}).
+    """
+    if current_user.role not in ["pro", "admin"]:
+        raise HTTPException(status_code=403, detail="Pemindaian massal hanya tersedia untuk akun Pro dan Admin.")
+
+    started = time.perf_counter()
+    documents = await read_batch_uploads(files)
+    extracted = await extract_batch_texts(documents)
+
+    summaries = [schemas.BatchFileResult(filename=filename, status="failed") for filename, _ in documents]
+    pending = []  # (document index, text, sha256, language hints) of the documents that passed extraction and the guards
+    for i, (text, error) in enumerate(extracted):
+        if error is None:
+            try:
+                language_hints = check_scan_allowed(text, current_user, source_label="File ini")
+            except HTTPException as e:
+                error = e.detail
+        if error is not None:
+            summaries[i].error = error
+            continue
+        pending.append((i, text, hashlib.sha256(text.encode()).hexdigest(), language_hints))
+
+    # Each document is one call on the shared inference pool, at most BATCH_SCAN_CONCURRENCY at a time, so a
+    # batch never runs more model passes than INFERENCE_MAX_WORKERS allows. The request is shed with 503 only
+    # when the pool is full before the first document starts; later documents wait for a free slot, so a
+    # burst of other traffic never throws away the documents already analyzed
+    detector = await get_detector()
+    slots = asyncio.Semaphore(max(1, settings.BATCH_SCAN_CONCURRENCY))
+
+    async def analyze_document(i: int, text: str, text_hash: str, language_hints: dict, submitted=None):
+        async with slots:
+            try:
+                if submitted is not None:
+                    return await asyncio.wrap_future(submitted)
+                return await inference_executor.run_when_free(
+                    detector.analyze, text, force_full_scan=True, text_hash=text_hash, language_hints=language_hints
+                )
+            except Exception as e:
+                logging.error(f"Bulk analysis failed for {documents[i][0]}: {e}")
+                return None
+
+    results = []
+    if pending:
+        _, text, text_hash, language_hints = pending[0]
+        try:
+            first = inference_executor.submit(detector.analyze, text, force_full_scan=True, text_hash=text_hash,
+                                              language_hints=language_hints)
+        except InferenceBusyError as e:
+            raise inference_busy(e)
+        results = await asyncio.gather(
+            analyze_document(*pending[0], submitted=first), *(analyze_document(*item) for item in pending[1:])
+        )
+
+    # One transaction for the whole batch
+    saved = []
+    for (i, _, text_hash, _), result in zip(pending, results):
+        if result is None:
+            summaries[i].error = "Analisis berkas gagal. Silakan pindai ulang berkas ini."
+            continue
+        saved.append((i, result, build_scan_record(current_user, result, text_hash, stored_label=documents[i][0])))
+    if saved:
+        db.add_all([record for _, _, record in saved])
+        db.flush()
+        for i, result, record in saved:
+            summaries[i].status = "done"
+            summaries[i].scan_id = record.id
+            summaries[i].ai_probability = result["ai_probability"]
+            summaries[i].verdict = result["status"]
+            summaries[i].sentence_count = len(result.get("sentences", []))
+        db.commit()
+        background_tasks.add_task(purge_sensitive_data, db)
+        background_tasks.add_task(expire_old_history, db, 7)
+
+    succeeded = sum(1 for summary in summaries if summary.status == "done")
+    return schemas.BatchScanResponse(
+        total=len(summaries),
+        succeeded=succeeded,
+        failed=len(summaries) - succeeded,
+        elapsed_seconds=round(time.perf_counter() - started, 2),
+        files=summaries
     )
-    db.add(db_result)
-    db.commit()
-    db.refresh(db_result)
-    
-    # 6. Background Maintenance (Safety Net with Delay)
-    background_tasks.add_task(purge_sensitive_data, db)
-    background_tasks.add_task(expire_old_history, db, 7) # Auto-expiry
-    
-    # Convert to schema and inject sentences for initial view
-    response_data = schemas.ScanResponse.model_validate(db_result)
-    response_data.text_content = text
-    response_data.sentences = sentences
-    return response_data
+
+@app.get("/jobs/{job_id}", response_model=schemas.ScanJobResponse)
+def get_scan_job(job_id: str, db: Session = Depends(database.get_db), current_user: models.User = Depends(get_current_user)):
+    job = db.get(models.ScanJob, job_id)
+    if not job or (job.user_id != current_user.id and current_user.role != "admin"):
+        raise HTTPException(status_code=404, detail="Pekerjaan pemindaian tidak ditemukan.")
+
+    response = schemas.ScanJobResponse.model_validate(job)
+    if job.scan_id is not None:
+        scan = db.get(models.ScanResult, job.scan_id)
+        if scan is not None:
+            response.result = schemas.ScanResponse.model_validate(scan)
+    return response
 
 @app.get("/report/{scan_id}")
 async def generate_report(
@@ -569,6 +993,39 @@ async def check_gateway_health():
 async def health_check():
     return {"status": "healthy"}
 
+def _check_database() -> bool:
+    try:
+        with database.engine.connect() as conn:
+            conn.execute(sql_text("SELECT 1"))
+        return True
+    except Exception as e:
+        logging.error(f"Readiness: database unreachable: {e}")
+        return False
+
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness probe for the load balancer / systemd: 200 only when the model is loaded,
+    the warm-up pass has run and the database answers; 503 otherwise.
+    Unlike /health (liveness), this never triggers or waits for a model load.
+    """
+    model = detector_provider.status()
+    detector = detector_provider.detector
+    if isinstance(detector, RemoteDetector):
+        # The model lives in the model server; ask it rather than trusting the local client object
+        try:
+            remote = await asyncio.to_thread(detector.ping)
+            model["warmed_up"] = remote.get("warmed_up", False)
+        except ModelServerError as e:
+            model.update(model_loaded=False, warmed_up=False, error=str(e))
+
+    db_ok = await asyncio.to_thread(_check_database)
+    ready = model["model_loaded"] and (model["warmed_up"] or not settings.MODEL_WARMUP_ENABLED) and db_ok
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "model": model, "database": db_ok, "inference": inference_executor.stats()}
+    )
+
 # --- ADMIN ENDPOINTS ---
 
 @app.get("/admin/users", response_model=List[schemas.UserResponse])
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, JSON, ForeignKey, LargeBinary
 from sqlalchemy.orm import relationship
 from database import Base
 import datetime
@@ -47,6 +47,25 @@ class ScanResult(Base):
 
     owner = relationship("User", back_populates="scans")
 
+class ScanJob(Base):
+    __tablename__ = "scan_jobs"
+
+    id = Column(String, primary_key=True, index=True) # UUID4, returned to the client
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    status = Column(String, default="queued", index=True) # queued, running, done, failed
+    filename = Column(String)
+    payload = Column(LargeBinary, nullable=True) # Uploaded file; wiped as soon as the job finishes (Zero-Retention)
+    force_full_scan = Column(Integer, default=0)
+    attempts = Column(Integer, default=0)
+    worker_id = Column(String, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    error = Column(String, nullable=True)
+    error_status = Column(Integer, nullable=True) # HTTP status the synchronous endpoint would have returned
+    scan_id = Column(Integer, ForeignKey("scan_results.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
 class Transaction(Base):
     __tablename__ = "transactions"
 
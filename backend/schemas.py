@@ -74,6 +74,37 @@ class ScanResponse(ScanBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+class ScanJobResponse(BaseModel):
+    id: str
+    status: str
+    filename: Optional[str] = None
+    attempts: int = 0
+    error: Optional[str] = None
+    error_status: Optional[int] = None
+    scan_id: Optional[int] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[ScanResponse] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class BatchFileResult(BaseModel):
+    filename: str
+    status: str  # "done" or "failed"
+    scan_id: Optional[int] = None
+    ai_probability: Optional[float] = None
+    verdict: Optional[str] = None
+    sentence_count: Optional[int] = None
+    error: Optional[str] = None
+
+class BatchScanResponse(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    elapsed_seconds: float
+    files: List[BatchFileResult]
+
 class TransactionResponse(BaseModel):
     id: int
     user_id: int
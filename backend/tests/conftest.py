@@ -0,0 +1,39 @@
+import os
+import string
+import pytest
+
+@pytest.fixture(scope="session")
+def tiny_model_dir(tmp_path_factory):
+    """
+    A tiny randomly initialised BERT masked-LM + WordPiece tokenizer saved locally,
+    so detector-level tests run offline without downloading IndoBERT.
+    """
+    torch = pytest.importorskip("torch")
+    transformers = pytest.importorskip("transformers")
+
+    path = tmp_path_factory.mktemp("tiny-indobert")
+    words = (
+        "yang dan di ini itu dengan untuk dari dalam tidak adalah pada akan oleh karena juga "
+        "alat berat tambang pendidikan siswa guru sekolah penelitian data hasil the and of to is"
+    ).split()
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+    vocab += list(string.ascii_lowercase + string.digits + string.punctuation)
+    vocab += ["##" + c for c in string.ascii_lowercase + string.digits] + words
+    vocab_file = path / "vocab.txt"
+    vocab_file.write_text("\n".join(vocab))
+
+    tokenizer = transformers.BertTokenizerFast(vocab_file=str(vocab_file), do_lower_case=True)
+    tokenizer.save_pretrained(str(path))
+
+    torch.manual_seed(0)
+    config = transformers.BertConfig(
+        vocab_size=len(vocab), hidden_size=32, num_hidden_layers=2,
+        num_attention_heads=2, intermediate_size=64, max_position_embeddings=512
+    )
+    transformers.BertForMaskedLM(config).save_pretrained(str(path))
+    return str(path)
+
+@pytest.fixture(scope="session")
+def tiny_detector(tiny_model_dir):
+    from core.ai_detector import AIDetector
+    return AIDetector(model_name=tiny_model_dir)
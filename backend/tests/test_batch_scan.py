@@ -0,0 +1,141 @@
+import io
+import zipfile
+import datetime
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+import models
+import database
+from core.auth import create_access_token
+
+client = TestClient(app)
+EMAIL = "batch_test@example.com"
+ESSAY = "Penelitian ini menggunakan data dari sekolah dan guru di kota {i}. Hasilnya menunjukkan peningkatan nilai siswa."
+ENGLISH = "This research uses data collected from schools and teachers in the city. The results show that students improved."
+
+@pytest.fixture
+def batch_user():
+    db = database.SessionLocal()
+    user = models.User(
+        email=EMAIL, hashed_password="hashed_dummy", full_name="Batch Test", role="pro", daily_quota=99999,
+        pro_expires_at=datetime.datetime.utcnow() + datetime.timedelta(days=30)
+    )
+    db.add(user)
+    db.commit()
+    yield db, user, {"Authorization": f"Bearer {create_access_token(data={'sub': EMAIL})}"}
+    db.query(models.ScanResult).filter(models.ScanResult.user_id == user.id).delete()
+    db.delete(user)
+    db.commit()
+    db.close()
+
+def make_zip(members: dict) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+def test_concurrent_analyze_matches_single_analyze(tiny_detector):
+    # /analyze-batch runs documents side by side on the inference pool
+    from concurrent.futures import ThreadPoolExecutor
+    texts = [ESSAY.format(i=i) for i in range(5)]
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        batch = list(pool.map(lambda text: tiny_detector.analyze(text, force_full_scan=True), texts))
+    for text, result in zip(texts, batch):
+        single = tiny_detector.analyze(text, force_full_scan=True)
+        assert result["sentences"] == single["sentences"]
+        assert result["ai_probability"] == pytest.approx(single["ai_probability"], rel=5e-3, abs=0.5)
+
+def test_zip_batch_returns_per_file_summary_and_saves_all(batch_user):
+    db, user, headers = batch_user
+    archive = make_zip({
+        "kelas_a/andi.txt": ESSAY.format(i=1),
+        "kelas_a/budi.txt": ESSAY.format(i=2),
+        "kelas_a/english.txt": ENGLISH * 3,
+        "kelas_a/nilai.xlsx": b"not a document",
+        "__MACOSX/kelas_a/._andi.txt": b"metadata",
+    })
+    files = [("files", ("kelas_a.zip", archive, "application/zip")),
+             ("files", ("citra.txt", ESSAY.format(i=3).encode(), "text/plain"))]
+    response = client.post("/analyze-batch", files=files, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+
+    by_name = {f["filename"]: f for f in body["files"]}
+    assert set(by_name) == {"kelas_a/andi.txt", "kelas_a/budi.txt", "kelas_a/english.txt", "kelas_a/nilai.xlsx", "citra.txt"}
+    assert body["total"] == 5 and body["succeeded"] == 3 and body["failed"] == 2
+    assert by_name["kelas_a/english.txt"]["status"] == "failed" and "Bahasa Inggris" in by_name["kelas_a/english.txt"]["error"]
+    assert by_name["kelas_a/nilai.xlsx"]["error"]
+
+    done = [f for f in body["files"] if f["status"] == "done"]
+    saved = db.query(models.ScanResult).filter(models.ScanResult.user_id == user.id).all()
+    assert sorted(s.id for s in saved) == sorted(f["scan_id"] for f in done)
+    assert all(f["sentence_count"] and f["verdict"] for f in done)
+
+def test_batch_limits_and_tier(batch_user, monkeypatch):
+    db, user, headers = batch_user
+    from core.config import settings
+    monkeypatch.setattr(settings, "BATCH_MAX_FILES", 2)
+    archive = make_zip({f"{i}.txt": ESSAY.format(i=i) for i in range(3)})
+    response = client.post("/analyze-batch", files=[("files", ("kelas.zip", archive, "application/zip"))], headers=headers)
+    assert response.status_code == 400
+
+    response = client.post("/analyze-batch", files=[("files", ("rusak.zip", b"not a zip", "application/zip"))], headers=headers)
+    assert response.status_code == 400
+
+    user.role = "free"
+    db.commit()
+    response = client.post("/analyze-batch", files=[("files", ("a.txt", b"teks", "text/plain"))], headers=headers)
+    assert response.status_code == 403
+
+def test_batch_documents_share_the_inference_pool(batch_user, monkeypatch):
+    db, user, headers = batch_user
+    import main
+    from core.config import settings
+    monkeypatch.setattr(settings, "BATCH_SCAN_CONCURRENCY", 2)
+    calls = []
+    original = main.inference_executor.submit
+
+    def recording(fn, *args, **kwargs):
+        calls.append(fn.__name__)
+        return original(fn, *args, **kwargs)
+
+    monkeypatch.setattr(main.inference_executor, "submit", recording)
+    files = [("files", (f"{i}.txt", ESSAY.format(i=i).encode(), "text/plain")) for i in range(3)]
+    response = client.post("/analyze-batch", files=files, headers=headers)
+    assert response.status_code == 200 and response.json()["succeeded"] == 3
+    # One bounded pool call per document, never a nested pool of its own
+    assert calls == ["analyze"] * 3
+
+def test_batch_is_shed_when_the_inference_pool_is_full(batch_user, monkeypatch):
+    db, user, headers = batch_user
+    import main
+    from core.inference_executor import InferenceBusyError
+
+    def busy(*args, **kwargs):
+        raise InferenceBusyError("Inference queue full")
+
+    monkeypatch.setattr(main.inference_executor, "submit", busy)
+    files = [("files", ("a.txt", ESSAY.format(i=1).encode(), "text/plain"))]
+    response = client.post("/analyze-batch", files=files, headers=headers)
+    assert response.status_code == 503
+
+def test_started_batch_waits_for_a_free_slot(batch_user, monkeypatch):
+    db, user, headers = batch_user
+    import main
+    from core.inference_executor import InferenceBusyError
+    original = main.inference_executor.submit
+    submits = []
+
+    def bursty(fn, *args, **kwargs):
+        # Other traffic fills the pool right after the batch's first document started
+        submits.append(fn.__name__)
+        if len(submits) in (2, 3):
+            raise InferenceBusyError("Inference queue full")
+        return original(fn, *args, **kwargs)
+
+    monkeypatch.setattr(main.inference_executor, "submit", bursty)
+    files = [("files", (f"{i}.txt", ESSAY.format(i=i).encode(), "text/plain")) for i in range(3)]
+    response = client.post("/analyze-batch", files=files, headers=headers)
+    assert response.status_code == 200 and response.json()["succeeded"] == 3
+    assert len(submits) == 5
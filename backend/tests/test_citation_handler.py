@@ -0,0 +1,88 @@
+import random
+import pytest
+from core.citation_handler import CitationHandler
+
+def legacy_is_citation(patterns, text):
+    """The sequential rule checks CitationHandler used before the combined scanner."""
+    if (patterns["headers"].search(text) or patterns["url"].search(text) or patterns["email"].search(text) or
+            patterns["journal_metadata"].search(text) or patterns["legal_citation"].search(text)):
+        return True
+    if any(patterns["direct_quote"].finditer(text)):
+        return True
+    if (patterns["body_note"].search(text) or patterns["narrative_citation"].search(text) or
+            patterns["bracketed"].search(text) or patterns["bib_style"].search(text) or
+            patterns["bib_title"].search(text) or patterns["footnote_content"].search(text) or
+            patterns["stat_data"].search(text) or patterns["footnote_markers"].search(text)):
+        return True
+    if patterns["intro_indonesian"].search(text) and len(text.split()) < 45:
+        return True
+    return False
+
+# Regression corpus: each rule, near misses and ordinary prose
+CORPUS = [
+    "DAFTAR PUSTAKA",
+    "Bab ini merupakan pendahuluan dari penelitian.",
+    "Informasi lengkap tersedia di https://sahihaksara.id/panduan untuk pengguna.",
+    "Silakan hubungi admin@kampus.ac.id untuk bantuan.",
+    "JEMI VOL 25 No.2/Desember 2025",
+    "Hal ini diatur dalam Pasal 27 ayat (1) UUD 1945 tentang persamaan hak.",
+    'Ia berkata "pendidikan adalah senjata paling ampuh untuk mengubah dunia" di depan kelas.',
+    'Ia berkata "singkat saja" lalu pergi.',
+    "Pendidikan karakter penting bagi siswa (Sugiyono, 2019).",
+    "Metode ini populer di kalangan guru (calistung).",
+    "Temuan ini sejalan dengan penelitian sebelumnya (Hasan et al., 2020).",
+    "Hal tersebut dijelaskan oleh Sugiyono (2019, hal. 45) secara rinci.",
+    "Model ini telah banyak digunakan [1], [2, 3] dalam penelitian.",
+    "Santoso, A. B. (2018). Metodologi Penelitian Pendidikan. Jakarta: Pustaka.",
+    "Pengaruh Kualitas Pelayanan Terhadap Kepuasan Pelanggan Pada Bank Syariah Mandiri",
+    "1 Budi Santoso, Pendidikan Karakter di Sekolah, Jakarta, 2015.",
+    "Nilai R2 = 0.78 menunjukkan model yang baik.",
+    "Hasil uji ANOVA menunjukkan F hitung > 4,25 pada taraf lima persen.",
+    "Ibid. hlm 12.",
+    "Menurut para ahli, motivasi belajar dipengaruhi oleh lingkungan keluarga.",
+    "Berdasarkan hasil wawancara, guru merasa terbantu.",
+    "Sesuai pasal 5 peraturan sekolah siswa wajib hadir tepat waktu setiap hari tanpa terkecuali.",
+    " ".join(["menurut"] + ["kata"] * 50),
+    "Siswa belajar dengan tekun setiap hari di perpustakaan sekolah.",
+    "Penelitian ini menggunakan pendekatan kualitatif deskriptif.",
+    "Kesimpulan dari penelitian ini adalah motivasi berpengaruh positif.",
+    "Sebanyak 120 responden mengisi kuesioner pada tahun 2023.",
+    "Nilai rata-rata siswa naik dari 70 menjadi 85 setelah intervensi.",
+    "",
+    "(Ed.)",
+    "Lihat www.kemdikbud.go.id.",
+]
+
+FRAGMENTS = [
+    "Penelitian ini", "menurut", "Sugiyono", "(2019)", "(Hasan & Putri, 2020)", "[4]", "hal. 12", "VOL 3",
+    "Pasal 2", "R2 = 0,5", "Ibid.", "DAFTAR PUSTAKA", "siswa", "guru", "sekolah", ",", ".", "\n", "2021",
+    '"', "“", "”", "Pendidikan", "Karakter", "Bangsa", "Yang", "Unggul", "dan", "et al.", "(", ")", "@", "x.com",
+]
+
+def test_regression_corpus_matches_legacy():
+    handler = CitationHandler()
+    for text in CORPUS:
+        assert handler.is_citation(text) == legacy_is_citation(handler.patterns, text), text
+
+def test_random_fragments_match_legacy():
+    handler = CitationHandler()
+    rng = random.Random(3)
+    texts = [" ".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 30))) for _ in range(1500)]
+    rules = handler.classify_many(texts)
+    for text, rule in zip(texts, rules):
+        assert (rule is not None) == legacy_is_citation(handler.patterns, text), text
+        assert rule is None or rule in CitationHandler.RULES
+
+def test_classify_reports_the_matching_rule():
+    handler = CitationHandler()
+    assert handler.classify("Silakan hubungi admin@kampus.ac.id untuk bantuan.") == "email"
+    assert handler.classify("Pendidikan karakter penting bagi siswa (Sugiyono, 2019).") == "body_note"
+    assert handler.classify("Berdasarkan hasil wawancara, guru merasa terbantu.") == "intro_indonesian"
+    assert handler.classify("Siswa belajar dengan tekun setiap hari.") is None
+
+def test_bibliography_header_and_mask_citations():
+    handler = CitationHandler()
+    assert handler.is_bibliography_header("DAFTAR PUSTAKA")
+    assert not handler.is_bibliography_header("KESIMPULAN")
+    masked = handler.mask_citations([{"text": "Lihat www.kemdikbud.go.id."}, {"text": "Siswa belajar setiap hari."}])
+    assert [s["is_citation"] for s in masked] == [True, False]
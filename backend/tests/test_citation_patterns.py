@@ -0,0 +1,70 @@
+import re
+import time
+import random
+import pytest
+from core.citation_handler import CitationHandler
+
+# The original (backtracking-prone) forms of the rewritten patterns: decisions must stay identical
+LEGACY = {
+    "direct_quote": re.compile(r'["“][^"”]{30,}["”]', re.IGNORECASE),
+    "narrative_citation": re.compile(r'\b[\w\s\.,&]+(\set\sal\.)?,?\s\((?:\d{4}|\d+)(?:[,\s:]+(?:hal\.|p\.|hlm\.)?\s?\d+)?\)', re.UNICODE),
+    "footnote_content": re.compile(r'^\d{1,3}\s+[A-Z][a-z]+.*,.*(19|20)\d{2}.*', re.MULTILINE),
+    "email": re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+    "stat_data": re.compile(r'\b(R2|R-Square|P-Value|Sig\.|ANOVA|F\shitung|T\shitung|df|Std\.\sError)\.?\b.*[<>=]\s?\d+.*', re.IGNORECASE),
+    "bib_style": re.compile(r'^[A-Z][a-z]+,?\s[A-Z](\.\s?[A-Z]?)*,?\s?(&\s?[A-Z][a-z]+)?.*\(?\d{4}\)?', re.MULTILINE),
+    "bib_title": re.compile(r'\b[A-Z][a-z]{2,}\b(\s\b[A-Z][a-z]{1,}\b){5,}', re.UNICODE),
+}
+
+# Fuzz alphabets: the characters and fragments each pattern branches on
+TOKENS = {
+    "direct_quote": ['"', '“', '”', 'a', 'kata ', 'b' * 10, ' ', '\n'],
+    "narrative_citation": ['a', 'Budi', ' ', '.', ',', '&', '(', ')', '2019', '12', ' et al.', 'hal.', ':', '\n', 'é', '-', ' ('],
+    "footnote_content": ['1 ', '12', 'Budi', 'a', ',', '19', '20', '99', ' ', '\n', 'x', 'B'],
+    "email": ['a', 'A', '0', '_', '.', '%', '+', '-', '@', 'com', 'é', ' ', '|', 'co.id', '@x.id'],
+    "stat_data": ['df', 'R2', 'anova', 'Sig.', 'F', ' ', '\n', 'hitung', '=', '<', '>', '1', 'x', '.', 'Std.', 'Error', '-'],
+    "bib_style": ['Budi', 'B', 'C', '.', ' ', ',', '&', '\n', 'Ani', '2019', '20', 'x', '(', ')', 'a'],
+    "bib_title": ['Budi', 'Ani', 'Xy', 'x', ' ', '\n', 'Aa', 'Bbb', '.', 'É'],
+}
+
+# Inputs that made the original patterns backtrack quadratically (n = target length in characters)
+ADVERSARIAL = {
+    "words": lambda n: "kata " * (n // 5),
+    "open_paren_words": lambda n: "(" + "Kata " * (n // 5),
+    "digits_in_paren": lambda n: "(" + "1" * n,
+    "initials": lambda n: "Budi, B" + ".B" * (n // 2),
+    "footnote_commas": lambda n: "1 Budi" + " ," * (n // 2),
+    "email_runs": lambda n: "a." * (n // 2) + " x@",
+    "curly_openers": lambda n: "“a" * (n // 2),
+    "stat_keywords": lambda n: "df " * (n // 3) + "= x",
+    "title_case": lambda n: "Aaa Bb Cc Dd Ee x " * (n // 18),
+}
+
+@pytest.mark.parametrize("name", sorted(LEGACY))
+def test_rewritten_patterns_match_original_decisions(name):
+    new = CitationHandler().patterns[name]
+    rng = random.Random(name)
+    for _ in range(4000):
+        text = "".join(rng.choice(TOKENS[name]) for _ in range(rng.randint(0, 60)))
+        assert (LEGACY[name].search(text) is None) == (new.search(text) is None), repr(text)
+
+def test_worst_case_time_per_sentence_is_bounded():
+    # 20k characters: the original patterns need seconds on several of these; linear ones stay in milliseconds
+    handler = CitationHandler()
+    for label, make in ADVERSARIAL.items():
+        text = make(20000)
+        for name, pattern in handler.patterns.items():
+            start = time.perf_counter()
+            pattern.search(text)
+            elapsed = time.perf_counter() - start
+            assert elapsed < 0.1, f"{name} took {elapsed:.3f}s on {label}"
+        start = time.perf_counter()
+        handler.classify(text)
+        assert time.perf_counter() - start < 0.25, label
+
+def test_length_cap_judges_head_and_tail():
+    handler = CitationHandler(max_chars=200)
+    filler = "kata " * 200
+    assert handler.classify("Lihat www.kemdikbud.go.id " + filler) == "url"
+    assert handler.classify(filler + " admin@kampus.ac.id") == "email"
+    assert handler.classify(filler[:500] + "(Sugiyono, 2019) " + filler) is None  # Middle of a run-on block
+    assert CitationHandler().classify(filler[:500] + "(Sugiyono, 2019) " + filler) == "body_note"
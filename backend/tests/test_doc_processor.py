@@ -0,0 +1,133 @@
+import datetime
+import pytest
+import fitz
+import models
+from core.doc_processor import DocumentProcessor, DocumentLimitError
+
+PARAGRAPHS = [
+    "Penelitian ini menggunakan data dari sekolah dan guru di kota.\nHasil penelitian menunjukkan peningkatan.",
+    "Siswa belajar dengan alat peraga yang disediakan oleh sekolah.",
+    "Guru menyampaikan materi pendidikan dengan metode diskusi.\n\nData dianalisis secara deskriptif.",
+]
+
+def make_pdf(pages: int) -> bytes:
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f"Halaman {i + 1}. " + PARAGRAPHS[i % len(PARAGRAPHS)])
+    content = doc.tobytes()
+    doc.close()
+    return content
+
+def test_streamed_pages_match_the_joined_extraction():
+    content = make_pdf(5)
+    processor = DocumentProcessor()
+    pages = list(processor.iter_pages("bab1.pdf", content))
+    assert len(pages) == 5 and pages[2].startswith("Halaman 3. ")
+    assert "\n\n".join(pages) == DocumentProcessor.extract_text_from_pdf(content) == processor.process_file("bab1.pdf", content)
+    assert list(processor.iter_pages("a.txt", "Teks biasa.".encode())) == ["Teks biasa."]
+    with pytest.raises(ValueError):
+        list(processor.iter_pages("a.exe", b"x"))
+
+def test_process_pool_keeps_page_order():
+    content = make_pdf(30)
+    processor = DocumentProcessor(workers=2, parallel_min_pages=2)
+    try:
+        assert list(processor.iter_pdf_pages(content)) == list(DocumentProcessor.extract_pdf_pages(content))
+    finally:
+        processor.shutdown()
+
+def test_limits_are_checked_before_extraction():
+    content = make_pdf(4)
+    pages = DocumentProcessor(max_pages=3).iter_pages("bab1.pdf", content)
+    with pytest.raises(DocumentLimitError, match="3 halaman"):
+        next(pages)
+    with pytest.raises(DocumentLimitError):
+        DocumentProcessor(max_bytes=10).process_file("a.txt", b"Teks yang terlalu panjang.")
+    assert list(DocumentProcessor().iter_pages("rusak.pdf", b"bukan pdf")) == []
+
+def test_analyze_pages_matches_analyze_on_the_joined_text(tiny_detector):
+    pages = list(DocumentProcessor().iter_pages("bab1.pdf", make_pdf(6)))
+    streamed = tiny_detector.analyze_pages(iter(pages), force_full_scan=True)
+    whole = tiny_detector.analyze("\n\n".join(pages), force_full_scan=True)
+    assert [s["text"] for s in streamed["sentences"]] == [s["text"] for s in whole["sentences"]]
+    # Prescored pages are batched differently; dynamic int8 quantization depends slightly on batch composition
+    for a, b in zip(streamed["sentences"], whole["sentences"]):
+        assert a["score"] == pytest.approx(b["score"], rel=5e-3, abs=0.05)
+
+def test_analyze_pages_guard_sees_the_full_text_and_can_abort(tiny_detector):
+    seen = []
+
+    def guard(text):
+        seen.append(text)
+        raise ValueError("ditolak")
+
+    with pytest.raises(ValueError, match="ditolak"):
+        tiny_detector.analyze_pages(iter(["Halaman satu.", "Halaman dua."]), before_analyze=guard)
+    assert seen == ["Halaman satu.\n\nHalaman dua."]
+
+def test_early_guard_rejects_before_any_page_is_scored(tiny_detector, monkeypatch):
+    from core.page_stream import analyze_page_stream
+    scored = []
+    original = tiny_detector.prescore_page
+
+    def counting(page, force_full_scan=False, used_tokens=0):
+        scored.append(page)
+        return original(page, force_full_scan, used_tokens)
+
+    monkeypatch.setattr(tiny_detector, "prescore_page", counting)
+    pages = list(DocumentProcessor().iter_pages("bab1.pdf", make_pdf(6)))
+
+    def reject(head):
+        raise ValueError("ditolak")
+
+    with pytest.raises(ValueError, match="ditolak"):
+        analyze_page_stream(tiny_detector, iter(pages), before_prescore=reject, guard_chars=len(pages[0]) * 2)
+    assert scored == []
+
+    analyze_page_stream(tiny_detector, iter(pages), before_prescore=lambda head: None, guard_chars=len(pages[0]) * 2)
+    assert scored == pages
+
+def test_analyze_file_rejects_documents_over_the_page_limit(monkeypatch):
+    from fastapi.testclient import TestClient
+    import main
+    import database
+    from core.auth import create_access_token
+
+    monkeypatch.setattr(main.doc_processor, "max_pages", 2)
+    db = database.SessionLocal()
+    user = models.User(email="pages_test@example.com", hashed_password="x", role="pro", daily_quota=99999,
+                       pro_expires_at=datetime.datetime.utcnow() + datetime.timedelta(days=30))
+    db.add(user)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': user.email})}"}
+    try:
+        files = {"file": ("bab1.pdf", make_pdf(3), "application/pdf")}
+        response = TestClient(main.app).post("/analyze-file", files=files, headers=headers)
+        assert response.status_code == 413
+        assert "2 halaman" in response.json()["detail"]
+    finally:
+        db.delete(user)
+        db.commit()
+        db.close()
+
+def test_failed_extraction_worker_raises_instead_of_truncating(monkeypatch):
+    from concurrent.futures import Future
+    submitted = []
+
+    class FailingPool:
+        def submit(self, fn, path, start, end):
+            submitted.append((path, start, end))
+            future = Future()
+            if start == 0:
+                future.set_result(fn(path, start, end))
+            else:
+                future.set_exception(RuntimeError("worker died"))
+            return future
+
+    processor = DocumentProcessor(workers=2, parallel_min_pages=2)
+    monkeypatch.setattr(processor, "_get_pool", lambda: FailingPool())
+    pages = processor.iter_pdf_pages(make_pdf(30))
+    with pytest.raises(ValueError, match="Gagal mengekstrak"):
+        list(pages)
+    # Workers get the path of a temporary copy and a page range, never the PDF bytes
+    assert all(isinstance(path, str) for path, _, _ in submitted)
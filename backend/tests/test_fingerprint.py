@@ -0,0 +1,50 @@
+import re
+import random
+import pytest
+from core.fingerprint_analyzer import FingerprintAnalyzer, SignatureMatcher, load_signatures
+
+def legacy_identify_source(signatures, text, ai_probability):
+    """The per-pattern implementation the compiled matcher replaced."""
+    if ai_probability < 30.0:
+        return None
+    scores = {}
+    text_lower = text.lower()
+    for model, config in signatures.items():
+        match_count = 0
+        for pattern in config["keywords"]:
+            if re.search(pattern, text_lower, re.IGNORECASE):
+                match_count += 1
+        if match_count >= config["threshold"]:
+            scores[model] = match_count
+    if not scores:
+        return "Generative AI" if ai_probability >= 50 else None
+    return max(scores, key=scores.get)
+
+PHRASES = [
+    "delve", "Delve into", "comprehensive", "tapestry", "crucial", "foster", "I understand that", "Actually,",
+    "It's important to note", "however,", "Here are", "let's explore", "in summary", "key takeaway",
+    "while it is true that", "from a certain perspective", "delved", "fostering", "penelitian", "ini", "data", ".", ",",
+]
+
+def test_compiled_matcher_matches_legacy_search():
+    rng = random.Random(11)
+    signatures = load_signatures()
+    for _ in range(400):
+        text = " ".join(rng.choice(PHRASES) for _ in range(rng.randint(0, 25)))
+        probability = rng.choice([10.0, 40.0, 75.0])
+        assert FingerprintAnalyzer.identify_source(text, probability) == legacy_identify_source(signatures, text, probability)
+
+def test_overlapping_keywords_are_all_counted():
+    matcher = SignatureMatcher({
+        "A": {"keywords": [r"in summary", r"\bsummary\b", r"summary of"], "threshold": 1},
+        "B": {"keywords": [r"mary"], "threshold": 1},
+    })
+    assert matcher.hits("IN SUMMARY OF the results") == {"A": 3, "B": 1}
+    assert matcher.hits("nothing here") == {}
+
+def test_register_adds_a_model(monkeypatch):
+    monkeypatch.setattr(FingerprintAnalyzer, "AI_SIGNATURES", FingerprintAnalyzer.AI_SIGNATURES)
+    monkeypatch.setattr(FingerprintAnalyzer, "MATCHER", FingerprintAnalyzer.MATCHER)
+    FingerprintAnalyzer.register("Llama (Meta)", [r"\bcertainly!", r"\bas an ai\b"], threshold=2)
+    assert FingerprintAnalyzer.identify_source("Certainly! As an AI, I can help.", 80.0) == "Llama (Meta)"
+    assert FingerprintAnalyzer.identify_source("Certainly! Here you go.", 80.0) == "Generative AI"
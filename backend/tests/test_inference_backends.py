@@ -0,0 +1,66 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+from core.ai_detector import AIDetector
+from core.inference_backends import create_backend, BACKENDS
+
+TEXTS = [
+    "Penelitian ini menggunakan data dari sekolah.",
+    "Guru dan siswa di sekolah itu adalah bagian dari penelitian yang panjang dan berat.",
+    "Alat berat di tambang.",
+]
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        create_backend("tensorrt", None, torch.device("cpu"))
+    assert set(BACKENDS) == {"eager", "torchscript", "onnx"}
+
+def test_torchscript_matches_eager(tiny_model_dir, tiny_detector, tmp_path):
+    scripted = AIDetector(model_name=tiny_model_dir, backend="torchscript", cache_dir=str(tmp_path))
+    eager = tiny_detector.calculate_features_batch(TEXTS, batch_size=8)
+    traced = scripted.calculate_features_batch(TEXTS, batch_size=8)
+    for a, b in zip(eager, traced):
+        assert b["loss"] == pytest.approx(a["loss"], abs=1e-5)
+        assert b["confidence"] == pytest.approx(a["confidence"], abs=1e-6)
+    assert scripted.model_version.endswith("+torchscript")
+
+def test_onnx_int8_close_to_eager(tiny_model_dir, tiny_detector, tmp_path):
+    pytest.importorskip("onnxruntime")
+    onnx = AIDetector(model_name=tiny_model_dir, backend="onnx", cache_dir=str(tmp_path))
+    eager = tiny_detector.calculate_features_batch(TEXTS, batch_size=8, token_budget=512)
+    exported = onnx.calculate_features_batch(TEXTS, batch_size=8, token_budget=512)
+    # Both paths are int8 but quantize activations differently: agreement within 1%
+    for a, b in zip(eager, exported):
+        assert b["loss"] == pytest.approx(a["loss"], rel=1e-2)
+        assert b["confidence"] == pytest.approx(a["confidence"], rel=1e-2)
+    # Export is reused on the next start
+    assert (tmp_path / "onnx").exists()
+
+def test_onnx_keeps_inputs_on_cpu_on_accelerator_hosts(tiny_model_dir, tmp_path, monkeypatch):
+    pytest.importorskip("onnxruntime")
+    monkeypatch.setattr(torch.cuda, "is_available", lambda: True)
+    onnx = AIDetector(model_name=tiny_model_dir, backend="onnx", cache_dir=str(tmp_path))
+    assert onnx.device.type == "cpu"
+    assert len(onnx.calculate_features_batch(TEXTS, batch_size=8, token_budget=512)) == len(TEXTS)
+
+def test_onnx_export_is_rebuilt_when_stale_or_corrupted(tiny_model_dir, tmp_path):
+    pytest.importorskip("onnxruntime")
+    import json
+    from transformers import AutoModelForMaskedLM
+    model = AutoModelForMaskedLM.from_pretrained(tiny_model_dir)
+    export_dir = tmp_path / "onnx"
+    create_backend("onnx", model, torch.device("cpu"), export_dir=str(export_dir), model_name=tiny_model_dir)
+    manifest = json.loads((export_dir / "manifest.json").read_text())
+    assert manifest["model_name"] == tiny_model_dir and manifest["quantize"] is True
+
+    # Valid export: reused as is
+    create_backend("onnx", model, torch.device("cpu"), export_dir=str(export_dir), model_name=tiny_model_dir)
+    assert json.loads((export_dir / "manifest.json").read_text())["created_at"] == manifest["created_at"]
+
+    # Another model under the same directory, then a corrupted graph: both re-export
+    create_backend("onnx", model, torch.device("cpu"), export_dir=str(export_dir), model_name="other/model")
+    assert json.loads((export_dir / "manifest.json").read_text())["model_name"] == "other/model"
+    (export_dir / "model.int8.onnx").write_bytes(b"corrupt")
+    backend = create_backend("onnx", model, torch.device("cpu"), export_dir=str(export_dir), model_name="other/model")
+    ids = torch.tensor([[2, 40, 41, 3]])
+    assert backend.logits(ids, torch.ones_like(ids)).shape[:2] == (1, 4)
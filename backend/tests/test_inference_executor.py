@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+import pytest
+from core.inference_executor import InferenceExecutor, InferenceBusyError, BoundedDetector
+
+def test_run_returns_result_off_loop():
+    executor = InferenceExecutor(max_workers=1, max_queue=0)
+    loop_thread = threading.get_ident()
+
+    def work(x, y=0):
+        return x + y, threading.get_ident()
+
+    value, worker_thread = asyncio.run(executor.run(work, 2, y=3))
+    assert value == 5
+    assert worker_thread != loop_thread
+    executor.shutdown()
+
+def test_event_loop_stays_responsive_during_inference():
+    executor = InferenceExecutor(max_workers=1, max_queue=0)
+
+    async def scenario():
+        slow = asyncio.create_task(executor.run(time.sleep, 0.5))
+        await asyncio.sleep(0.01)
+        # A cheap coroutine must complete long before the slow job finishes
+        start = time.perf_counter()
+        await asyncio.sleep(0)
+        cheap_latency = time.perf_counter() - start
+        await slow
+        return cheap_latency
+
+    assert asyncio.run(scenario()) < 0.1
+    executor.shutdown()
+
+def test_queue_cap_raises_busy():
+    executor = InferenceExecutor(max_workers=1, max_queue=1)
+    gate = threading.Event()
+
+    async def scenario():
+        first = asyncio.create_task(executor.run(gate.wait))
+        second = asyncio.create_task(executor.run(gate.wait))
+        await asyncio.sleep(0.05)
+        assert executor.stats()["running"] == 1
+        assert executor.stats()["queued"] == 1
+
+        with pytest.raises(InferenceBusyError):
+            await executor.run(gate.wait)
+
+        gate.set()
+        await asyncio.gather(first, second)
+
+    asyncio.run(scenario())
+    stats = executor.stats()
+    assert stats["rejected"] == 1
+    assert stats["running"] == 0 and stats["queued"] == 0
+    executor.shutdown()
+
+def test_slot_released_after_failure():
+    executor = InferenceExecutor(max_workers=1, max_queue=0)
+
+    def boom():
+        raise RuntimeError("model crashed")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(executor.run(boom))
+    # Capacity must be available again
+    assert asyncio.run(executor.run(lambda: "ok")) == "ok"
+    executor.shutdown()
+
+def test_run_when_free_waits_for_a_slot():
+    executor = InferenceExecutor(max_workers=1, max_queue=0)
+    gate = threading.Event()
+
+    async def scenario():
+        first = asyncio.create_task(executor.run(gate.wait))
+        await asyncio.sleep(0.02)
+        with pytest.raises(InferenceBusyError):
+            await executor.run(lambda: 1)
+        waiting = asyncio.create_task(executor.run_when_free(lambda: 2, poll_interval=0.01))
+        await asyncio.sleep(0.05)
+        assert not waiting.done()
+        gate.set()
+        await first
+        return await waiting
+
+    assert asyncio.run(scenario()) == 2
+    executor.shutdown()
+
+def test_bounded_detector_runs_only_model_calls_on_the_pool():
+    executor = InferenceExecutor(max_workers=1, max_queue=0)
+    threads = {}
+
+    class Detector:
+        def prescore_page(self, page, force_full_scan=False, used_tokens=0):
+            threads.setdefault("prescore", threading.current_thread().name)
+            return {page: {"loss": 1.0}}, used_tokens + 1, False
+
+        def analyze(self, text, **kwargs):
+            threads["analyze"] = threading.current_thread().name
+            return {"features": kwargs["features"]}
+
+    def pages():
+        threads["extract"] = threading.current_thread().name
+        yield from ["satu", "dua"]
+
+    from core.page_stream import analyze_page_stream
+    bounded = BoundedDetector(Detector(), executor)
+    result = analyze_page_stream(bounded, pages(), before_prescore=lambda head: None, guard_chars=1)
+    assert sorted(result["features"]) == ["dua", "satu"]
+    assert threads["prescore"].startswith("inference") and threads["analyze"].startswith("inference")
+    assert not threads["extract"].startswith("inference")
+
+    # A full pool skips prescoring instead of failing the upload; analyze() itself still sheds
+    gate = threading.Event()
+    executor.submit(gate.wait)
+    assert bounded.prescore_page("tiga") == ({}, 0, True)
+    with pytest.raises(InferenceBusyError):
+        bounded.analyze("tiga")
+    gate.set()
+    executor.shutdown()
@@ -0,0 +1,239 @@
+import datetime
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+import models
+from database import Base
+from core.job_queue import ScanJobQueue, JobLimitError, JobFailed, JobDeferred
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, autoflush=False)
+    db = factory()
+    db.add_all([models.User(id=1, email="a@example.com", hashed_password="x"),
+                models.User(id=2, email="b@example.com", hashed_password="x")])
+    db.commit()
+    db.close()
+    return factory
+
+def make_queue(session_factory, handler, **kwargs):
+    return ScanJobQueue(session_factory, handler, lease_seconds=60, **kwargs)
+
+def job_state(session_factory, job_id):
+    db = session_factory()
+    try:
+        return db.get(models.ScanJob, job_id)
+    finally:
+        db.close()
+
+def test_job_runs_to_completion_and_wipes_payload(session_factory):
+    seen = []
+
+    def handler(db, job):
+        seen.append(job.payload)
+        return 42
+
+    queue = make_queue(session_factory, handler)
+    db = session_factory()
+    job = queue.enqueue(db, 1, "skripsi.pdf", b"%PDF-bytes", force_full_scan=True)
+    db.close()
+
+    assert queue.run_once() is True
+    assert queue.run_once() is False
+    done = job_state(session_factory, job.id)
+    assert seen == [b"%PDF-bytes"]
+    assert done.status == "done" and done.scan_id == 42 and done.attempts == 1
+    assert done.payload is None and done.finished_at is not None
+
+def test_transient_errors_are_retried_then_failed(session_factory):
+    calls = []
+
+    def flaky(db, job):
+        calls.append(job.attempts)
+        raise RuntimeError("model server restarted")
+
+    queue = make_queue(session_factory, flaky, max_attempts=3)
+    db = session_factory()
+    job = queue.enqueue(db, 1, "a.docx", b"data")
+    db.close()
+
+    while queue.run_once():
+        pass
+    failed = job_state(session_factory, job.id)
+    assert calls == [1, 2, 3]
+    assert failed.status == "failed" and failed.error_status == 500 and failed.payload is None
+
+def test_permanent_failures_are_not_retried(session_factory):
+    def reject(db, job):
+        raise JobFailed("Batas gratis 800 kata terlampaui", 403)
+
+    queue = make_queue(session_factory, reject)
+    db = session_factory()
+    job = queue.enqueue(db, 1, "a.docx", b"data")
+    db.close()
+
+    queue.run_once()
+    failed = job_state(session_factory, job.id)
+    assert failed.status == "failed" and failed.attempts == 1
+    assert failed.error_status == 403 and "800 kata" in failed.error
+
+def test_crashed_worker_jobs_are_requeued(session_factory):
+    queue = make_queue(session_factory, lambda db, job: 7, max_attempts=2)
+    db = session_factory()
+    job_id = queue.enqueue(db, 1, "a.pdf", b"data").id
+    assert queue.claim(db) == job_id
+
+    # Simulate a worker that died mid-scan: its heartbeat goes stale
+    stale = datetime.datetime.utcnow() - datetime.timedelta(seconds=120)
+    db.query(models.ScanJob).update({"heartbeat_at": stale})
+    db.commit()
+    assert queue.requeue_stale(db) == 1
+    assert job_state(session_factory, job_id).status == "queued"
+
+    # Second crash exhausts the attempts
+    assert queue.claim(db) == job_id
+    db.query(models.ScanJob).update({"heartbeat_at": stale})
+    db.commit()
+    queue.requeue_stale(db)
+    db.close()
+    assert job_state(session_factory, job_id).status == "failed"
+
+def test_per_user_limits(session_factory):
+    queue = make_queue(session_factory, lambda db, job: 1, max_active_per_user=2, max_running_per_user=1)
+    db = session_factory()
+    first = queue.enqueue(db, 1, "1.pdf", b"1").id
+    second = queue.enqueue(db, 1, "2.pdf", b"2").id
+    with pytest.raises(JobLimitError):
+        queue.enqueue(db, 1, "3.pdf", b"3")
+    other = queue.enqueue(db, 2, "b.pdf", b"b").id
+
+    # User 1 already has a running job: the next claim goes to user 2 instead of user 1's second job
+    assert queue.claim(db) == first
+    assert queue.claim(db) == other
+    assert queue.claim(db) is None
+    db.close()
+    assert job_state(session_factory, second).status == "queued"
+
+def test_running_limit_is_rechecked_in_the_claim_update(session_factory):
+    worker_a = make_queue(session_factory, lambda db, job: 1, max_running_per_user=1)
+    worker_b = make_queue(session_factory, lambda db, job: 1, max_running_per_user=1)
+    db = session_factory()
+    first = worker_a.enqueue(db, 1, "1.pdf", b"1").id
+    second = worker_a.enqueue(db, 1, "2.pdf", b"2").id
+
+    # Another worker process claims user 1's first job after worker A has read its candidates
+    other_db = session_factory()
+    real_now = worker_a._now
+
+    def racing_now():
+        worker_a._now = real_now
+        assert worker_b.claim(other_db) == first
+        return real_now()
+
+    worker_a._now = racing_now
+    assert worker_a.claim(db) is None
+    db.close()
+    other_db.close()
+    assert job_state(session_factory, second).status == "queued"
+
+def test_deferred_jobs_do_not_use_up_attempts(session_factory):
+    calls = []
+
+    def loading(db, job):
+        calls.append(job.attempts)
+        if len(calls) < 3:
+            raise JobDeferred("Model is still loading")
+        return 5
+
+    queue = make_queue(session_factory, loading, max_attempts=1)
+    db = session_factory()
+    job = queue.enqueue(db, 1, "a.docx", b"data")
+    db.close()
+
+    while queue.run_once():
+        pass
+    done = job_state(session_factory, job.id)
+    assert calls == [1, 1, 1]
+    assert done.status == "done" and done.scan_id == 5 and done.attempts == 1
+
+def test_finished_jobs_expire(session_factory):
+    queue = make_queue(session_factory, lambda db, job: 1, retention_hours=24)
+    db = session_factory()
+    queue.enqueue(db, 1, "a.pdf", b"a")
+    db.close()
+    queue.run_once()
+
+    db = session_factory()
+    db.query(models.ScanJob).update({"finished_at": datetime.datetime.utcnow() - datetime.timedelta(hours=25)})
+    db.commit()
+    assert queue.purge_finished(db) == 1
+    db.close()
+
+def test_async_file_scan_endpoint_returns_job_and_polls_result(monkeypatch):
+    from fastapi.testclient import TestClient
+    import main
+    import database
+    from core.auth import create_access_token
+
+    db = database.SessionLocal()
+    user = models.User(email="jobs_test@example.com", hashed_password="x", role="pro", daily_quota=99999,
+                       pro_expires_at=datetime.datetime.utcnow() + datetime.timedelta(days=30))
+    db.add(user)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': user.email})}"}
+    client = TestClient(main.app)
+    submitted = []
+    submit = main.inference_executor.submit
+
+    def record_submit(fn, *args, **kwargs):
+        submitted.append(fn.__name__)
+        return submit(fn, *args, **kwargs)
+
+    monkeypatch.setattr(main.inference_executor, "submit", record_submit)
+    try:
+        files = {"file": ("bab1.txt", b"Penelitian ini menggunakan data dari sekolah dan guru di kota.", "text/plain")}
+        response = client.post("/analyze-file?async_mode=true", files=files, headers=headers)
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        assert client.get(f"/jobs/{job_id}", headers=headers).json()["status"] == "queued"
+
+        assert main.job_queue.run_once() is True
+        assert submitted == ["analyze"]  # The job's model call went through the bounded pool
+        body = client.get(f"/jobs/{job_id}", headers=headers).json()
+        assert body["status"] == "done"
+        assert body["result"]["id"] == body["scan_id"] and body["result"]["sentences"]
+        assert client.get("/jobs/not-a-job", headers=headers).status_code == 404
+    finally:
+        db.query(models.ScanJob).filter(models.ScanJob.user_id == user.id).delete()
+        db.query(models.ScanResult).filter(models.ScanResult.user_id == user.id).delete()
+        db.delete(user)
+        db.commit()
+        db.close()
+
+def test_async_file_scan_rejects_bad_uploads_before_queueing(monkeypatch):
+    from fastapi.testclient import TestClient
+    import main
+    import database
+    from core.auth import create_access_token
+
+    db = database.SessionLocal()
+    user = models.User(email="jobs_reject_test@example.com", hashed_password="x", role="pro", daily_quota=99999,
+                       pro_expires_at=datetime.datetime.utcnow() + datetime.timedelta(days=30))
+    db.add(user)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': user.email})}"}
+    client = TestClient(main.app)
+    try:
+        files = {"file": ("skripsi.exe", b"MZ", "application/octet-stream")}
+        assert client.post("/analyze-file?async_mode=true", files=files, headers=headers).status_code == 400
+
+        monkeypatch.setattr(main.doc_processor, "max_bytes", 16)
+        files = {"file": ("bab1.txt", b"Penelitian ini menggunakan data dari sekolah.", "text/plain")}
+        assert client.post("/analyze-file?async_mode=true", files=files, headers=headers).status_code == 413
+        assert db.query(models.ScanJob).filter(models.ScanJob.user_id == user.id).count() == 0
+    finally:
+        db.delete(user)
+        db.commit()
+        db.close()
@@ -0,0 +1,77 @@
+from langdetect import detect, DetectorFactory
+from core.language_id import LanguageIdentifier, STOPWORD_CONFIDENCE
+
+DetectorFactory.seed = 0
+
+INDONESIAN = [
+    "Penelitian ini menggunakan metode kualitatif deskriptif dengan pendekatan studi kasus.",
+    "Hasil analisis menunjukkan hubungan signifikan antar variabel penelitian.",
+    "Machine learning digunakan untuk klasifikasi teks akademik mahasiswa.",
+    "Peneliti mengumpulkan data melalui kuesioner daring kepada responden.",
+    "Kurikulum Merdeka memberikan keleluasaan kepada guru dalam menyusun pembelajaran.",
+]
+ENGLISH = [
+    "Machine learning models are increasingly used to generate academic text.",
+    "Furthermore, it is important to note that this approach has limitations.",
+    "Deep learning transformer architecture attention mechanism",
+    "Social media usage among students increased during the pandemic period.",
+    "Data were collected through questionnaires distributed to respondents.",
+]
+
+def test_agrees_with_langdetect_on_english_flag():
+    identifier = LanguageIdentifier()
+    for text, lang in zip(INDONESIAN + ENGLISH, identifier.detect_many(INDONESIAN + ENGLISH)):
+        assert (lang == "en") == (detect(text) == "en"), text
+    assert identifier.detect_many(ENGLISH) == ["en"] * len(ENGLISH)
+    assert "en" not in identifier.detect_many(INDONESIAN)
+
+def test_stopword_short_circuit_skips_the_model():
+    identifier = LanguageIdentifier()
+    assert identifier.classify_many([INDONESIAN[0], ENGLISH[1]]) == [("id", STOPWORD_CONFIDENCE), ("en", STOPWORD_CONFIDENCE)]
+    assert identifier._index is None  # n-gram profiles never loaded
+
+    lang, confidence = identifier.classify_many([ENGLISH[2]])[0]  # no stopwords -> n-gram model
+    assert lang == "en" and 0.5 < confidence <= 1.0
+    assert identifier._index is not None
+
+def test_results_are_cached_by_digest():
+    identifier = LanguageIdentifier()
+    first = identifier.detect_many(ENGLISH + ENGLISH)
+    assert first == ["en"] * (2 * len(ENGLISH))
+    assert len(identifier.cache) == len(ENGLISH)  # repeats inside a batch are scored once
+    hits = identifier.cache.hits
+    assert identifier.detect_many(ENGLISH) == first[:len(ENGLISH)]
+    assert identifier.cache.hits - hits == len(ENGLISH)
+    assert all(text not in key for key in identifier.cache._data for text in ENGLISH)
+
+def test_undecidable_text():
+    identifier = LanguageIdentifier()
+    assert identifier.detect_many(["", "12345 67,8 %", "ABC DEF"]) == [None, None, None]
+
+def test_sample_sentences_spread_over_the_document():
+    text = " ".join(f"Kalimat nomor {i} membahas hasil penelitian ini." for i in range(2000))
+    samples = LanguageIdentifier.sample_sentences(text, 10)
+    assert len(samples) == 10
+    numbers = [int(s.split()[2]) for s in samples]
+    assert numbers == sorted(numbers) and numbers[0] == 0 and numbers[-1] > 1700
+    assert LanguageIdentifier.sample_sentences("Terlalu pendek.", 10) == []
+
+def test_assess_document_uses_confidence_threshold():
+    identifier = LanguageIdentifier()
+    english = identifier.assess_document(" ".join(ENGLISH * 4), samples=8)
+    assert english["language"] == "en" and english["confidence"] >= 0.6
+    indonesian = identifier.assess_document(" ".join(INDONESIAN * 4), samples=8)
+    assert indonesian["language"] == "id"
+    # Half English, half Indonesian: no confident verdict, so the guard lets it through
+    mixed = identifier.assess_document(" ".join(ENGLISH * 4 + INDONESIAN * 4), samples=8)
+    assert mixed["language"] is None and 0.0 < mixed["confidence"] < 0.6
+    assert {lang for lang, _ in mixed["hints"].values()} == {"en", "id"}
+
+def test_analyze_reuses_guard_labels(tiny_detector):
+    text = " ".join(INDONESIAN)
+    sampled = LanguageIdentifier.sample_sentences(text, 5)
+    assert LanguageIdentifier.key(sampled[1]) in LanguageIdentifier().assess_document(text, samples=5)["hints"]
+    hints = {LanguageIdentifier.key(sampled[1]): ("en", 0.99)}  # deliberately wrong, to see it is used
+    sentences = tiny_detector.analyze(text, force_full_scan=True, language_hints=hints)["sentences"]
+    flagged = [s["text"] for s in sentences if s.get("language") == "en"]
+    assert flagged == [sampled[1]]
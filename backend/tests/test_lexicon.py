@@ -0,0 +1,33 @@
+import re
+import random
+from core.lexicon import Lexicon
+from core.ai_detector import AIDetector
+
+def legacy_count(terms, text):
+    return sum(1 for m in terms if re.search(r'\b' + m + r'\b', text.lower()))
+
+def random_text(rng, vocabulary, n_words):
+    words = [rng.choice(vocabulary) for _ in range(n_words)]
+    return " ".join(w.upper() if rng.random() < 0.1 else w for w in words)
+
+def test_naturalness_lexicon_matches_per_marker_search():
+    rng = random.Random(7)
+    filler = ["penelitian", "ini", "data", "siswa", "analisanya", "masihkah", "mana-mana", "oleh", "karena", "itu", "lain", "di", "sisi", ",", "."]
+    vocabulary = filler + AIDetector.HUMAN_MARKERS + AIDetector.AI_HALLMARKS
+    lexicon = AIDetector.NATURALNESS_LEXICON
+    for _ in range(300):
+        text = random_text(rng, vocabulary, rng.randint(0, 60))
+        counts = lexicon.count(text)
+        assert counts["human"] == legacy_count(AIDetector.HUMAN_MARKERS, text)
+        assert counts["ai"] == legacy_count(AIDetector.AI_HALLMARKS, text)
+
+def test_overlapping_terms_are_all_found():
+    lexicon = Lexicon({"a": ["di sisi", "di sisi lain", "oleh karena", "karena itu"], "b": ["lain", "sisi"]})
+    found = lexicon.scan("Di sisi lain, oleh karena itu hasilnya berbeda.")
+    assert found == {"a": {"di sisi", "di sisi lain", "oleh karena", "karena itu"}, "b": {"lain", "sisi"}}
+    assert lexicon.count("sisinya dilain waktu") == {"a": 0, "b": 0}
+
+def test_term_in_several_groups_and_empty_lexicon():
+    lexicon = Lexicon({"x": ["aja", "nih"], "y": ["aja"]})
+    assert lexicon.count("ya udah aja") == {"x": 1, "y": 1}
+    assert Lexicon({"x": []}).count("apa aja") == {"x": 0}
@@ -0,0 +1,45 @@
+import pytest
+
+pytest.importorskip("torch")
+
+SENTENCES = [
+    "Penelitian ini menggunakan data dari sekolah dan guru di kota {}.",
+    "Hasil penelitian menunjukkan bahwa siswa kelas {} lebih aktif belajar.",
+    "Guru dan siswa di sekolah itu bekerja sama untuk tahun {}.",
+]
+
+def long_document(n):
+    return " ".join(SENTENCES[i % 3].format(i) for i in range(n))
+
+def test_full_scan_covers_every_sentence(tiny_detector):
+    text = long_document(400)
+    result = tiny_detector.analyze(text, force_full_scan=True)
+    assert len(result["sentences"]) == 400
+    assert not any(s.get("skipped") for s in result["sentences"])
+    assert result["partially_analyzed"] is False
+
+def test_scan_token_budget_marks_partial_analysis(tiny_detector, monkeypatch):
+    monkeypatch.setattr(tiny_detector, "scan_token_budget_full", 2000)
+    result = tiny_detector.analyze(long_document(400), force_full_scan=True)
+    skipped = [i for i, s in enumerate(result["sentences"]) if s.get("skipped")]
+    assert result["partially_analyzed"] is True
+    assert len(result["sentences"]) == 400
+    # The budget is spent in document order: the tail is what gets skipped
+    assert skipped and skipped == list(range(skipped[0], 400))
+
+def test_chunk_size_does_not_change_scores(tiny_detector, monkeypatch):
+    text = long_document(60)
+    whole = tiny_detector.analyze(text, force_full_scan=True)
+    monkeypatch.setattr(tiny_detector, "scan_chunk_size", 7)
+    chunked = tiny_detector.analyze(text, force_full_scan=True)
+    assert [s["text"] for s in chunked["sentences"]] == [s["text"] for s in whole["sentences"]]
+    # Dynamic int8 quantization depends slightly on batch composition
+    for a, b in zip(whole["sentences"], chunked["sentences"]):
+        assert a["score"] == pytest.approx(b["score"], rel=5e-3, abs=0.05)
+
+def test_hybrid_scan_samples_head_middle_tail(tiny_detector):
+    result = tiny_detector.analyze(long_document(400), force_full_scan=False)
+    scanned = [i for i, s in enumerate(result["sentences"]) if not s.get("skipped")]
+    assert result["partially_analyzed"] is True
+    assert scanned[:20] == list(range(20)) and scanned[-20:] == list(range(380, 400))
+    assert len(scanned) == 60
@@ -0,0 +1,52 @@
+import threading
+import pytest
+from core.micro_batcher import MicroBatcher
+
+class RecordingScorer:
+    def __init__(self):
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def __call__(self, texts):
+        with self.lock:
+            self.batches.append(list(texts))
+        return [{"loss": float(len(t)), "confidence": 0.5} for t in texts]
+
+def test_results_return_in_caller_order():
+    scorer = RecordingScorer()
+    batcher = MicroBatcher(scorer, max_batch_size=4, max_wait_ms=5)
+    texts = ["a", "bb", "ccc", "dddd", "eeeee", "ffffff"]
+    results = batcher.score(texts)
+    assert [r["loss"] for r in results] == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+    assert max(len(b) for b in scorer.batches) <= 4
+    batcher.stop()
+
+def test_concurrent_callers_share_batches():
+    scorer = RecordingScorer()
+    batcher = MicroBatcher(scorer, max_batch_size=64, max_wait_ms=200)
+    start = threading.Barrier(8)
+    outputs = {}
+
+    def caller(idx):
+        start.wait()
+        outputs[idx] = batcher.score([f"doc{idx}-s{j}" for j in range(3)])
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(8)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+
+    # 8 callers x 3 sentences coalesced into far fewer forward passes than 8
+    assert len(scorer.batches) < 8
+    for idx, res in outputs.items():
+        assert [r["loss"] for r in res] == [float(len(f"doc{idx}-s{j}")) for j in range(3)]
+    assert batcher.stats()["items"] == 24
+    batcher.stop()
+
+def test_scoring_error_propagates_to_callers():
+    def failing(texts):
+        raise RuntimeError("out of memory")
+
+    batcher = MicroBatcher(failing, max_batch_size=8, max_wait_ms=1)
+    with pytest.raises(RuntimeError):
+        batcher.score(["kalimat"])
+    batcher.stop()
@@ -0,0 +1,63 @@
+import threading
+import pytest
+from core.model_provider import DetectorProvider, ModelNotReadyError
+
+
+class SlowDetector:
+    def __init__(self, gate):
+        gate.wait(5)
+        self.warmups = 0
+
+    def warmup(self):
+        self.warmups += 1
+
+
+def test_load_runs_in_background_and_warms_up():
+    gate = threading.Event()
+    provider = DetectorProvider(lambda: SlowDetector(gate))
+    provider.start()
+    assert provider.detector is None
+    assert provider.status()["model_loaded"] is False
+
+    with pytest.raises(ModelNotReadyError):
+        provider.get(timeout=0.05)
+
+    gate.set()
+    detector = provider.get(timeout=5)
+    assert detector.warmups == 1
+    status = provider.status()
+    assert status["model_loaded"] and status["warmed_up"] and status["error"] is None
+
+
+def test_failed_load_is_reported_and_retried():
+    attempts = []
+
+    def factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("weights missing")
+        return object()  # No warmup() -> warm-up is skipped
+
+    provider = DetectorProvider(factory)
+    provider.start()
+    provider._thread.join(5)
+    assert "weights missing" in provider.status()["error"]
+
+    # The next request starts a fresh attempt instead of leaving the worker dead
+    assert provider.get(timeout=5) is not None
+    assert len(attempts) == 2
+    assert provider.status()["warmed_up"] is False
+
+
+def test_ready_probe_reports_model_and_database():
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+    import main
+
+    main.detector_provider.get(timeout=120)
+    response = TestClient(main.app).get("/ready")
+    body = response.json()
+    assert response.status_code == 200
+    assert body["ready"] is True
+    assert body["model"]["model_loaded"] and body["model"]["warmed_up"]
+    assert body["database"] is True
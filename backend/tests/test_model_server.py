@@ -0,0 +1,102 @@
+import os
+import tempfile
+import threading
+import time
+import pytest
+from core.model_server import ModelServer, RemoteDetector, ModelServerError
+
+AUTHKEY = b"test-secret"
+
+class EchoDetector:
+    batcher = None
+
+    def analyze(self, text, force_full_scan=False, text_hash=None, on_progress=None, language_hints=None,
+                features=None):
+        if text == "crash":
+            raise RuntimeError("forward pass failed")
+        if on_progress is not None:
+            for i, word in enumerate(text.split()):
+                on_progress({"processed": i + 1, "sentences": [{"text": word}]})
+        return {"ai_probability": float(len(text)), "full": force_full_scan, "pid": os.getpid(), "hints": language_hints,
+                "features": features}
+
+    def prescore_page(self, page, force_full_scan=False, used_tokens=0):
+        used_tokens += len(page.split())
+        return {page: {"loss": 1.0, "confidence": 0.5}}, used_tokens, used_tokens >= 4
+
+@pytest.fixture
+def server():
+    address = os.path.join(tempfile.mkdtemp(), "model.sock")
+    srv = ModelServer(EchoDetector(), address, AUTHKEY)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    for _ in range(100):
+        if os.path.exists(address):
+            break
+        time.sleep(0.01)
+    yield srv
+    srv.shutdown()
+    thread.join(2)
+
+def test_remote_analyze_round_trip(server):
+    remote = RemoteDetector(server.address, AUTHKEY)
+    result = remote.analyze("halo dunia", force_full_scan=True, language_hints={"k": ("id", 0.95)})
+    assert result["ai_probability"] == 10.0
+    assert result["full"] is True
+    assert result["hints"] == {"k": ("id", 0.95)}
+    assert remote.ping()["status"] == "ready"
+
+def test_concurrent_clients_share_server(server):
+    remote = RemoteDetector(server.address, AUTHKEY)
+    results = []
+
+    def worker(i):
+        results.append(remote.analyze("x" * i)["ai_probability"])
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(1, 9)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert sorted(results) == [float(i) for i in range(1, 9)]
+
+def test_remote_errors_are_wrapped(server):
+    remote = RemoteDetector(server.address, AUTHKEY)
+    with pytest.raises(ModelServerError, match="forward pass failed"):
+        remote.analyze("crash")
+    # Connection is still usable after a remote exception
+    assert remote.analyze("ok")["ai_probability"] == 2.0
+
+def test_unreachable_server_raises():
+    remote = RemoteDetector(os.path.join(tempfile.mkdtemp(), "missing.sock"), AUTHKEY)
+    with pytest.raises(ModelServerError):
+        remote.analyze("halo")
+
+def test_progress_events_are_streamed_before_the_result(server):
+    remote = RemoteDetector(server.address, AUTHKEY)
+    events = []
+    result = remote.analyze("satu dua tiga", on_progress=events.append)
+    assert [e["sentences"][0]["text"] for e in events] == ["satu", "dua", "tiga"]
+    assert result["ai_probability"] == 13.0
+    # The pooled connection is clean for the next, non-streaming call
+    assert remote.analyze("halo")["ai_probability"] == 4.0
+
+def test_remote_pages_are_prescored_over_the_socket_after_the_early_guard(server):
+    from core.page_stream import analyze_page_stream
+    remote = RemoteDetector(server.address, AUTHKEY)
+    pages = ["satu dua", "tiga", "empat lima", "enam"]
+    heads = []
+    result = analyze_page_stream(remote, iter(pages), before_prescore=heads.append,
+                                 before_analyze=lambda text: {"k": ("id", 0.9)}, guard_chars=10)
+    # The guard saw the first pages before anything was scored; scoring stops once the server reports
+    # the budget exhausted (4 words)
+    assert heads == ["satu dua\n\ntiga"]
+    assert sorted(result["features"]) == ["empat lima", "satu dua", "tiga"]
+    assert result["hints"] == {"k": ("id", 0.9)}
+
+    # Short documents are not prescored; they are scanned once the full-text guard passes
+    assert remote.analyze_pages(iter(pages), before_prescore=heads.append)["features"] == {}
+
+    def reject(head):
+        raise ValueError("bahasa Inggris")
+
+    with pytest.raises(ValueError, match="bahasa Inggris"):
+        analyze_page_stream(remote, iter(pages), before_prescore=reject, guard_chars=10)
@@ -0,0 +1,44 @@
+import json
+import os
+import pytest
+
+torch = pytest.importorskip("torch")
+from core.ai_detector import AIDetector
+from core.model_store import ModelArtifactStore, WEIGHTS_FILE, MANIFEST_FILE
+
+TEXTS = ["Penelitian ini menggunakan data dari sekolah.", "Guru dan siswa di sekolah itu."]
+
+def test_second_start_loads_prequantized_artifact(tiny_model_dir, tmp_path, monkeypatch):
+    first = AIDetector(model_name=tiny_model_dir, cache_dir=str(tmp_path), use_artifact_cache=True)
+    store = ModelArtifactStore(str(tmp_path), tiny_model_dir)
+    assert os.path.exists(os.path.join(store.path, WEIGHTS_FILE))
+
+    # A warm start must not touch the fp32 weights or quantize again
+    def fail(*args, **kwargs):
+        raise AssertionError("fp32 model should not be loaded on a warm start")
+
+    monkeypatch.setattr("core.ai_detector.AutoModelForMaskedLM.from_pretrained", fail)
+    monkeypatch.setattr(torch.quantization, "quantize_dynamic", fail)
+    second = AIDetector(model_name=tiny_model_dir, cache_dir=str(tmp_path), use_artifact_cache=True)
+
+    for a, b in zip(first.calculate_features_batch(TEXTS), second.calculate_features_batch(TEXTS)):
+        assert a["loss"] == pytest.approx(b["loss"], abs=1e-6)
+
+def test_corrupted_artifact_is_rejected(tiny_model_dir, tmp_path):
+    AIDetector(model_name=tiny_model_dir, cache_dir=str(tmp_path), use_artifact_cache=True)
+    store = ModelArtifactStore(str(tmp_path), tiny_model_dir)
+    with open(os.path.join(store.path, WEIGHTS_FILE), "r+b") as f:
+        f.seek(-16, os.SEEK_END)
+        f.write(b"\0" * 16)
+    assert store.load() is None
+
+def test_version_mismatch_is_rejected(tiny_model_dir, tmp_path):
+    AIDetector(model_name=tiny_model_dir, cache_dir=str(tmp_path), use_artifact_cache=True)
+    store = ModelArtifactStore(str(tmp_path), tiny_model_dir)
+    manifest_path = os.path.join(store.path, MANIFEST_FILE)
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    manifest["torch"] = "0.0.1"
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f)
+    assert store.load() is None
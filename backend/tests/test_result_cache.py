@@ -0,0 +1,92 @@
+import json
+import sqlite3
+import time
+from core.result_cache import LRUCache, ResultCache, FeatureCache
+
+SENTENCES = ["Kalimat pertama cukup panjang.", "Kalimat kedua.", "Kalimat ketiga yang diabaikan.", "Kalimat keempat."]
+RESULT = {
+    "ai_probability": 42.0,
+    "sentences": [
+        {"text": SENTENCES[0], "score": 10.0, "is_citation": False},
+        {"text": SENTENCES[1], "score": 80.0, "is_citation": True},
+        {"text": SENTENCES[3], "score": 0.0, "skipped": True, "is_citation": False},
+    ],
+}
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_items=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+def test_strip_and_rehydrate_round_trip_without_text():
+    stripped = ResultCache.strip_text(RESULT, SENTENCES)
+    assert "Kalimat" not in json.dumps(stripped)
+    assert [s["idx"] for s in stripped["sentences"]] == [0, 1, 3]
+    assert ResultCache.rehydrate(stripped, SENTENCES) == RESULT
+
+def test_key_separates_scan_modes():
+    assert ResultCache.make_key("abc", "m@1", True) != ResultCache.make_key("abc", "m@1", False)
+    assert ResultCache.make_key("abc", "m@1", True) != ResultCache.make_key("abc", "m@2", True)
+
+def test_disk_tier_survives_restart_and_expires(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    payload = ResultCache.strip_text(RESULT, SENTENCES)
+    ResultCache(disk_path=path, ttl_seconds=60).put("k", payload)
+
+    # New process-equivalent: empty memory tier, same disk file
+    assert ResultCache(disk_path=path, ttl_seconds=60).get("k") == payload
+
+    with sqlite3.connect(path) as conn:
+        stored = conn.execute("SELECT payload FROM result_cache").fetchone()[0]
+        conn.execute("UPDATE result_cache SET created_at = ?", (time.time() - 120,))
+    assert "Kalimat" not in stored
+    assert ResultCache(disk_path=path, ttl_seconds=60).get("k") is None
+
+def test_detector_serves_repeat_scan_from_cache(tiny_detector, monkeypatch):
+    monkeypatch.setattr(tiny_detector, "result_cache", ResultCache())
+    text = "Penelitian ini menggunakan data dari sekolah dan guru. Hasil penelitian itu adalah data yang berat untuk siswa."
+    first = tiny_detector.analyze(text)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("model should not run on a cache hit")
+
+    monkeypatch.setattr(tiny_detector, "score_sentences", fail)
+    assert tiny_detector.analyze(text) == first
+    assert tiny_detector.result_cache.stats()["memory"]["hits"] == 1
+
+def test_model_version_changes_with_scan_settings(tiny_model_dir, tiny_detector):
+    from core.ai_detector import AIDetector
+    for settings in ({"hybrid_sampler": "stratified"}, {"hybrid_sample_size": 30}, {"hybrid_target_ci": 3.0},
+                     {"scan_token_budget": 4096}, {"global_max_windows": 4}):
+        other = AIDetector(model_name=tiny_model_dir, **settings)
+        assert other.model_version != tiny_detector.model_version, settings
+    assert AIDetector(model_name=tiny_model_dir).model_version == tiny_detector.model_version
+
+def test_feature_cache_only_scores_changed_sentences(tiny_detector, monkeypatch):
+    monkeypatch.setattr(tiny_detector, "feature_cache", FeatureCache(max_items=100))
+    scored = []
+    original = tiny_detector._score_uncached
+
+    def recording(token_ids, batch_size=64):
+        scored.append(list(token_ids))
+        return original(token_ids, batch_size)
+
+    monkeypatch.setattr(tiny_detector, "_score_uncached", recording)
+    draft = ["Guru dan siswa di sekolah itu.", "Data penelitian dari sekolah.", "Hasil untuk siswa."]
+    first = tiny_detector.score_sentences(draft)
+
+    revised = [draft[0], "Data penelitian yang baru dari sekolah.", draft[2], draft[0]]
+    second = tiny_detector.score_sentences(revised)
+
+    assert scored[1] == tiny_detector.tokenizer(["Data penelitian yang baru dari sekolah."])["input_ids"]
+    assert second[0] == first[0] and second[2] == first[2] and second[3] == first[0]
+    stats = tiny_detector.feature_cache.stats()
+    assert stats["hits"] == 3 and stats["misses"] == 4
+
+def test_feature_cache_key_ignores_whitespace_only_edits():
+    assert FeatureCache.key("Data  penelitian\n dari sekolah.") == FeatureCache.key("Data penelitian dari sekolah.")
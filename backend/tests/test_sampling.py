@@ -0,0 +1,76 @@
+import random
+import pytest
+from core.sampling import SAMPLERS, create_sampler, StratifiedSampler, SequentialSampler
+
+CANDIDATES = list(range(0, 3000, 3))  # Scorable sentence indices, document order
+
+@pytest.mark.parametrize("name", ["head_mid_tail", "stratified", "reservoir"])
+def test_static_samplers_are_deterministic_and_bounded(name):
+    sampler = create_sampler(name, sample_size=60)
+    first = sampler.select(CANDIDATES, seed=42)
+    assert first == sampler.select(CANDIDATES, seed=42)
+    assert first == sorted(set(first)) and set(first) <= set(CANDIDATES)
+    assert len(first) <= 60
+
+def test_head_mid_tail_matches_original_hybrid_scan():
+    picked = create_sampler("head_mid_tail", sample_size=60).select(list(range(400)))
+    assert picked == list(range(20)) + list(range(190, 210)) + list(range(380, 400))
+
+def test_stratified_sampler_draws_from_every_stratum():
+    picked = create_sampler("stratified", sample_size=50).select(CANDIDATES, seed=1)
+    positions = [CANDIDATES.index(i) for i in picked]
+    for stratum, pos in zip(StratifiedSampler.strata(len(CANDIDATES), 50), positions):
+        assert pos in stratum
+
+def test_small_documents_are_scanned_entirely():
+    for name in SAMPLERS:
+        assert create_sampler(name, sample_size=60).select(list(range(10)), seed=3) == list(range(10))
+
+def test_sequential_sampler_stops_once_interval_is_tight():
+    calls = []
+
+    def constant(indices):
+        calls.append(len(indices))
+        return [40.0] * len(indices)
+
+    picked = create_sampler("sequential", sample_size=60, min_samples=16).select(CANDIDATES, seed=5, score=constant)
+    assert len(picked) == 16 and calls == [16]
+
+def test_sequential_sampler_keeps_sampling_noisy_documents_up_to_the_cap():
+    rng = random.Random(0)
+    picked = create_sampler("sequential", sample_size=60, target_half_width=1.0).select(
+        CANDIDATES, seed=5, score=lambda idx: [rng.choice([0.0, 100.0]) for _ in idx]
+    )
+    assert len(picked) == 60
+
+def test_sequential_sampler_respects_callers_budget():
+    picked = create_sampler("sequential", sample_size=60).select(
+        CANDIDATES, seed=5, score=lambda idx: [50.0, 0.0, 100.0][:len(idx)]
+    )
+    assert len(picked) == 3
+
+def test_half_width_uses_finite_population_correction():
+    assert SequentialSampler.half_width([10.0, 20.0, 30.0], population=3) == 0.0
+    assert SequentialSampler.half_width([10.0], population=100) == float("inf")
+
+def test_unknown_sampler_is_rejected():
+    with pytest.raises(ValueError):
+        create_sampler("first_n")
+
+def test_sequential_hybrid_scan_uses_fewer_model_calls(tiny_detector, monkeypatch):
+    pytest.importorskip("torch")
+    text = " ".join(f"Penelitian ini menggunakan data dari sekolah dan guru nomor {i}." for i in range(400))
+    scored = []
+    original = tiny_detector.score_sentences
+
+    def counting(texts, batch_size=64, token_ids=None, features=None):
+        scored.extend(texts)
+        return original(texts, batch_size, token_ids, features)
+
+    monkeypatch.setattr(tiny_detector, "score_sentences", counting)
+    monkeypatch.setattr(tiny_detector, "sampler", create_sampler("sequential", sample_size=60))
+    result = tiny_detector.analyze(text)
+
+    assert result["partially_analyzed"] is True
+    assert 16 <= len(scored) < 60
+    assert len(result["sentences"]) - result["skipped_count"] == len(scored)
@@ -0,0 +1,116 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+import torch.nn.functional as F
+from core.ai_detector import token_loss_confidence, sliding_windows
+
+def legacy_loss_confidence(logits, input_ids, attention_mask):
+    # Reference copy of the original calculate_features_batch math (full-vocabulary softmax)
+    loss_fct = torch.nn.CrossEntropyLoss(reduction='none')
+    loss = loss_fct(logits.reshape(-1, logits.size(-1)), input_ids.reshape(-1))
+    loss = loss.reshape(input_ids.size(0), -1)
+    mask = attention_mask
+    loss = (loss * mask).sum(dim=1) / mask.sum(dim=1)
+
+    probs = F.softmax(logits, dim=-1)
+    token_probs = torch.gather(probs, 2, input_ids.unsqueeze(-1)).squeeze(-1)
+    confidence = (token_probs * mask).sum(dim=1) / mask.sum(dim=1)
+    return loss, confidence
+
+def test_kernel_matches_legacy_on_random_logits():
+    torch.manual_seed(1)
+    logits = torch.randn(6, 40, 500) * 4
+    input_ids = torch.randint(0, 500, (6, 40))
+    attention_mask = torch.ones(6, 40, dtype=torch.long)
+    attention_mask[2, 25:] = 0
+    attention_mask[5, 3:] = 0
+
+    loss, conf = token_loss_confidence(logits, input_ids, attention_mask)
+    ref_loss, ref_conf = legacy_loss_confidence(logits, input_ids, attention_mask)
+    assert torch.allclose(loss, ref_loss, atol=1e-5)
+    assert torch.allclose(conf, ref_conf, atol=1e-6)
+
+def test_detector_batch_matches_legacy_path(tiny_detector):
+    texts = [
+        "Penelitian ini menggunakan data dari sekolah.",
+        "Guru dan siswa di sekolah itu adalah bagian dari penelitian yang panjang dan berat.",
+        "Hasil",
+    ]
+    results = tiny_detector.calculate_features_batch(texts, batch_size=8)
+
+    enc = tiny_detector.tokenizer(texts, return_tensors="pt", padding=True, truncation=True, max_length=512)
+    with torch.no_grad():
+        logits = tiny_detector.model(**enc).logits
+    ref_loss, ref_conf = legacy_loss_confidence(logits, enc["input_ids"], enc["attention_mask"])
+
+    for res, l, c in zip(results, ref_loss.tolist(), ref_conf.tolist()):
+        assert res["loss"] == pytest.approx(l, abs=1e-4)
+        assert res["confidence"] == pytest.approx(c, abs=1e-5)
+
+def test_length_buckets_respect_budget_and_cover_all_items():
+    from core.ai_detector import length_buckets
+    lengths = [120, 8, 9, 10, 30, 7, 12, 11, 118, 9]
+    batches = length_buckets(lengths, token_budget=64, max_batch_size=4)
+
+    assert sorted(i for b in batches for i in b) == list(range(len(lengths)))
+    for batch in batches:
+        assert len(batch) <= 4
+        assert len(batch) == 1 or len(batch) * max(lengths[i] for i in batch) <= 64
+    # The long outliers never share a batch with the short sentences
+    long_batches = [b for b in batches if 0 in b or 8 in b]
+    assert all(all(lengths[i] >= 100 for i in b) for b in long_batches)
+
+def test_bucketed_scoring_matches_fixed_batches_in_order(tiny_detector):
+    texts = [
+        "Guru dan siswa di sekolah itu adalah bagian dari penelitian yang panjang dan berat " * 4,
+        "Data ini.",
+        "Hasil penelitian dari sekolah.",
+        "Alat berat di tambang.",
+        "Pendidikan untuk siswa dan guru adalah juga bagian dari hasil penelitian itu.",
+    ]
+    fixed = tiny_detector.calculate_features_batch(texts, batch_size=8)
+    bucketed = tiny_detector.calculate_features_batch(texts, batch_size=8, token_budget=64)
+
+    # Dynamic int8 quantization picks activation scales per batch, so batch composition
+    # (with or without bucketing) moves results by a tiny relative amount
+    for a, b in zip(fixed, bucketed):
+        assert b["loss"] == pytest.approx(a["loss"], rel=5e-3)
+        assert b["confidence"] == pytest.approx(a["confidence"], rel=5e-3)
+
+@pytest.mark.parametrize("n_tokens", [1, 510, 511, 1200, 5000])
+def test_sliding_windows_own_every_token_once(n_tokens):
+    windows = sliding_windows(n_tokens, window=510, stride=384)
+    owned = [t for _, _, own_start, own_end in windows for t in range(own_start, own_end)]
+    assert owned == list(range(n_tokens))
+    for start, end, own_start, own_end in windows:
+        assert end - start <= 510 and start <= own_start <= own_end <= end
+    starts = [w[0] for w in windows]
+    assert all(b - a <= 384 for a, b in zip(starts, starts[1:]))
+
+def test_sliding_windows_cap_spreads_windows_across_text():
+    windows = sliding_windows(50000, window=510, stride=384, max_windows=8)
+    assert len(windows) == 8
+    assert windows[0][0] == 0 and windows[-1][1] == 50000
+
+def test_score_document_covers_whole_text(tiny_detector, monkeypatch):
+    text = " ".join(["penelitian ini menggunakan data dari sekolah dan guru"] * 40)
+    monkeypatch.setattr(tiny_detector, "GLOBAL_WINDOW", 62)
+    monkeypatch.setattr(tiny_detector, "global_window_stride", 48)
+
+    full = tiny_detector.score_document(text)
+    assert full["windows"] > 1 and full["coverage"] == 1.0
+    assert full["loss"] > 0 and 0 < full["confidence"] < 1
+
+    capped = tiny_detector.score_document(text, max_windows=2)
+    assert capped["windows"] == 2 and capped["coverage"] < 1.0
+
+def test_score_document_single_window_matches_token_mean(tiny_detector):
+    text = "Guru dan siswa di sekolah itu adalah bagian dari penelitian."
+    ids = tiny_detector.tokenizer(text, return_tensors="pt")["input_ids"]
+    with torch.no_grad():
+        logits = tiny_detector.backend.logits(ids, torch.ones_like(ids))
+    log_probs = torch.log_softmax(logits, dim=-1).gather(2, ids.unsqueeze(-1)).squeeze(-1)[0, 1:-1]
+
+    result = tiny_detector.score_document(text)
+    assert result["windows"] == 1
+    assert result["loss"] == pytest.approx(-log_probs.mean().item(), abs=1e-5)
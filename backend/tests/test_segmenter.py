@@ -0,0 +1,105 @@
+import re
+import pytest
+from core.segmenter import SentenceSegmenter, segment_sentences
+
+# Gold segmentation: paragraphs of sentences, joined with " " and "\n\n"
+GOLD = [
+    ["BAB I"],
+    ["PENDAHULUAN"],
+    [
+        "1. Latar Belakang Masalah",
+    ],
+    [
+        "Menurut Prof. Dr. Budi Santoso, M.Pd. pendidikan merupakan fondasi pembangunan bangsa.",
+        "Penelitian ini dilaksanakan di Jl. Merdeka No. 5 Kab. Bandung pada tgl. 12 Maret 2023.",
+        "Alat yang digunakan meliputi kuesioner, lembar observasi, dll.",
+        "Selanjutnya data dianalisis secara deskriptif (hlm. 45).",
+        "Nilai rata-rata kelas eksperimen adalah 78.5 sedangkan kelas kontrol 71.25 poin.",
+    ],
+    [
+        "Santoso dkk. (2020) menyatakan bahwa motivasi belajar dipengaruhi lingkungan.",
+        "Pendapat ini didukung oleh M. Hatta dan A. Wahid dalam kajian terdahulu.",
+        "Apakah hasil tersebut berlaku umum?",
+        "Tentu saja tidak!",
+        "Guru menyampaikan",
+        "\"Kalian harus rajin membaca. Buku adalah jendela dunia.\"",
+        "kepada seluruh siswa.",
+        "Istilah \"merdeka belajar\" kini sering digunakan dalam kebijakan pendidikan.",
+    ],
+    [
+        "Tujuan penelitian ini adalah sebagai berikut: 1. mendeskripsikan motivasi siswa.",
+        "2. Menganalisis pengaruh lingkungan belajar.",
+        "Gelar S.Pd. diperoleh peneliti pada tahun 2015.",
+        "Data dikumpulkan selama tiga bulan...",
+        "Hasilnya cukup mengejutkan.",
+        "Biaya penelitian sebesar Rp. 5.000.000 ditanggung sendiri.",
+    ],
+]
+GOLD_TEXT = "\n\n".join(" ".join(p) for p in GOLD)
+GOLD_SENTENCES = [s for p in GOLD for s in p]
+
+def test_gold_sample():
+    assert [s.text for s in segment_sentences(GOLD_TEXT)] == GOLD_SENTENCES
+
+def test_offsets_point_into_the_text():
+    text = "  Kalimat pertama di sini.   Kalimat kedua \"dikutip. Ya.\"  lalu  selesai.\n\n Akhir. "
+    spans = segment_sentences(text)
+    assert [s.text for s in spans] == ["Kalimat pertama di sini.", "Kalimat kedua", "\"dikutip. Ya.\"", "lalu  selesai.", "Akhir."]
+    assert all(text[s.start:s.end] == s.text for s in spans)
+    assert [s.start for s in spans] == sorted(s.start for s in spans)
+
+def test_unbalanced_quotes_and_empty_text():
+    assert segment_sentences("") == []
+    assert [s.text for s in segment_sentences("Dia berkata \"tidak. Lalu pergi. Selesai.")] == [
+        "Dia berkata \"tidak.", "Lalu pergi.", "Selesai."
+    ]
+
+class CountingPattern:
+    """Wraps a compiled pattern and counts the calls and the characters each one scans."""
+
+    def __init__(self, pattern, stats):
+        self.pattern = pattern
+        self.stats = stats
+
+    def _record(self, m, pos, endpos):
+        self.stats["calls"] += 1
+        self.stats["scanned"] += (m.end() if m else endpos) - pos
+        return m
+
+    def search(self, text, pos=0, endpos=None):
+        endpos = len(text) if endpos is None else endpos
+        return self._record(self.pattern.search(text, pos, endpos), pos, endpos)
+
+    def match(self, text, pos=0, endpos=None):
+        endpos = len(text) if endpos is None else endpos
+        return self._record(self.pattern.match(text, pos, endpos), pos, endpos)
+
+def test_linear_work_on_adversarial_input():
+    # Work is counted, not timed: every pattern call and the characters it scans must stay below a
+    # fixed multiple of the text length (rescanning a paragraph per quote or per stop would not)
+    patterns = ("_EVENTS", "_PARAGRAPH", "_CLOSER", "_TERMINAL", "_NEXT_LIST_MARKER", "_LIST_MARKER")
+    for unit in ["“a. ", "." * 50 + "x", "\"", "Prof. ", "\n \n", "a.b.c.d "]:
+        for repeats in (2000, 20000):
+            segmenter = SentenceSegmenter()
+            stats = {"calls": 0, "scanned": 0}
+            for name in patterns:
+                setattr(segmenter, name, CountingPattern(getattr(SentenceSegmenter, name), stats))
+            text = unit * repeats
+            segmenter.segment(text)
+            assert stats["calls"] <= 2 * len(text), (unit, repeats, stats)
+            assert stats["scanned"] <= 4 * len(text), (unit, repeats, stats)
+
+def test_analyze_entries_carry_offsets(tiny_detector):
+    result = tiny_detector.analyze(GOLD_TEXT, force_full_scan=True)
+    clean = tiny_detector.normalize_text(GOLD_TEXT)
+    assert result["sentences"]
+    for entry in result["sentences"]:
+        assert clean[entry["start"]:entry["end"]] == entry["text"]
+
+def test_burstiness_uses_the_segmenter(tiny_detector):
+    # Abbreviations and decimals no longer cut sentences into short pieces
+    text = "Menurut Prof. Dr. Budi nilai rata-rata 78.5 poin tercapai. Hasil ini sesuai harapan peneliti."
+    legacy = [s.strip() for s in re.split(r'[.!?\n]+', text) if len(s.strip()) > 10]
+    assert len(legacy) == 4
+    assert tiny_detector.calculate_burstiness(text) == tiny_detector.calculate_burstiness(text, sentences=[s.text for s in segment_sentences(text)])
+    assert tiny_detector.calculate_burstiness(text) == pytest.approx(2 / 7)  # two sentences of 9 and 5 words
@@ -0,0 +1,79 @@
+import json
+import datetime
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+import models
+import database
+from core.auth import create_access_token
+
+client = TestClient(app)
+EMAIL = "stream_test@example.com"
+DOCUMENT = " ".join(f"Penelitian ini menggunakan data dari sekolah dan guru nomor {i}." for i in range(80))
+
+@pytest.fixture
+def pro_headers():
+    db = database.SessionLocal()
+    user = models.User(
+        email=EMAIL, hashed_password="hashed_dummy", full_name="Stream Test", role="pro", daily_quota=99999,
+        pro_expires_at=datetime.datetime.utcnow() + datetime.timedelta(days=30)
+    )
+    db.add(user)
+    db.commit()
+    yield {"Authorization": f"Bearer {create_access_token(data={'sub': EMAIL})}"}
+    db.query(models.ScanResult).filter(models.ScanResult.user_id == user.id).delete()
+    db.delete(user)
+    db.commit()
+    db.close()
+
+def parse_sse(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+def test_ndjson_stream_emits_progress_then_saved_result(pro_headers):
+    response = client.post("/analyze/stream?format=ndjson", json={"text_content": DOCUMENT}, headers=pro_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    progress = [e for e in events if e["event"] == "progress"]
+    assert len(progress) >= 2  # Small first chunk, then the rest
+    assert progress[-1]["processed"] == progress[-1]["total"]
+
+    final = events[-1]
+    assert final["event"] == "result" and final["id"]
+    streamed = [s for e in progress for s in e["sentences"]]
+    assert streamed == final["sentences"]
+
+def test_sse_stream_format(pro_headers):
+    response = client.post("/analyze/stream", json={"text_content": DOCUMENT[:400]}, headers=pro_headers)
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_sse(response.text)
+    assert events[0][0] == "progress" and events[-1][0] == "result"
+
+def test_file_stream_and_validation_errors_before_streaming(pro_headers):
+    files = {"file": ("draft.txt", DOCUMENT[:300].encode(), "text/plain")}
+    response = client.post("/analyze-file/stream?format=ndjson", files=files, headers=pro_headers)
+    assert json.loads(response.text.splitlines()[-1])["event"] == "result"
+
+    empty = {"file": ("empty.txt", b"   ", "text/plain")}
+    assert client.post("/analyze-file/stream", files=empty, headers=pro_headers).status_code == 400
+    assert client.post("/analyze/stream?format=xml", json={"text_content": "x"}, headers=pro_headers).status_code == 422
+
+def test_file_stream_scores_pages_as_they_are_extracted(pro_headers, monkeypatch):
+    import main
+    pages = []
+
+    def fake_pages(filename, content):
+        for i in range(3):
+            pages.append(i)
+            yield DOCUMENT[i * 200:(i + 1) * 200]
+
+    monkeypatch.setattr(main, "upload_pages", fake_pages)
+    files = {"file": ("draft.pdf", b"%PDF-", "application/pdf")}
+    response = client.post("/analyze-file/stream?format=ndjson", files=files, headers=pro_headers)
+    final = json.loads(response.text.splitlines()[-1])
+    assert pages == [0, 1, 2] and final["event"] == "result"
@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip("transformers")
+from core.tokenization import DocumentTokens
+
+DOCUMENT = (
+    "Bab 1 Pendahuluan. Penelitian ini dilakukan di SMA Negeri 2 pada tahun 2023, dengan 120 responden! "
+    "Menurut guru, “pendidikan adalah kunci.” Hasil uji-t menunjukkan p=0,05? "
+    "Data dianalisis (lihat Tabel 4.1) menggunakan SPSS v.26.\n\n"
+    "\"Kutipan langsung panjang dari siswa.\" Penelitian ini menggunakan data yang sama. "
+    "Penelitian ini menggunakan data yang sama."
+)
+
+@pytest.fixture(scope="module")
+def detector(tiny_detector):
+    return tiny_detector
+
+def test_sentence_ids_match_per_sentence_tokenization(detector):
+    clean = detector.normalize_text(DOCUMENT)
+    sentences = detector.split_sentences(clean)
+    doc = DocumentTokens(detector.tokenizer, clean)
+
+    expected = detector.tokenizer(sentences, truncation=True, max_length=512)["input_ids"]
+    assert doc.sentence_ids(sentences) == expected
+    assert [doc.model_input(ids) for ids in doc.sentence_ids(sentences, max_length=None, add_special_tokens=False)] == expected
+    assert len(doc) == len(detector.tokenizer(clean, add_special_tokens=False)["input_ids"])
+
+def test_sentence_ids_truncate_like_the_tokenizer(detector):
+    sentence = " ".join(["penelitian"] * 600)
+    doc = DocumentTokens(detector.tokenizer, sentence)
+    expected = detector.tokenizer(sentence, truncation=True, max_length=512)["input_ids"]
+    assert doc.sentence_ids([sentence]) == [expected]
+    assert doc.model_input(doc.ids) == expected
+
+def test_unlocated_sentence_is_tokenized_on_its_own(detector):
+    doc = DocumentTokens(detector.tokenizer, "Guru dan siswa di sekolah.")
+    expected = detector.tokenizer("Data hasil penelitian.", add_special_tokens=False)["input_ids"]
+    assert doc.sentence_ids(["Data hasil penelitian."], add_special_tokens=False) == [expected]
+
+def test_analyze_reports_exact_token_count(detector):
+    result = detector.analyze(DOCUMENT)
+    clean = detector.normalize_text(DOCUMENT)
+    assert result["token_count"] == len(detector.tokenizer(clean, add_special_tokens=False)["input_ids"])